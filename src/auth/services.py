@@ -1,11 +1,10 @@
-from passlib.hash import pbkdf2_sha512
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.auth.exceptions import IncorrectUsernameOrPassword
 from src.auth.schemas import AuthenticatedUser
-from src.core.exceptions import InvalidUsername
 from src.core.middlewares.authentication_middleware import create_token
 from src.core.models import User
+from src.core.passwords import verify_password
 from src.users.service import create_customer, get_user_by_username
 
 
@@ -17,7 +16,7 @@ async def signin_user(
     if user is None:
         raise IncorrectUsernameOrPassword()
 
-    password_matches = pbkdf2_sha512.verify(password, user.hashed_password)
+    password_matches = await verify_password(password, user.hashed_password)
     if not password_matches:
         raise IncorrectUsernameOrPassword()
 
@@ -33,11 +32,6 @@ async def signin_user(
 async def signup_user(
     username: str, password: str, db_session: AsyncSession
 ) -> AuthenticatedUser:
-    user: User = await get_user_by_username(username, db_session)
-
-    if user is not None:
-        raise InvalidUsername()
-
     customer = await create_customer(username, password, db_session)
 
     access_token = await create_token(customer.id, customer.username, customer.role)
@@ -0,0 +1,260 @@
+"""Counts database round trips per write endpoint.
+
+Runs each scenario against ``TEST_DATABASE_URL`` on a freshly created schema and
+prints how many statements, BEGINs, COMMITs and ROLLBACKs it sent::
+
+    python -m src.benchmarks.round_trips
+
+With ``--baseline <git ref>``, the same scenarios and counters also run against
+the application of that commit, checked out in a temporary git worktree, and
+both counts are printed side by side::
+
+    python -m src.benchmarks.round_trips --baseline c3fe6f2^
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from os import getenv
+
+from dotenv import load_dotenv
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.config.database.setup import get_db_session
+from src.core.middlewares.authentication_middleware import ADMIN_ROLE, create_token
+from src.main import app
+
+load_dotenv("src/config/.env")
+
+TEST_SQLALCHEMY_DATABASE_URL = getenv("TEST_DATABASE_URL", None)
+
+
+@dataclass
+class RoundTrips:
+    statements: list[str] = field(default_factory=list)
+    begins: int = 0
+    commits: int = 0
+    rollbacks: int = 0
+
+    @property
+    def total(self) -> int:
+        return len(self.statements) + self.begins + self.commits + self.rollbacks
+
+
+def track_round_trips(sync_engine, round_trips: RoundTrips):
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        round_trips.statements.append(statement.split(None, 1)[0].upper())
+
+    @event.listens_for(sync_engine, "begin")
+    def on_begin(conn):
+        round_trips.begins += 1
+
+    @event.listens_for(sync_engine, "commit")
+    def on_commit(conn):
+        round_trips.commits += 1
+
+    @event.listens_for(sync_engine, "rollback")
+    def on_rollback(conn):
+        round_trips.rollbacks += 1
+
+
+def run_scenarios(client: AsyncClient, headers: dict) -> list[tuple]:
+    return [
+        (
+            "POST /api/v1/auth/signup/",
+            client.post(
+                "/api/v1/auth/signup/",
+                data={"username": "bench.customer@email.com", "password": "bench"},
+            ),
+        ),
+        (
+            "POST /api/v1/users/employee/",
+            client.post(
+                "/api/v1/users/employee/",
+                data={"username": "bench.employee@email.com", "password": "bench"},
+                headers=headers,
+            ),
+        ),
+        (
+            "POST /api/v1/vehicles/",
+            client.post(
+                "/api/v1/vehicles/",
+                json={"brand": "Fiat", "model": "Uno", "color": "Red", "year": "2010"},
+                headers=headers,
+            ),
+        ),
+        (
+            "POST /api/v1/vehicles/bulk/",
+            client.post(
+                "/api/v1/vehicles/bulk/",
+                json=[
+                    {
+                        "brand": "Fiat",
+                        "model": f"Uno {n}",
+                        "color": "Red",
+                        "year": "2010",
+                    }
+                    for n in range(500)
+                ],
+                headers=headers,
+            ),
+        ),
+        (
+            "POST /api/v1/vehicles/customer/",
+            client.post(
+                "/api/v1/vehicles/customer/",
+                json={
+                    "vin": "9BWZZZ377VT004251",
+                    "plate_code": "ABC1D23",
+                    "customer_id": 1,
+                    "brand": "Fiat",
+                    "model": "Palio",
+                    "color": "Blue",
+                    "year": "2012",
+                },
+                headers=headers,
+            ),
+        ),
+        (
+            "PUT /api/v1/users/customer/1/",
+            client.put(
+                "/api/v1/users/customer/1/",
+                json={
+                    "username": "bench.customer@email.com",
+                    "password": "bench2",
+                    "first_name": "Bench",
+                    "last_name": "Customer",
+                    "address": {
+                        "street": "Carlos Alameda 4952",
+                        "city": "Rio de Janeiro",
+                        "state": "RJ",
+                        "complement": "BL 2 AP 305",
+                        "zipcode": "07052427",
+                    },
+                },
+                headers=headers,
+            ),
+        ),
+    ]
+
+
+async def measure() -> list[dict]:
+    engine = create_async_engine(TEST_SQLALCHEMY_DATABASE_URL)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    round_trips = RoundTrips()
+    track_round_trips(engine.sync_engine, round_trips)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def override_db_session():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db_session] = override_db_session
+    token = await create_token(user_id=1, username="bench", role=ADMIN_ROLE)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    results = []
+    async with AsyncClient(app=app, base_url="http://bench") as client:
+        for name, request in run_scenarios(client, headers):
+            round_trips.__init__()
+            response = await request
+            results.append(
+                {
+                    "endpoint": name,
+                    "status": response.status_code,
+                    "total": round_trips.total,
+                    "begins": round_trips.begins,
+                    "commits": round_trips.commits,
+                    "statements": round_trips.statements,
+                }
+            )
+
+    app.dependency_overrides.clear()
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+    await engine.dispose()
+    return results
+
+
+def measure_baseline(ref: str) -> list[dict]:
+    """Runs this file, unchanged, against the ``src`` package of ``ref``."""
+    with tempfile.TemporaryDirectory() as worktree:
+        subprocess.run(
+            ["git", "worktree", "add", "--detach", worktree, ref],
+            check=True,
+            capture_output=True,
+        )
+        try:
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--json"],
+                cwd=worktree,
+                env={**os.environ, "PYTHONPATH": worktree},
+                check=True,
+                stdout=subprocess.PIPE,
+                text=True,
+            ).stdout
+        finally:
+            subprocess.run(
+                ["git", "worktree", "remove", "--force", worktree],
+                capture_output=True,
+            )
+    return json.loads(output.splitlines()[-1])
+
+
+def print_results(results: list[dict]):
+    print(f"{'endpoint':<36}{'status':>7}{'total':>7}{'begin':>7}{'commit':>8}")
+    for result in results:
+        print(
+            f"{result['endpoint']:<36}{result['status']:>7}{result['total']:>7}"
+            f"{result['begins']:>7}{result['commits']:>8}"
+            f"  {' '.join(result['statements'])}"
+        )
+
+
+def print_comparison(baseline: list[dict], results: list[dict]):
+    print(f"{'endpoint':<36}{'status':>13}{'total':>11}")
+    baseline_by_endpoint = {result["endpoint"]: result for result in baseline}
+    for result in results:
+        before = baseline_by_endpoint.get(result["endpoint"])
+        status = f"{before['status']} -> " if before else "- -> "
+        total = f"{before['total']} -> " if before else "- -> "
+        print(
+            f"{result['endpoint']:<36}{status + str(result['status']):>13}"
+            f"{total + str(result['total']):>11}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--baseline", help="git ref whose application is measured for comparison"
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="print the results as one JSON line"
+    )
+    args = parser.parse_args()
+
+    results = asyncio.run(measure())
+    if args.json:
+        print(json.dumps(results))
+    elif args.baseline:
+        print_comparison(measure_baseline(args.baseline), results)
+    else:
+        print_results(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Compares the per-row cost of serializing list responses.
+
+Renders 10k-row pages the way a plain FastAPI route does (validate against
+``response_model``, ``jsonable_encoder``, ``JSONResponse``) and through
+``FastJSONRoute``'s single orjson pass, and prints microseconds per row::
+
+    python -m src.benchmarks.serialization
+"""
+import asyncio
+from datetime import datetime, timedelta
+from time import perf_counter
+from typing import Any, Awaitable, Callable
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_cloned_field, create_response_field
+from pydantic import BaseModel
+
+from src.core.pagination import Page
+from src.core.responses import dump_json
+from src.orders.models import Order
+from src.orders.schemas import OrderResponse
+from src.orders.services import order_response
+from src.services.models import Service
+from src.services.schemas import ServiceResponse
+
+ROWS = 10_000
+ROUNDS = 5
+
+
+def build_services() -> Page:
+    return Page(
+        items=[
+            Service(
+                id=n,
+                name=f"Service {n}",
+                price=n * 1.5,
+                description=f"Description {n}",
+                image="image.png",
+                estimated_time=n % 240,
+                category=f"Category {n % 20}",
+            )
+            for n in range(1, ROWS + 1)
+        ],
+        next_cursor="WzEwMDAwXQ==",
+    )
+
+
+def build_orders() -> Page:
+    start = datetime(2023, 1, 1)
+    return Page(
+        items=[
+            order_response(
+                Order(
+                    id=n,
+                    customer_id=n % 8000 + 1,
+                    start_date=start + timedelta(hours=n),
+                    estimated_time=start + timedelta(hours=n + 2),
+                    status="REQUESTED",
+                ),
+                [n % 10000 + 1],
+                [n % 1000 + 1, n % 1000 + 2],
+                [8001 + n % 2000],
+            )
+            for n in range(1, ROWS + 1)
+        ],
+        next_cursor="WzEwMDAwXQ==",
+    )
+
+
+def fastapi_renderer(schema: type[BaseModel]) -> Callable[[Any], Awaitable[bytes]]:
+    field = create_cloned_field(create_response_field(name="Response", type_=schema))
+
+    async def render(page: Any) -> bytes:
+        content = await serialize_response(field=field, response_content=page)
+        return JSONResponse(content).body
+
+    return render
+
+
+def fast_json_renderer(schema: type[BaseModel]) -> Callable[[Any], Awaitable[bytes]]:
+    async def render(page: Any) -> bytes:
+        return dump_json(schema, page)
+
+    return render
+
+
+async def measure(render: Callable[[Any], Awaitable[bytes]], page: Any) -> float:
+    timings = []
+    for _ in range(ROUNDS):
+        started_at = perf_counter()
+        await render(page)
+        timings.append(perf_counter() - started_at)
+    return min(timings) / ROWS * 1_000_000
+
+
+async def main():
+    scenarios = [
+        ("services (ORM rows)", Page[ServiceResponse], build_services()),
+        ("orders (response models)", Page[OrderResponse], build_orders()),
+    ]
+
+    print(f"{'response':<28}{'fastapi us/row':>16}{'orjson us/row':>16}{'speedup':>9}")
+    for name, schema, page in scenarios:
+        default = await measure(fastapi_renderer(schema), page)
+        fast = await measure(fast_json_renderer(schema), page)
+        print(f"{name:<28}{default:>16.2f}{fast:>16.2f}{default / fast:>8.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,61 @@
+"""add deduplication unique indexes
+
+Revision ID: a77f37da0b52
+Revises: cf04cc68ff1f
+Create Date: 2026-10-18 09:12:41.203518
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a77f37da0b52"
+down_revision = "cf04cc68ff1f"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_unique_constraint(
+        "uq_vehicle_brand_model_color_year",
+        "vehicle",
+        ["brand", "model", "color", "year"],
+    )
+    op.create_unique_constraint(
+        "uq_service_definition",
+        "service",
+        ["name", "price", "description", "image", "estimated_time", "category"],
+    )
+    op.create_index(
+        "uq_address_location",
+        "address",
+        [
+            sa.text("coalesce(street, '')"),
+            sa.text("coalesce(city, '')"),
+            sa.text("coalesce(state, '')"),
+            sa.text("coalesce(complement, '')"),
+            sa.text("coalesce(zipcode, '')"),
+        ],
+        unique=True,
+    )
+    op.create_index(
+        "uq_order_definition",
+        "order",
+        [
+            sa.text("customer_id"),
+            sa.text("coalesce(start_date, '-infinity'::timestamp)"),
+            sa.text("estimated_time"),
+            sa.text("status"),
+            sa.text("customer_vehicle_ids"),
+            sa.text("service_ids"),
+            sa.text("coalesce(employee_ids, '{}'::integer[])"),
+        ],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_order_definition", table_name="order")
+    op.drop_index("uq_address_location", table_name="address")
+    op.drop_constraint("uq_service_definition", "service", type_="unique")
+    op.drop_constraint("uq_vehicle_brand_model_color_year", "vehicle", type_="unique")
@@ -0,0 +1,65 @@
+"""add foreign key and filter indexes
+
+Revision ID: 5d2e8c1b9f30
+Revises: a77f37da0b52
+Create Date: 2026-10-18 10:47:03.518204
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5d2e8c1b9f30"
+down_revision = "a77f37da0b52"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        op.f("ix_customer_address_id"), "customer", ["address_id"], unique=False
+    )
+    op.create_index(
+        op.f("ix_customer_vehicle_customer_id"),
+        "customer_vehicle",
+        ["customer_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_customer_vehicle_vehicle_id"),
+        "customer_vehicle",
+        ["vehicle_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_order_customer_id"), "order", ["customer_id"], unique=False
+    )
+    op.create_index(op.f("ix_order_start_date"), "order", ["start_date"], unique=False)
+    op.create_index(
+        "ix_order_status_start_date", "order", ["status", "start_date"], unique=False
+    )
+    op.create_index(
+        "ix_order_customer_vehicle_ids",
+        "order",
+        ["customer_vehicle_ids"],
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "ix_order_service_ids", "order", ["service_ids"], postgresql_using="gin"
+    )
+    op.create_index(
+        "ix_order_employee_ids", "order", ["employee_ids"], postgresql_using="gin"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_order_employee_ids", table_name="order")
+    op.drop_index("ix_order_service_ids", table_name="order")
+    op.drop_index("ix_order_customer_vehicle_ids", table_name="order")
+    op.drop_index("ix_order_status_start_date", table_name="order")
+    op.drop_index(op.f("ix_order_start_date"), table_name="order")
+    op.drop_index(op.f("ix_order_customer_id"), table_name="order")
+    op.drop_index(op.f("ix_customer_vehicle_vehicle_id"), table_name="customer_vehicle")
+    op.drop_index(
+        op.f("ix_customer_vehicle_customer_id"), table_name="customer_vehicle"
+    )
+    op.drop_index(op.f("ix_customer_address_id"), table_name="customer")
@@ -0,0 +1,130 @@
+"""normalize order references
+
+Revision ID: 3b9a6f4e7c21
+Revises: 5d2e8c1b9f30
+Create Date: 2026-10-18 12:05:37.904112
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "3b9a6f4e7c21"
+down_revision = "5d2e8c1b9f30"
+branch_labels = None
+depends_on = None
+
+# (association table, reference column, referenced table, order array column)
+ORDER_REFERENCES = [
+    (
+        "order_vehicle",
+        "customer_vehicle_id",
+        "customer_vehicle",
+        "customer_vehicle_ids",
+    ),
+    ("order_service", "service_id", "service", "service_ids"),
+    ("order_employee", "employee_id", "employee", "employee_ids"),
+]
+
+
+def upgrade() -> None:
+    for table, column, referenced_table, array_column in ORDER_REFERENCES:
+        op.create_table(
+            table,
+            sa.Column("order_id", sa.Integer(), nullable=False),
+            sa.Column(column, sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(["order_id"], ["order.id"], ondelete="CASCADE"),
+            sa.ForeignKeyConstraint(
+                [column], [f"{referenced_table}.id"], ondelete="CASCADE"
+            ),
+            sa.PrimaryKeyConstraint("order_id", column),
+        )
+        op.create_index(
+            f"ix_{table}_{column}_order_id", table, [column, "order_id"], unique=False
+        )
+        # Ids that no longer point to an existing row cannot satisfy the new
+        # foreign key and are dropped.
+        op.execute(
+            f"""
+            INSERT INTO {table} (order_id, {column})
+            SELECT DISTINCT "order".id, reference.id
+            FROM "order"
+            CROSS JOIN LATERAL unnest("order".{array_column}) AS reference(id)
+            JOIN {referenced_table} ON {referenced_table}.id = reference.id
+            """
+        )
+
+    op.drop_index("uq_order_definition", table_name="order")
+    op.drop_index("ix_order_employee_ids", table_name="order")
+    op.drop_index("ix_order_service_ids", table_name="order")
+    op.drop_index("ix_order_customer_vehicle_ids", table_name="order")
+    op.drop_index("ix_order_customer_id", table_name="order")
+    op.create_index(
+        "ix_order_definition",
+        "order",
+        ["customer_id", "start_date", "estimated_time", "status"],
+        unique=False,
+    )
+    for _, _, _, array_column in ORDER_REFERENCES:
+        op.drop_column("order", array_column)
+
+
+def downgrade() -> None:
+    for table, column, _, array_column in ORDER_REFERENCES:
+        op.add_column(
+            "order",
+            sa.Column(array_column, postgresql.ARRAY(sa.Integer()), nullable=True),
+        )
+        op.execute(
+            f"""
+            UPDATE "order"
+            SET {array_column} = (
+                SELECT array_agg({table}.{column} ORDER BY {table}.{column})
+                FROM {table}
+                WHERE {table}.order_id = "order".id
+            )
+            """
+        )
+    op.execute(
+        """
+        UPDATE "order"
+        SET customer_vehicle_ids = coalesce(customer_vehicle_ids, '{}'),
+            service_ids = coalesce(service_ids, '{}')
+        """
+    )
+
+    op.drop_index("ix_order_definition", table_name="order")
+    op.create_index(
+        op.f("ix_order_customer_id"), "order", ["customer_id"], unique=False
+    )
+    op.create_index(
+        "ix_order_customer_vehicle_ids",
+        "order",
+        ["customer_vehicle_ids"],
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "ix_order_service_ids", "order", ["service_ids"], postgresql_using="gin"
+    )
+    op.create_index(
+        "ix_order_employee_ids", "order", ["employee_ids"], postgresql_using="gin"
+    )
+    op.create_index(
+        "uq_order_definition",
+        "order",
+        [
+            sa.text("customer_id"),
+            sa.text("coalesce(start_date, '-infinity'::timestamp)"),
+            sa.text("estimated_time"),
+            sa.text("status"),
+            sa.text("customer_vehicle_ids"),
+            sa.text("service_ids"),
+            sa.text("coalesce(employee_ids, '{}'::integer[])"),
+        ],
+        unique=True,
+    )
+
+    for table, column, _, _ in reversed(ORDER_REFERENCES):
+        op.drop_index(f"ix_{table}_{column}_order_id", table_name=table)
+        op.drop_table(table)
@@ -0,0 +1,24 @@
+"""add order estimated_time index
+
+Revision ID: 8f1c2a7d4e56
+Revises: 3b9a6f4e7c21
+Create Date: 2026-10-18 13:40:12.660871
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8f1c2a7d4e56"
+down_revision = "3b9a6f4e7c21"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        op.f("ix_order_estimated_time"), "order", ["estimated_time"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_order_estimated_time"), table_name="order")
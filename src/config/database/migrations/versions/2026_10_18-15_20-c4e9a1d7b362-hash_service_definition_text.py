@@ -0,0 +1,42 @@
+"""hash service definition text
+
+Revision ID: c4e9a1d7b362
+Revises: 8f1c2a7d4e56
+Create Date: 2026-10-18 15:20:37.118204
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c4e9a1d7b362"
+down_revision = "8f1c2a7d4e56"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # A plain btree over description and image rejects rows above ~2.7 KB.
+    op.drop_constraint("uq_service_definition", "service", type_="unique")
+    op.create_index(
+        "uq_service_definition",
+        "service",
+        [
+            sa.text("name"),
+            sa.text("price"),
+            sa.text("md5(description)"),
+            sa.text("md5(image)"),
+            sa.text("estimated_time"),
+            sa.text("category"),
+        ],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_service_definition", table_name="service")
+    op.create_unique_constraint(
+        "uq_service_definition",
+        "service",
+        ["name", "price", "description", "image", "estimated_time", "category"],
+    )
@@ -1,20 +1,356 @@
+import asyncio
 import os
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from time import monotonic, perf_counter
+from typing import AsyncIterator, Callable, Iterator
 
 from dotenv import load_dotenv
-from sqlalchemy.ext.asyncio import create_async_engine
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from src.config.database.slow_queries import slow_query_recorder
+from src.core.cache import TTLCache
+
 load_dotenv("src/config/.env")
 
 SQLALCHEMY_DATABASE_URL = os.environ.get("DATABASE_URL", None)
 ENVIRONMENT = os.environ.get("ENV", None)
 
-db_logs = "debug" if ENVIRONMENT == "development" else True
-engine = create_async_engine(SQLALCHEMY_DATABASE_URL, echo=db_logs)
+DATABASE_POOL_SIZE = int(os.environ.get("DATABASE_POOL_SIZE", 5))
+DATABASE_MAX_OVERFLOW = int(os.environ.get("DATABASE_MAX_OVERFLOW", 10))
+DATABASE_POOL_TIMEOUT = float(os.environ.get("DATABASE_POOL_TIMEOUT", 30))
+DATABASE_POOL_RECYCLE = int(os.environ.get("DATABASE_POOL_RECYCLE", 1800))
+DATABASE_POOL_PRE_PING = os.environ.get("DATABASE_POOL_PRE_PING", "true") == "true"
+DATABASE_STATEMENT_CACHE_SIZE = int(
+    os.environ.get("DATABASE_STATEMENT_CACHE_SIZE", 100)
+)
+DATABASE_ECHO = os.environ.get(
+    "DATABASE_ECHO", "debug" if ENVIRONMENT == "development" else "false"
+)
+
+DATABASE_REPLICA_URLS = [
+    url for url in os.environ.get("DATABASE_REPLICA_URLS", "").split(",") if url
+]
+DATABASE_REPLICA_MAX_LAG = float(os.environ.get("DATABASE_REPLICA_MAX_LAG", 5))
+DATABASE_REPLICA_LAG_CHECK_INTERVAL = float(
+    os.environ.get("DATABASE_REPLICA_LAG_CHECK_INTERVAL", 10)
+)
+DATABASE_READ_YOUR_WRITES_WINDOW = float(
+    os.environ.get("DATABASE_READ_YOUR_WRITES_WINDOW", 10)
+)
+
+READ_ONLY_METHODS = ("GET", "HEAD")
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "END"
+)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _do_get(self):
+        started_at = perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            wait_seconds = perf_counter() - started_at
+            self.checkouts += 1
+            self.total_wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+
+
+def get_echo_level(echo: str) -> bool | str:
+    if echo == "debug":
+        return "debug"
+    return echo == "true"
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    duration: float = 0.0
+    scope: dict | None = field(default=None, repr=False)
+
+
+# Statistics of the request being served. The async engine runs its sync core
+# in greenlets that share the caller's context, so listeners see this value.
+query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+QUERY_STARTED_AT = "query_started_at"
+
+
+@contextmanager
+def collect_query_stats(scope: dict | None = None) -> Iterator[QueryStats]:
+    """Counts the statements executed, on any tracked engine, inside the block.
+
+    ``scope`` is the ASGI scope of the request being served, if any; slow
+    statements are attributed to its route.
+    """
+    stats = QueryStats(scope=scope)
+    token = query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        query_stats.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(QUERY_STARTED_AT, []).append(perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _record_query(conn, statement, parameters, executemany)
+
+
+def _handle_error(exception_context):
+    if exception_context.connection is not None:
+        context = exception_context.execution_context
+        _record_query(
+            exception_context.connection,
+            exception_context.statement,
+            exception_context.parameters,
+            context is not None and context.executemany,
+        )
+
+
+def _record_query(conn, statement: str, parameters, executemany: bool):
+    started = conn.info.get(QUERY_STARTED_AT)
+    if not started:
+        return
+    duration = perf_counter() - started.pop()
+    stats = query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += duration
+    slow_query_recorder.observe(
+        conn.engine,
+        statement,
+        parameters,
+        executemany,
+        duration,
+        scope=stats.scope if stats is not None else None,
+    )
+
+
+def track_queries(sync_engine: Engine):
+    """Feeds every statement run on ``sync_engine`` into ``collect_query_stats``."""
+    if not event.contains(sync_engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(sync_engine, "handle_error", _handle_error)
+
+
+def build_engine(database_url: str) -> AsyncEngine:
+    db_engine = create_async_engine(
+        database_url,
+        echo=get_echo_level(DATABASE_ECHO),
+        poolclass=InstrumentedQueuePool,
+        pool_size=DATABASE_POOL_SIZE,
+        max_overflow=DATABASE_MAX_OVERFLOW,
+        pool_timeout=DATABASE_POOL_TIMEOUT,
+        pool_recycle=DATABASE_POOL_RECYCLE,
+        pool_pre_ping=DATABASE_POOL_PRE_PING,
+        connect_args={
+            "statement_cache_size": DATABASE_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": DATABASE_STATEMENT_CACHE_SIZE,
+        },
+    )
+    track_queries(db_engine.sync_engine)
+    slow_query_recorder.track(db_engine)
+    return db_engine
+
 
+def get_pool_stats(db_engine: AsyncEngine) -> dict[str, int | float]:
+    pool = db_engine.pool
+    stats = {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+    }
+    if isinstance(pool, InstrumentedQueuePool):
+        stats.update(
+            checkouts=pool.checkouts,
+            avg_wait_seconds=(
+                pool.total_wait_seconds / pool.checkouts if pool.checkouts else 0.0
+            ),
+            max_wait_seconds=pool.max_wait_seconds,
+        )
+    return stats
 
-async def get_db_session() -> AsyncSession:
-    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-    async with async_session() as session:
+
+class ReplicaRouter:
+    """Chooses where read-only requests run.
+
+    Replicas are used round-robin while their last measured replication lag is
+    within ``max_lag``; lag is refreshed in the background every
+    ``lag_check_interval`` seconds and a replica with unknown or excessive lag
+    is skipped. Principals that wrote recently stick to the primary for
+    ``sticky_window`` seconds so they read their own writes.
+    """
+
+    def __init__(
+        self,
+        primary: sessionmaker,
+        replicas: list[tuple[AsyncEngine, sessionmaker]],
+        max_lag: float,
+        lag_check_interval: float,
+        sticky_window: float,
+    ):
+        self.primary = primary
+        self.replicas = replicas
+        self.max_lag = max_lag
+        self.lag_check_interval = lag_check_interval
+        self.replica_lag: dict[AsyncEngine, float | None] = {
+            replica_engine: None for replica_engine, _ in replicas
+        }
+        self._lag_checked_at: dict[AsyncEngine, float] = {}
+        self._next_replica = 0
+        self._lag_checks: set[asyncio.Task] = set()
+        self._recent_writers = TTLCache(max_size=10000, ttl=sticky_window)
+
+    def mark_write(self, user_id: int | None):
+        if user_id is not None:
+            self._recent_writers.set(user_id, True)
+
+    def max_staleness(self, db_session: AsyncSession) -> float:
+        """How many seconds behind the primary ``db_session`` may read.
+
+        A replica is used while its lag, measured up to ``lag_check_interval``
+        seconds ago, is within ``max_lag``.
+        """
+        if any(db_session.bind is replica for replica, _ in self.replicas):
+            return self.max_lag + self.lag_check_interval
+        return 0.0
+
+    def choose(self, method: str, user_id: int | None = None) -> sessionmaker:
+        if method not in READ_ONLY_METHODS or not self.replicas:
+            return self.primary
+
+        if user_id is not None and self._recent_writers.get(user_id):
+            return self.primary
+
+        for _ in range(len(self.replicas)):
+            replica_engine, replica_session = self.replicas[self._next_replica]
+            self._next_replica = (self._next_replica + 1) % len(self.replicas)
+            self._schedule_lag_check(replica_engine)
+
+            lag = self.replica_lag[replica_engine]
+            if lag is not None and lag <= self.max_lag:
+                return replica_session
+
+        return self.primary
+
+    def _schedule_lag_check(self, replica_engine: AsyncEngine):
+        checked_at = self._lag_checked_at.get(replica_engine)
+        if (
+            checked_at is not None
+            and monotonic() - checked_at < self.lag_check_interval
+        ):
+            return
+
+        self._lag_checked_at[replica_engine] = monotonic()
+        lag_check = asyncio.get_running_loop().create_task(
+            self.check_lag(replica_engine)
+        )
+        self._lag_checks.add(lag_check)
+        lag_check.add_done_callback(self._lag_checks.discard)
+
+    async def check_lag(self, replica_engine: AsyncEngine):
+        try:
+            async with replica_engine.connect() as connection:
+                result = await connection.execute(REPLICA_LAG_QUERY)
+                self.replica_lag[replica_engine] = float(result.scalar())
+        except Exception:
+            self.replica_lag[replica_engine] = None
+
+
+engine = build_engine(SQLALCHEMY_DATABASE_URL)
+async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+replica_engines = [build_engine(url) for url in DATABASE_REPLICA_URLS]
+replica_router = ReplicaRouter(
+    primary=async_session,
+    replicas=[
+        (
+            replica_engine,
+            sessionmaker(replica_engine, class_=AsyncSession, expire_on_commit=False),
+        )
+        for replica_engine in replica_engines
+    ],
+    max_lag=DATABASE_REPLICA_MAX_LAG,
+    lag_check_interval=DATABASE_REPLICA_LAG_CHECK_INTERVAL,
+    sticky_window=DATABASE_READ_YOUR_WRITES_WINDOW,
+)
+
+
+async def get_db_session(request: Request) -> AsyncSession:
+    token_user = getattr(request.state, "user", None)
+    user_id = token_user.id if token_user is not None else None
+
+    # An AsyncSession only checks out a connection on its first statement.
+    session = replica_router.choose(request.method, user_id)()
+    try:
         yield session
+    finally:
+        if request.method not in READ_ONLY_METHODS:
+            replica_router.mark_write(user_id)
+        await session.close()
+
+
+UNIT_OF_WORK_DEPTH = "unit_of_work_depth"
+AFTER_COMMIT_CALLBACKS = "after_commit_callbacks"
+
+
+@asynccontextmanager
+async def unit_of_work(db_session: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """Runs the enclosed writes in one transaction and commits them once.
+
+    Nested units of work join the outermost one, so service functions can be
+    composed without committing halfway. Any exception rolls the whole
+    transaction back.
+    """
+    depth = db_session.info.get(UNIT_OF_WORK_DEPTH, 0)
+    db_session.info[UNIT_OF_WORK_DEPTH] = depth + 1
+    try:
+        yield db_session
+        if depth == 0:
+            await db_session.commit()
+    except Exception:
+        if depth == 0:
+            db_session.info.pop(AFTER_COMMIT_CALLBACKS, None)
+            await db_session.rollback()
+        raise
+    finally:
+        db_session.info[UNIT_OF_WORK_DEPTH] = depth
+
+    if depth == 0:
+        for callback in db_session.info.pop(AFTER_COMMIT_CALLBACKS, []):
+            callback()
+
+
+def run_after_commit(db_session: AsyncSession, callback: Callable[[], None]):
+    """Calls ``callback`` once the current unit of work has committed.
+
+    Outside a unit of work the callback runs immediately; if the unit of work
+    rolls back it never runs.
+    """
+    if not db_session.info.get(UNIT_OF_WORK_DEPTH):
+        callback()
+        return
+    db_session.info.setdefault(AFTER_COMMIT_CALLBACKS, []).append(callback)
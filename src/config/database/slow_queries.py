@@ -0,0 +1,289 @@
+import asyncio
+import logging
+import os
+import re
+from collections import deque
+from contextvars import Context, ContextVar
+from dataclasses import dataclass
+from datetime import datetime
+from logging.handlers import QueueListener, RotatingFileHandler
+from queue import Full, Queue
+from random import random
+from typing import Any
+
+from dotenv import load_dotenv
+from pydantic import BaseModel
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.core.responses import encode_json
+from src.core.routing import route_template
+
+load_dotenv("src/config/.env")
+
+DATABASE_SLOW_QUERY_THRESHOLD_MS = float(
+    os.environ.get("DATABASE_SLOW_QUERY_THRESHOLD_MS", 0)
+)
+DATABASE_SLOW_QUERY_EXPLAIN_RATE = float(
+    os.environ.get("DATABASE_SLOW_QUERY_EXPLAIN_RATE", 0.1)
+)
+DATABASE_SLOW_QUERY_EXPLAIN_TIMEOUT_MS = int(
+    os.environ.get("DATABASE_SLOW_QUERY_EXPLAIN_TIMEOUT_MS", 10000)
+)
+DATABASE_SLOW_QUERY_BUFFER_SIZE = int(
+    os.environ.get("DATABASE_SLOW_QUERY_BUFFER_SIZE", 500)
+)
+DATABASE_SLOW_QUERY_LOG = os.environ.get("DATABASE_SLOW_QUERY_LOG", None)
+DATABASE_SLOW_QUERY_LOG_MAX_BYTES = int(
+    os.environ.get("DATABASE_SLOW_QUERY_LOG_MAX_BYTES", 10 * 1024 * 1024)
+)
+DATABASE_SLOW_QUERY_LOG_BACKUPS = int(
+    os.environ.get("DATABASE_SLOW_QUERY_LOG_BACKUPS", 5)
+)
+
+# EXPLAIN ANALYZE runs the statement again, so only plain reads are explained
+# and no more than a couple of them at a time. Reads that take row or advisory
+# locks, or otherwise have side effects, would be repeated too.
+EXPLAINABLE_PREFIX = "SELECT"
+SIDE_EFFECTS = re.compile(
+    r"\bFOR\s+(?:NO\s+KEY\s+UPDATE|UPDATE|KEY\s+SHARE|SHARE)\b"
+    r"|\b(?:pg_(?:try_)?advisory_\w+|nextval|setval|pg_notify)\s*\(",
+    re.IGNORECASE,
+)
+MAX_CONCURRENT_EXPLAINS = 2
+
+logger = logging.getLogger(__name__)
+
+# Set inside the background EXPLAIN tasks, whose own statements are not slow
+# queries of the application.
+explaining: ContextVar[bool] = ContextVar("explaining", default=False)
+
+
+@dataclass
+class SlowQuery:
+    statement: str
+    parameters: Any
+    duration_ms: float
+    route: str | None
+    recorded_at: datetime
+    plan: str | None = None
+
+
+class SlowQueryOffender(BaseModel):
+    statement: str
+    count: int
+    total_duration_ms: float
+    max_duration_ms: float
+    avg_duration_ms: float
+    routes: list[str]
+    parameters: Any
+    last_seen_at: datetime
+    plan: str | None
+
+
+def _value_shape(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> Any:
+    """Describes bound parameters by type, so no user data reaches the log."""
+    if executemany:
+        rows = list(parameters or [])
+        return {"rows": len(rows), "row": parameter_shape(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        return {name: _value_shape(value) for name, value in parameters.items()}
+    return [_value_shape(value) for value in parameters or ()]
+
+
+def route_name(scope: dict | None) -> str | None:
+    """Returns ``"<METHOD> <path template>"`` for the request in ``scope``."""
+    if scope is None:
+        return None
+    return f"{scope['method']} {route_template(scope) or scope['path']}"
+
+
+def is_explainable(statement: str) -> bool:
+    return (
+        statement.lstrip()[: len(EXPLAINABLE_PREFIX)].upper() == EXPLAINABLE_PREFIX
+        and SIDE_EFFECTS.search(statement) is None
+    )
+
+
+class SlowQueryRecorder:
+    """Keeps the most recent statements slower than ``threshold_ms``.
+
+    Disabled while ``threshold_ms`` is 0. Each slow statement is kept in a ring
+    buffer of ``buffer_size`` entries and, when ``log_path`` is set, appended as
+    a JSON line to a rotating log file by a background thread, so the event
+    loop never waits on the disk. A sample (``explain_rate``) of slow
+    reads is run again under ``EXPLAIN (ANALYZE, BUFFERS)`` on a separate
+    connection, in the background and inside a transaction that is rolled
+    back, and the plan is attached to the entry.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float,
+        explain_rate: float,
+        buffer_size: int,
+        log_path: str | None = None,
+    ):
+        self.threshold_ms = threshold_ms
+        self.explain_rate = explain_rate
+        self.entries: deque[SlowQuery] = deque(maxlen=buffer_size)
+        self._engines: dict[Engine, AsyncEngine] = {}
+        self._explains: set[asyncio.Task] = set()
+        self._log_queue: Queue[logging.LogRecord] = Queue(maxsize=buffer_size)
+        self._log_writer = (
+            QueueListener(
+                self._log_queue,
+                RotatingFileHandler(
+                    log_path,
+                    maxBytes=DATABASE_SLOW_QUERY_LOG_MAX_BYTES,
+                    backupCount=DATABASE_SLOW_QUERY_LOG_BACKUPS,
+                    delay=True,
+                ),
+            )
+            if log_path
+            else None
+        )
+        self._log_writer_started = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold_ms > 0
+
+    def track(self, db_engine: AsyncEngine):
+        """Lets sampled statements of ``db_engine`` be explained."""
+        self._engines[db_engine.sync_engine] = db_engine
+
+    def observe(
+        self,
+        sync_engine: Engine,
+        statement: str,
+        parameters: Any,
+        executemany: bool,
+        duration: float,
+        scope: dict | None = None,
+    ):
+        duration_ms = duration * 1000
+        if not self.enabled or duration_ms < self.threshold_ms or explaining.get():
+            return
+
+        entry = SlowQuery(
+            statement=statement,
+            parameters=parameter_shape(parameters, executemany),
+            duration_ms=round(duration_ms, 2),
+            route=route_name(scope),
+            recorded_at=datetime.utcnow(),
+        )
+        self.entries.append(entry)
+        self._write(entry)
+        logger.warning(
+            "Slow query (%.0f ms) in %s", duration_ms, entry.route or "background"
+        )
+
+        if (
+            not executemany
+            and is_explainable(statement)
+            and random() < self.explain_rate
+        ):
+            self._schedule_explain(sync_engine, entry, parameters)
+
+    def offenders(self, limit: int) -> list[SlowQueryOffender]:
+        """Groups the buffered entries by statement, most total time first."""
+        groups: dict[str, list[SlowQuery]] = {}
+        for entry in self.entries:
+            groups.setdefault(entry.statement, []).append(entry)
+
+        offenders = []
+        for statement, entries in groups.items():
+            durations = [entry.duration_ms for entry in entries]
+            worst = max(entries, key=lambda entry: entry.duration_ms)
+            plans = [entry.plan for entry in entries if entry.plan is not None]
+            offenders.append(
+                SlowQueryOffender(
+                    statement=statement,
+                    count=len(entries),
+                    total_duration_ms=round(sum(durations), 2),
+                    max_duration_ms=worst.duration_ms,
+                    avg_duration_ms=round(sum(durations) / len(durations), 2),
+                    routes=sorted({entry.route for entry in entries if entry.route}),
+                    parameters=worst.parameters,
+                    last_seen_at=entries[-1].recorded_at,
+                    plan=plans[-1] if plans else None,
+                )
+            )
+
+        offenders.sort(key=lambda offender: offender.total_duration_ms, reverse=True)
+        return offenders[:limit]
+
+    def clear(self):
+        self.entries.clear()
+
+    def close(self):
+        """Waits for the queued log lines to be written."""
+        if self._log_writer_started:
+            self._log_writer.stop()
+            self._log_writer_started = False
+
+    def _write(self, entry: SlowQuery):
+        if self._log_writer is None:
+            return
+
+        if not self._log_writer_started:
+            self._log_writer.start()
+            self._log_writer_started = True
+        line = encode_json(entry.__dict__).decode()
+        try:
+            self._log_queue.put_nowait(logging.makeLogRecord({"msg": line}))
+        except Full:
+            # The disk cannot keep up; the entry is still in the ring buffer.
+            pass
+
+    def _schedule_explain(self, sync_engine: Engine, entry: SlowQuery, parameters):
+        db_engine = self._engines.get(sync_engine)
+        if db_engine is None or len(self._explains) >= MAX_CONCURRENT_EXPLAINS:
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        # A fresh context keeps the EXPLAIN out of the request's query stats.
+        explain = loop.create_task(
+            self.explain(db_engine, entry, parameters), context=Context()
+        )
+        self._explains.add(explain)
+        explain.add_done_callback(self._explains.discard)
+
+    async def explain(self, db_engine: AsyncEngine, entry: SlowQuery, parameters):
+        explaining.set(True)
+        try:
+            async with db_engine.connect() as connection:
+                await connection.exec_driver_sql(
+                    "SET LOCAL statement_timeout = "
+                    f"{DATABASE_SLOW_QUERY_EXPLAIN_TIMEOUT_MS}"
+                )
+                result = await connection.exec_driver_sql(
+                    f"EXPLAIN (ANALYZE, BUFFERS) {entry.statement}", parameters
+                )
+                entry.plan = "\n".join(row[0] for row in result)
+        except Exception:
+            logger.warning("Could not explain slow query", exc_info=True)
+            return
+
+        self._write(entry)
+
+
+slow_query_recorder = SlowQueryRecorder(
+    threshold_ms=DATABASE_SLOW_QUERY_THRESHOLD_MS,
+    explain_rate=DATABASE_SLOW_QUERY_EXPLAIN_RATE,
+    buffer_size=DATABASE_SLOW_QUERY_BUFFER_SIZE,
+    log_path=DATABASE_SLOW_QUERY_LOG,
+)
@@ -13,10 +13,12 @@ from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.auth.services import signin_user
-from src.config.database.setup import get_db_session
+from src.config.database.setup import get_db_session, track_queries
+from src.core.cache import caches
+from src.core.middlewares import query_stats_middleware
 from src.core.models import User, Customer, Address
 from src.main import app
-from src.orders.models import Order
+from src.orders.models import Order, OrderEmployee, OrderService, OrderVehicle
 from src.services.models import Service
 from src.users.service import create_customer
 from src.vehicles.models import Vehicle, CustomerVehicle
@@ -37,9 +39,22 @@ ENVIRONMENT = getenv("ENV", None)
 db_logs = "debug" if ENVIRONMENT == "development" else True
 
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    for cache in caches.values():
+        cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def enforce_query_budget(monkeypatch):
+    # Endpoints running more statements than their budget fail the test.
+    monkeypatch.setattr(query_stats_middleware, "DATABASE_ENFORCE_QUERY_BUDGET", True)
+
+
 @pytest_asyncio.fixture
 async def db_engine():
     engine = create_async_engine(TEST_SQLALCHEMY_DATABASE_URL, echo=db_logs)
+    track_queries(engine.sync_engine)
     yield engine
 
 
@@ -362,14 +377,26 @@ def order_payload():
 async def order(db_session, customer, service, customer_vehicle, order_payload):
     test_order = Order(
         customer_id=order_payload["customer_id"],
-        customer_vehicle_ids=order_payload["customer_vehicle_ids"],
-        service_ids=order_payload["service_ids"],
-        employee_ids=order_payload["employee_ids"],
         start_date=order_payload["start_date"],
         estimated_time=order_payload["estimated_time"],
         status=order_payload["status"],
     )
     db_session.add(test_order)
+    await db_session.flush()
+    db_session.add_all(
+        [
+            OrderVehicle(order_id=test_order.id, customer_vehicle_id=vehicle_id)
+            for vehicle_id in order_payload["customer_vehicle_ids"]
+        ]
+        + [
+            OrderService(order_id=test_order.id, service_id=service_id)
+            for service_id in order_payload["service_ids"]
+        ]
+        + [
+            OrderEmployee(order_id=test_order.id, employee_id=employee_id)
+            for employee_id in order_payload["employee_ids"]
+        ]
+    )
     await db_session.commit()
     await db_session.refresh(test_order)
     return test_order
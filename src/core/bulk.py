@@ -0,0 +1,139 @@
+from enum import Enum
+from os import getenv
+from typing import Hashable, Iterator, Sequence, TypeVar
+
+from dotenv import load_dotenv
+from pydantic import BaseModel, conlist
+from sqlalchemy import tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+load_dotenv("src/config/.env")
+
+MAX_BULK_SIZE = int(getenv("MAX_BULK_SIZE", 1000))
+
+# PostgreSQL's wire protocol caps a statement at 32767 bind parameters.
+MAX_STATEMENT_PARAMETERS = 32767
+
+T = TypeVar("T")
+
+
+class BulkStatus(str, Enum):
+    CREATED = "created"
+    EXISTING = "existing"
+    REJECTED = "rejected"
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    status: BulkStatus
+    id: int | None = None
+    detail: str | None = None
+
+
+class BulkResponse(BaseModel):
+    created: int
+    existing: int
+    rejected: int
+    items: list[BulkItemResult]
+
+
+def bulk_request(schema: type[BaseModel]) -> type[list]:
+    return conlist(schema, min_items=1, max_items=MAX_BULK_SIZE)
+
+
+def bulk_response(items: list[BulkItemResult]) -> BulkResponse:
+    counts = {status: 0 for status in BulkStatus}
+    for item in items:
+        counts[item.status] += 1
+    return BulkResponse(
+        created=counts[BulkStatus.CREATED],
+        existing=counts[BulkStatus.EXISTING],
+        rejected=counts[BulkStatus.REJECTED],
+        items=items,
+    )
+
+
+def batches(rows: Sequence[T], columns: int) -> Iterator[Sequence[T]]:
+    """Splits ``rows`` so each multi-row statement stays within the parameter cap.
+
+    ``columns`` should count every bound column, including those filled in by
+    column defaults.
+    """
+    size = max(MAX_STATEMENT_PARAMETERS // max(columns, 1), 1)
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
+
+def resolve_keys(
+    keys: list[Hashable], created: dict[Hashable, int], existing: dict[Hashable, int]
+) -> list[BulkItemResult]:
+    """Maps each submitted key to the row that now holds it.
+
+    Only the first occurrence of a key inserted by this batch counts as
+    created; repeats within the batch and rows that were already stored are
+    reported as existing.
+    """
+    seen = set()
+    results = []
+    for index, key in enumerate(keys):
+        if key in created and key not in seen:
+            results.append(
+                BulkItemResult(index=index, status=BulkStatus.CREATED, id=created[key])
+            )
+        else:
+            results.append(
+                BulkItemResult(
+                    index=index,
+                    status=BulkStatus.EXISTING,
+                    id=created.get(key, existing.get(key)),
+                )
+            )
+        seen.add(key)
+    return results
+
+
+async def insert_unique(
+    model: type[SQLModel],
+    keys: tuple[str, ...],
+    rows: list[dict],
+    db_session: AsyncSession,
+    constraint: str | None = None,
+    index_elements: list | None = None,
+) -> list[BulkItemResult]:
+    """Inserts ``rows`` into a table deduplicated on ``keys``, in bulk.
+
+    Rows go out as multi-row ``INSERT ... ON CONFLICT DO NOTHING RETURNING``
+    statements, and the ids of rows that already existed are resolved with a
+    single lookup. The conflict target is a named ``constraint`` or, for
+    expression indexes, their ``index_elements``. Must run inside a unit of
+    work.
+    """
+    columns = [model.__table__.c[name] for name in keys]
+    submitted = [tuple(row[name] for name in keys) for row in rows]
+    first_rows = {}
+    for key, row in zip(submitted, rows):
+        first_rows.setdefault(key, row)
+
+    created = {}
+    for batch in batches(list(first_rows.values()), len(model.__table__.c)):
+        result = await db_session.execute(
+            insert(model)
+            .values(list(batch))
+            .on_conflict_do_nothing(
+                constraint=constraint, index_elements=index_elements
+            )
+            .returning(model.__table__.c.id, *columns)
+        )
+        created.update((tuple(row[1:]), row[0]) for row in result)
+
+    existing = {}
+    conflicting = [key for key in first_rows if key not in created]
+    for batch in batches(conflicting, len(keys)):
+        result = await db_session.execute(
+            select(model.__table__.c.id, *columns).where(tuple_(*columns).in_(batch))
+        )
+        existing.update((tuple(row[1:]), row[0]) for row in result)
+
+    return resolve_keys(submitted, created, existing)
@@ -0,0 +1,129 @@
+from collections import OrderedDict
+from os import getenv
+from time import monotonic, time
+from typing import Any, Awaitable, Callable, Hashable
+
+from dotenv import load_dotenv
+
+load_dotenv("src/config/.env")
+
+CATALOG_CACHE_SIZE = int(getenv("CATALOG_CACHE_SIZE", 256))
+CATALOG_CACHE_TTL = float(getenv("CATALOG_CACHE_TTL", 300))
+
+
+class TTLCache:
+    """Bounded in-process LRU cache whose entries expire at a given timestamp."""
+
+    def __init__(self, max_size: int, ttl: float | None = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, tuple[float | None, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, expires_at: float | None = None):
+        if self.max_size <= 0:
+            return
+
+        if expires_at is None and self.ttl is not None:
+            expires_at = time() + self.ttl
+
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int | float]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class CatalogCache:
+    """Read-through cache of pre-serialized responses for a near-static catalog.
+
+    Keys are scoped by a generation that every write bumps, so a single
+    ``invalidate`` drops all cached pages and items at once; entries of older
+    generations simply age out of the LRU. A value loaded while a write
+    committed is returned but not stored, and so is a value read from a
+    source up to ``max_staleness`` seconds behind that may predate the last
+    write, e.g. a read replica.
+    """
+
+    def __init__(self, max_size: int, ttl: float | None = None):
+        self.entries = TTLCache(max_size=max_size, ttl=ttl)
+        self.generation = 0
+        self.invalidated_at = float("-inf")
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any | None]],
+        max_staleness: float = 0.0,
+    ) -> Any | None:
+        generation = self.generation
+        value = self.entries.get((generation, key))
+        if value is not None:
+            return value
+
+        started_at = monotonic()
+        value = await loader()
+        if (
+            value is not None
+            and generation == self.generation
+            and started_at - self.invalidated_at >= max_staleness
+        ):
+            self.entries.set((generation, key), value)
+        return value
+
+    def invalidate(self):
+        self.generation += 1
+        self.invalidated_at = monotonic()
+
+    def clear(self):
+        self.entries.clear()
+        self.invalidate()
+
+    def stats(self) -> dict[str, int | float]:
+        return {**self.entries.stats(), "generation": self.generation}
+
+
+caches: dict[str, TTLCache | CatalogCache] = {}
+
+
+def register_cache(name: str, cache: TTLCache | CatalogCache):
+    caches[name] = cache
+    return cache
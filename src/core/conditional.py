@@ -0,0 +1,105 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from hashlib import sha256
+from http import HTTPStatus
+from typing import Any, Callable, Generic, Iterable, TypeVar
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from src.core.responses import dump_json
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class Revision(Generic[T]):
+    """A response value together with the validators describing its version."""
+
+    value: T
+    etag: str
+    last_modified: datetime | None = None
+
+
+def make_etag(*parts: Any) -> str:
+    digest = sha256(repr(parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def content_etag(body: bytes) -> str:
+    return f'"{sha256(body).hexdigest()[:32]}"'
+
+
+def latest(timestamps: Iterable[datetime | None]) -> datetime | None:
+    return max((timestamp for timestamp in timestamps if timestamp), default=None)
+
+
+def http_date(timestamp: datetime) -> str:
+    return format_datetime(timestamp.astimezone(timezone.utc), usegmt=True)
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: datetime | None
+) -> bool:
+    """Evaluates If-None-Match, falling back to If-Modified-Since.
+
+    If-None-Match uses the weak comparison RFC 9110 prescribes for GET, and
+    If-Modified-Since is ignored whenever If-None-Match is present.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+        return "*" in candidates or etag in [
+            candidate.removeprefix("W/") for candidate in candidates
+        ]
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.astimezone(timezone.utc).replace(microsecond=0) <= since
+
+
+def conditional_response(
+    request: Request,
+    etag: str,
+    render: Callable[[], bytes],
+    last_modified: datetime | None = None,
+) -> Response:
+    """Answers 304 when the client's copy is current, otherwise renders the body.
+
+    ``render`` is only called for a full response, so a revalidation never
+    pays for serialization.
+    """
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+    return Response(content=render(), media_type="application/json", headers=headers)
+
+
+def render_json(model: BaseModel) -> bytes:
+    return dump_json(type(model), model)
+
+
+def revision_response(
+    request: Request,
+    revision: Revision,
+    render: Callable[[Any], bytes] = lambda body: body,
+) -> Response:
+    return conditional_response(
+        request,
+        etag=revision.etag,
+        render=lambda: render(revision.value),
+        last_modified=revision.last_modified,
+    )
@@ -0,0 +1,229 @@
+import logging
+from dataclasses import dataclass
+from hashlib import sha1
+from os import getenv
+from queue import Full, Queue
+from random import random
+from threading import Thread
+from time import monotonic
+from traceback import extract_tb
+from typing import Callable
+
+import sentry_sdk
+from dotenv import load_dotenv
+from fastapi import HTTPException, Request
+
+from src.core.cache import TTLCache, register_cache
+
+load_dotenv("src/config/.env")
+
+ENVIRONMENT = getenv("ENV", None)
+ERROR_REPORT_SAMPLE_RATE = float(getenv("ERROR_REPORT_SAMPLE_RATE", 1.0))
+ERROR_REPORT_EXPECTED_SAMPLE_RATE = float(
+    getenv(
+        "ERROR_REPORT_EXPECTED_SAMPLE_RATE",
+        1.0 if ENVIRONMENT == "development" else 0.0,
+    )
+)
+ERROR_REPORT_DEDUPE_WINDOW = float(getenv("ERROR_REPORT_DEDUPE_WINDOW", 60))
+ERROR_REPORT_QUEUE_SIZE = int(getenv("ERROR_REPORT_QUEUE_SIZE", 1000))
+ERROR_REPORT_MAX_FINGERPRINTS = int(getenv("ERROR_REPORT_MAX_FINGERPRINTS", 10000))
+
+# Tag set on every event this module sends, see ``drop_duplicate_reports``.
+REPORTER_TAG = "error_reporter"
+# Attribute marking exceptions that were handed to the error reporter.
+SEEN_ATTRIBUTE = "_error_reporter_seen"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Occurrences:
+    window_started_at: float
+    suppressed: int = 0
+
+
+@dataclass
+class ErrorReport:
+    exception: BaseException
+    fingerprint: str
+    expected: bool
+    suppressed: int
+    method: str | None = None
+    path: str | None = None
+
+
+def is_expected(e: BaseException) -> bool:
+    """Client errors (4xx) are part of normal operation; anything else is a bug."""
+    return isinstance(e, HTTPException) and e.status_code < 500
+
+
+def fingerprint(e: BaseException) -> str:
+    """Identifies an error by its type, status and the function that raised it."""
+    frames = extract_tb(e.__traceback__)
+    parts = [type(e).__module__, type(e).__qualname__]
+    if frames:
+        parts.append(f"{frames[-1].filename}:{frames[-1].name}")
+    if isinstance(e, HTTPException):
+        parts.append(str(e.status_code))
+    return sha1("|".join(parts).encode()).hexdigest()[:16]
+
+
+def send_report(report: ErrorReport):
+    exception = report.exception
+    if report.expected:
+        logger.info("%s %s: %r", report.method, report.path, exception)
+    else:
+        logger.error(
+            "Unexpected error on %s %s",
+            report.method,
+            report.path,
+            exc_info=(type(exception), exception, exception.__traceback__),
+        )
+
+    if sentry_sdk.Hub.current.client is None:
+        return
+
+    with sentry_sdk.push_scope() as scope:
+        scope.fingerprint = [report.fingerprint]
+        scope.set_tag(REPORTER_TAG, "true")
+        scope.set_tag("expected", str(report.expected).lower())
+        scope.set_extra("suppressed_occurrences", report.suppressed)
+        if report.method is not None:
+            scope.set_context("request", {"method": report.method, "url": report.path})
+        sentry_sdk.capture_exception(exception)
+
+
+def drop_duplicate_reports(event: dict, hint: dict) -> dict | None:
+    """Sentry ``before_send`` hook dropping errors captured around us.
+
+    Sentry's integrations capture 5xx ``HTTPException``, unhandled exceptions
+    and logged errors by themselves; those already went through
+    ``error_reporter``, which sampled and deduplicated them.
+    """
+    exc_info = hint.get("exc_info")
+    if (
+        exc_info is not None
+        and getattr(exc_info[1], SEEN_ATTRIBUTE, False)
+        and REPORTER_TAG not in event.get("tags", {})
+    ):
+        return None
+    return event
+
+
+class ErrorReporter:
+    """Decides which errors are worth reporting and reports them off the request.
+
+    Expected and unexpected errors are sampled at their own rates. Errors with
+    the same fingerprint are reported once per ``dedupe_window`` seconds; the
+    next report carries how many were suppressed or sampled out since the last
+    one. Reports are handed to a background thread through a bounded queue,
+    so the response never waits on logging or on Sentry, and reports are
+    dropped when it is full.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float,
+        expected_sample_rate: float,
+        dedupe_window: float,
+        queue_size: int,
+        send: Callable[[ErrorReport], None] = send_report,
+    ):
+        self.sample_rate = sample_rate
+        self.expected_sample_rate = expected_sample_rate
+        self.dedupe_window = dedupe_window
+        self.send = send
+        self.queue: Queue[ErrorReport] = Queue(maxsize=queue_size)
+        self.occurrences = TTLCache(max_size=ERROR_REPORT_MAX_FINGERPRINTS)
+        self.reported = 0
+        self.sampled_out = 0
+        self.deduplicated = 0
+        self.dropped = 0
+        self._worker: Thread | None = None
+
+    def report(self, e: BaseException, request: Request | None = None):
+        setattr(e, SEEN_ATTRIBUTE, True)
+        expected = is_expected(e)
+        sample_rate = self.expected_sample_rate if expected else self.sample_rate
+        if sample_rate <= 0:
+            self.sampled_out += 1
+            return
+
+        key = fingerprint(e)
+        now = monotonic()
+        occurrences = self.occurrences.get(key)
+        if (
+            occurrences is not None
+            and now - occurrences.window_started_at < self.dedupe_window
+        ):
+            occurrences.suppressed += 1
+            self.deduplicated += 1
+            return
+
+        # The window rolls over whether or not this occurrence is sampled, so
+        # the ones it goes on to suppress are still counted, and a sampled out
+        # occurrence is carried to the next report rather than lost.
+        suppressed = occurrences.suppressed if occurrences is not None else 0
+        occurrences = Occurrences(window_started_at=now)
+        self.occurrences.set(key, occurrences)
+        if random() >= sample_rate:
+            occurrences.suppressed = suppressed + 1
+            self.sampled_out += 1
+            return
+
+        report = ErrorReport(
+            exception=e,
+            fingerprint=key,
+            expected=expected,
+            suppressed=suppressed,
+            method=request.method if request is not None else None,
+            path=request.url.path if request is not None else None,
+        )
+        try:
+            self.queue.put_nowait(report)
+        except Full:
+            self.dropped += 1
+            return
+
+        self.reported += 1
+        self._ensure_worker()
+
+    def flush(self):
+        """Blocks until every queued report was sent."""
+        self.queue.join()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "reported": self.reported,
+            "sampled_out": self.sampled_out,
+            "deduplicated": self.deduplicated,
+            "dropped": self.dropped,
+            "queued": self.queue.qsize(),
+        }
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = Thread(
+                target=self._drain, name="error-reporter", daemon=True
+            )
+            self._worker.start()
+
+    def _drain(self):
+        while True:
+            report = self.queue.get()
+            try:
+                self.send(report)
+            except Exception:
+                logger.exception("Could not report error %s", report.fingerprint)
+            finally:
+                self.queue.task_done()
+
+
+error_reporter = ErrorReporter(
+    sample_rate=ERROR_REPORT_SAMPLE_RATE,
+    expected_sample_rate=ERROR_REPORT_EXPECTED_SAMPLE_RATE,
+    dedupe_window=ERROR_REPORT_DEDUPE_WINDOW,
+    queue_size=ERROR_REPORT_QUEUE_SIZE,
+)
+register_cache("error_fingerprints", error_reporter.occurrences)
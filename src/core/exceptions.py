@@ -35,3 +35,44 @@ class CustomerNotFoundException(HTTPException):
             status_code=HTTPStatus.NOT_FOUND,
             detail="Customer not found for given id.",
         )
+
+
+class PasswordHashingUnavailable(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+            detail="Too many authentication requests. Try again shortly.",
+            headers={"Retry-After": "1"},
+        )
+
+
+class InvalidCursor(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail="Invalid pagination cursor.",
+        )
+
+
+class InvalidFields(HTTPException):
+    def __init__(self, fields: list[str]):
+        super().__init__(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail=f"Unknown fields requested: {', '.join(fields)}.",
+        )
+
+
+class InvalidImportFile(HTTPException):
+    def __init__(self, reason: str):
+        super().__init__(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail=f"Invalid import file: {reason}.",
+        )
+
+
+class ProfileNotFound(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail="Profile not found for given id.",
+        )
@@ -0,0 +1,70 @@
+from functools import lru_cache
+from typing import Annotated, Callable, get_type_hints
+
+from fastapi import Query
+from pydantic import BaseModel, create_model
+from sqlalchemy.orm import load_only
+
+from src.core.exceptions import InvalidFields
+from src.core.pagination import Page
+
+Fields = tuple[str, ...] | None
+
+
+def parse_fields(fields: str | None, schema: type[BaseModel]) -> Fields:
+    """Turns ``fields=a,b`` into the matching ``schema`` field names.
+
+    Names come back in schema order, so equivalent requests share cache keys.
+    """
+    if fields is None:
+        return None
+
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = sorted(requested - set(schema.__fields__))
+    if unknown or not requested:
+        raise InvalidFields(unknown)
+    return tuple(name for name in schema.__fields__ if name in requested)
+
+
+def fields_query(schema: type[BaseModel]) -> Callable[..., Fields]:
+    description = f"Comma-separated subset of: {', '.join(schema.__fields__)}."
+
+    def dependency(
+        fields: Annotated[str | None, Query(description=description)] = None
+    ) -> Fields:
+        return parse_fields(fields, schema)
+
+    return dependency
+
+
+@lru_cache(maxsize=256)
+def sparse_schema(schema: type[BaseModel], fields: Fields) -> type[BaseModel]:
+    if fields is None:
+        return schema
+
+    annotations = get_type_hints(schema)
+    return create_model(
+        f"{schema.__name__}Fields",
+        **{
+            name: (annotations[name], schema.__fields__[name].field_info)
+            for name in fields
+        },
+    )
+
+
+def sparse_page(schema: type[BaseModel], fields: Fields) -> type[Page]:
+    return Page[sparse_schema(schema, fields)]
+
+
+def load_fields(model, fields: Fields, *required: str) -> list:
+    """Loader options restricting ``model`` to the requested columns.
+
+    ``required`` names columns needed besides the response fields, such as
+    pagination keys or validators.
+    """
+    if fields is None:
+        return []
+
+    columns = model.__table__.columns
+    names = dict.fromkeys((*required, *fields))
+    return [load_only(*(getattr(model, name) for name in names if name in columns))]
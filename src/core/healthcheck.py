@@ -1,8 +1,95 @@
-from fastapi import APIRouter
+from typing import Annotated
+
+from fastapi import APIRouter, Query, Response
+from fastapi.responses import FileResponse
+
+from src.config.database.setup import engine, get_pool_stats, replica_router
+from src.config.database.slow_queries import slow_query_recorder
+from src.core.cache import caches
+from src.core.exceptions import ProfileNotFound
+from src.core.loop_monitor import loop_monitor
+from src.core.metrics import PROMETHEUS_CONTENT_TYPE, registry
+from src.core.middlewares.authentication_middleware import admin_required
+from src.core.profiling import ProfileInfo, profile_store
 
 healthcheck_router = APIRouter()
+metrics_router = APIRouter()
 
 
 @healthcheck_router.get("/healthcheck/")
 async def healthcheck():
     return {"data": "it's alive!"}
+
+
+@healthcheck_router.get("/healthcheck/database/")
+@admin_required
+async def database_healthcheck():
+    return {
+        "data": {
+            "pool": get_pool_stats(engine),
+            "replicas": [
+                {
+                    "pool": get_pool_stats(replica_engine),
+                    "lag_seconds": replica_router.replica_lag[replica_engine],
+                }
+                for replica_engine, _ in replica_router.replicas
+            ],
+        }
+    }
+
+
+@healthcheck_router.get("/healthcheck/cache/")
+@admin_required
+async def cache_healthcheck():
+    return {"data": {name: cache.stats() for name, cache in caches.items()}}
+
+
+@healthcheck_router.get("/healthcheck/slow-queries/")
+@admin_required
+async def slow_queries_healthcheck(
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+):
+    return {
+        "data": {
+            "enabled": slow_query_recorder.enabled,
+            "threshold_ms": slow_query_recorder.threshold_ms,
+            "offenders": slow_query_recorder.offenders(limit),
+        }
+    }
+
+
+@healthcheck_router.get("/healthcheck/profiles/", response_model=list[ProfileInfo])
+@admin_required
+async def list_profiles():
+    return profile_store.profiles()
+
+
+@healthcheck_router.get("/healthcheck/profiles/{profile_id}/")
+@admin_required
+async def download_profile(profile_id: str):
+    path = profile_store.path(profile_id)
+    if path is None:
+        raise ProfileNotFound()
+    return FileResponse(
+        path, media_type="application/octet-stream", filename=f"{profile_id}.prof"
+    )
+
+
+@healthcheck_router.get("/healthcheck/event-loop/")
+@admin_required
+async def event_loop_healthcheck():
+    return {
+        "data": {
+            "enabled": loop_monitor.running,
+            "block_threshold_seconds": loop_monitor.block_threshold,
+            "lag_seconds": {
+                str(q): lag for q, lag in loop_monitor.lag_quantiles().items()
+            },
+            "stalls": list(reversed(loop_monitor.stalls)),
+        }
+    }
+
+
+@metrics_router.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(content=registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,295 @@
+import codecs
+import csv
+from collections import deque
+from dataclasses import dataclass, field
+from os import getenv
+from typing import AsyncIterator, Awaitable, Callable, Sequence
+
+from dotenv import load_dotenv
+from pydantic import BaseModel
+from sqlalchemy import Column, Integer, MetaData, Table, text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core.exceptions import InvalidImportFile
+
+load_dotenv("src/config/.env")
+
+IMPORT_BATCH_SIZE = int(getenv("IMPORT_BATCH_SIZE", 10000))
+MAX_REPORTED_REJECTIONS = int(getenv("MAX_REPORTED_REJECTIONS", 100))
+
+STAGING_METADATA = MetaData()
+# Largest value of a Postgres ``integer`` column.
+MAX_INTEGER = 2**31 - 1
+
+# The upload is read from the raw request body, so it is documented by hand.
+CSV_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {"text/csv": {"schema": {"type": "string", "format": "binary"}}},
+    }
+}
+
+
+class RejectedRow(BaseModel):
+    line: int
+    reason: str
+
+
+class ImportReport(BaseModel):
+    received: int
+    created: int
+    updated: int
+    existing: int
+    rejected: int
+    rejections: list[RejectedRow]
+
+
+@dataclass
+class Rejections:
+    """Counts every rejected row but only keeps the first few for the report."""
+
+    count: int = 0
+    rows: list[RejectedRow] = field(default_factory=list)
+
+    def add(self, line: int, reason: str):
+        self.count += 1
+        if len(self.rows) < MAX_REPORTED_REJECTIONS:
+            self.rows.append(RejectedRow(line=line, reason=reason))
+
+    def report(
+        self, received: int, created: int, updated: int = 0, existing: int = 0
+    ) -> ImportReport:
+        return ImportReport(
+            received=received,
+            created=created,
+            updated=updated,
+            existing=existing,
+            rejected=self.count,
+            rejections=sorted(self.rows, key=lambda row: row.line),
+        )
+
+
+class PendingLines:
+    """Lines handed to a ``csv.reader`` one record at a time.
+
+    Unlike a generator, it can run dry and be refilled, so a single reader,
+    and its line count, is kept for the whole stream.
+    """
+
+    def __init__(self):
+        self.lines: deque[str] = deque()
+
+    def __iter__(self) -> "PendingLines":
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            raise StopIteration
+        return self.lines.popleft()
+
+
+def open_quote(line: str, in_quotes: bool = False) -> bool:
+    """Whether a quoted field is still open after ``line``.
+
+    Follows the default ``csv`` dialect: a quote only opens a field at its
+    start and ``""`` inside a quoted field is an escaped quote.
+    """
+    if not in_quotes and '"' not in line:
+        return False
+
+    closing = False
+    field_start = True
+    for char in line:
+        if closing:
+            closing = False
+            if char == '"':
+                continue
+            in_quotes = False
+        if in_quotes:
+            closing = char == '"'
+            continue
+        if char == '"' and field_start:
+            in_quotes = True
+        field_start = char in ",\r\n"
+    return in_quotes and not closing
+
+
+async def csv_rows(
+    chunks: AsyncIterator[bytes],
+    on_error: Callable[[int, str], None] | None = None,
+    encoding: str = "utf-8-sig",
+) -> AsyncIterator[tuple[int, list[str]]]:
+    """Parses CSV from a byte stream as it arrives, yielding ``(line, fields)``.
+
+    Text is split on ``"\n"`` only and a record is parsed once its quotes are
+    balanced, so quoted fields may span lines and chunks while memory stays
+    bounded by the chunk and field sizes. ``line`` is where the record starts.
+    Malformed records are passed to ``on_error(line, reason)`` and skipped;
+    without it they make the whole file invalid.
+    """
+
+    def malformed(line: int, reason: str):
+        if on_error is None:
+            raise InvalidImportFile(f"Line {line}: {reason}")
+        on_error(line, reason)
+
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pending = PendingLines()
+    reader = csv.reader(pending)
+    max_record_size = csv.field_size_limit()
+    in_quotes = False
+    record_size = 0
+    line = record_start = 1
+
+    def parse() -> list[str] | None:
+        nonlocal record_size
+        record = pending.lines
+        try:
+            if any("\0" in record_line for record_line in record):
+                malformed(record_start, "Contains NUL bytes")
+                return None
+            return next(reader)
+        except csv.Error as e:
+            malformed(record_start, f"Malformed CSV: {e}")
+            return None
+        finally:
+            record.clear()
+            record_size = 0
+
+    def add(text: str) -> bool:
+        nonlocal in_quotes, line, record_size
+        in_quotes = open_quote(text, in_quotes)
+        pending.lines.append(text)
+        line += 1
+        record_size += len(text)
+        if in_quotes and record_size > max_record_size:
+            raise InvalidImportFile(f"Line {record_start}: Quoted field is not closed")
+        return not in_quotes
+
+    text = ""
+    try:
+        async for chunk in chunks:
+            text += decoder.decode(chunk)
+            *lines, text = text.split("\n")
+            for complete in lines:
+                if add(complete + "\n"):
+                    fields = parse()
+                    if fields is not None:
+                        yield record_start, fields
+                    record_start = line
+        text += decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        raise InvalidImportFile(f"File is not valid {encoding} text")
+
+    if text and add(text):
+        fields = parse()
+        if fields is not None:
+            yield record_start, fields
+    elif in_quotes:
+        pending.lines.clear()
+        malformed(record_start, "Quoted field is not closed")
+
+
+def header_positions(header: list[str], columns: Sequence[str]) -> list[int]:
+    names = [name.strip().lower() for name in header]
+    missing = [column for column in columns if column not in names]
+    if missing:
+        raise InvalidImportFile(f"Missing columns: {', '.join(missing)}")
+    return [names.index(column) for column in columns]
+
+
+async def stage_csv(
+    chunks: AsyncIterator[bytes],
+    columns: Sequence[str],
+    parse_row: Callable[[list[str]], tuple],
+    stage: Callable[[list[tuple]], Awaitable[None]],
+    rejections: Rejections,
+) -> int:
+    """Reads ``columns`` from CSV ``chunks`` and hands rows to ``stage`` in batches.
+
+    ``parse_row`` receives the fields in ``columns`` order and returns the
+    record to stage, or raises ``ValueError`` to reject the line. Each
+    staged record is prefixed with its line number. Returns the number of
+    data rows read.
+    """
+    positions = None
+    received = 0
+    batch = []
+
+    def reject(line: int, reason: str):
+        nonlocal received
+        if positions is None:
+            raise InvalidImportFile(f"Line {line}: {reason}")
+        received += 1
+        rejections.add(line, reason)
+
+    async for line, fields in csv_rows(chunks, on_error=reject):
+        if positions is None:
+            positions = header_positions(fields, columns)
+            continue
+        if not fields:
+            continue
+
+        received += 1
+        try:
+            batch.append((line, *parse_row([fields[i].strip() for i in positions])))
+        except IndexError:
+            rejections.add(line, "Missing fields")
+            continue
+        except ValueError as e:
+            rejections.add(line, str(e))
+            continue
+
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            await stage(batch)
+            batch = []
+
+    if positions is None:
+        raise InvalidImportFile("File is empty")
+    if batch:
+        await stage(batch)
+    return received
+
+
+def required(value: str, name: str) -> str:
+    if not value:
+        raise ValueError(f"Missing {name}")
+    return value
+
+
+def staging_table(name: str, *columns: Column) -> Table:
+    """Declares a temporary table that is dropped when its transaction ends.
+
+    Staging tables live in their own metadata so migrations never see them.
+    """
+    return Table(
+        name,
+        STAGING_METADATA,
+        Column("line", Integer, nullable=False),
+        *columns,
+        prefixes=["TEMPORARY"],
+        postgresql_on_commit="DROP",
+    )
+
+
+async def create_staging_table(db_session: AsyncSession, table: Table):
+    await db_session.run_sync(lambda session: table.create(session.connection()))
+
+
+async def copy_records(db_session: AsyncSession, table: Table, records: list[tuple]):
+    """Streams ``records`` into ``table`` with the COPY protocol.
+
+    Runs on the session's own asyncpg connection, inside its transaction, so
+    the staging table must have been created through the same session.
+    """
+    connection = await db_session.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        table.name, records=records, columns=[column.name for column in table.c]
+    )
+
+
+async def analyze(db_session: AsyncSession, table: Table):
+    # Autovacuum never analyzes temporary tables; without statistics the
+    # planner assumes a handful of rows and picks nested loops for the merge.
+    await db_session.execute(text(f"ANALYZE {table.name}"))
@@ -0,0 +1,162 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import traceback
+from collections import deque
+from datetime import datetime
+from os import getenv
+from time import monotonic
+
+from dotenv import load_dotenv
+from pydantic import BaseModel
+
+from src.core.metrics import registry
+
+load_dotenv("src/config/.env")
+
+LOOP_MONITOR_ENABLED = getenv("LOOP_MONITOR_ENABLED", "false") == "true"
+LOOP_MONITOR_INTERVAL = float(getenv("LOOP_MONITOR_INTERVAL", 0.1))
+LOOP_MONITOR_BLOCK_THRESHOLD = float(getenv("LOOP_MONITOR_BLOCK_THRESHOLD", 0.25))
+LOOP_MONITOR_WINDOW = int(getenv("LOOP_MONITOR_WINDOW", 600))
+LOOP_MONITOR_MAX_STALLS = int(getenv("LOOP_MONITOR_MAX_STALLS", 50))
+
+LAG_QUANTILES = (0.5, 0.9, 0.99)
+
+logger = logging.getLogger(__name__)
+
+# Labelled by worker: percentiles of different workers cannot be added up.
+event_loop_lag_seconds = registry.gauge(
+    "event_loop_lag_seconds",
+    "Event loop scheduling lag over the recent window, by quantile.",
+    "worker",
+    "quantile",
+)
+event_loop_stalls_total = registry.counter(
+    "event_loop_stalls_total",
+    "Times the event loop was blocked longer than the threshold.",
+    "worker",
+)
+
+
+class LoopStall(BaseModel):
+    blocked_ms: float
+    recorded_at: datetime
+    stack: list[str]
+
+
+def quantile(values: list[float], q: float) -> float:
+    """Nearest-rank quantile of already sorted ``values``."""
+    if not values:
+        return 0.0
+    return values[min(int(q * len(values)), len(values) - 1)]
+
+
+class LoopMonitor:
+    """Measures how late the event loop runs its callbacks.
+
+    A heartbeat task sleeps for ``interval`` and records how much later than
+    that it woke up. A watchdog thread checks the heartbeat; when the loop has
+    not come back for ``block_threshold`` seconds it grabs the loop thread's
+    current stack, i.e. the code that is holding the loop, and keeps it in a
+    ring buffer of ``max_stalls`` entries.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        block_threshold: float,
+        window: int,
+        max_stalls: int,
+    ):
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.lags: deque[float] = deque(maxlen=window)
+        self.stalls: deque[LoopStall] = deque(maxlen=max_stalls)
+        self.worker = str(os.getpid())
+        self._expected_at = monotonic()
+        self._loop_thread_id: int | None = None
+        self._heartbeat: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._heartbeat is not None
+
+    async def start(self):
+        if self.running:
+            return
+
+        self._loop_thread_id = threading.get_ident()
+        self._expected_at = monotonic() + self.interval
+        self._stopped.clear()
+        self._heartbeat = asyncio.create_task(self._beat())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-monitor", daemon=True
+        )
+        self._watchdog.start()
+
+    async def stop(self):
+        if not self.running:
+            return
+
+        self._stopped.set()
+        self._heartbeat.cancel()
+        self._heartbeat = None
+        self._watchdog.join(timeout=self.block_threshold)
+        self._watchdog = None
+
+    def lag_quantiles(self) -> dict[float, float]:
+        lags = sorted(self.lags)
+        return {q: quantile(lags, q) for q in LAG_QUANTILES}
+
+    async def _beat(self):
+        while True:
+            started_at = monotonic()
+            self._expected_at = started_at + self.interval
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(monotonic() - started_at - self.interval, 0.0))
+
+    def _watch(self):
+        reported = None
+        while not self._stopped.wait(self.block_threshold / 2):
+            expected_at = self._expected_at
+            blocked_for = monotonic() - expected_at
+            if blocked_for >= self.block_threshold and expected_at != reported:
+                reported = expected_at
+                self._record_stall(blocked_for)
+
+    def _record_stall(self, blocked_for: float):
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = traceback.format_stack(frame) if frame is not None else []
+        self.stalls.append(
+            LoopStall(
+                blocked_ms=round(blocked_for * 1000, 2),
+                recorded_at=datetime.utcnow(),
+                stack=stack,
+            )
+        )
+        event_loop_stalls_total.inc(self.worker)
+        logger.warning(
+            "Event loop blocked for over %.0f ms in:\n%s",
+            blocked_for * 1000,
+            "".join(stack),
+        )
+
+
+loop_monitor = LoopMonitor(
+    interval=LOOP_MONITOR_INTERVAL,
+    block_threshold=LOOP_MONITOR_BLOCK_THRESHOLD,
+    window=LOOP_MONITOR_WINDOW,
+    max_stalls=LOOP_MONITOR_MAX_STALLS,
+)
+
+
+@registry.collector
+def collect_loop_lag():
+    if not loop_monitor.running:
+        return
+    for q, lag in loop_monitor.lag_quantiles().items():
+        event_loop_lag_seconds.set(lag, loop_monitor.worker, str(q))
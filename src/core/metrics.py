@@ -0,0 +1,394 @@
+import asyncio
+import os
+from bisect import bisect_left
+from os import getenv
+from typing import Any, Callable, Iterator
+
+import orjson
+from dotenv import load_dotenv
+
+from src.config.database.setup import engine, get_pool_stats, replica_router
+from src.core.cache import caches
+from src.core.error_reporting import error_reporter
+from src.core.passwords import password_hasher
+
+load_dotenv("src/config/.env")
+
+# /metrics has no authentication, so it is only served where it was asked for.
+METRICS_ENABLED = (
+    getenv(
+        "METRICS_ENABLED",
+        "true" if getenv("ENV", None) in ("development", "test") else "false",
+    )
+    == "true"
+)
+METRICS_MULTIPROC_DIR = getenv("METRICS_MULTIPROC_DIR", None)
+METRICS_FLUSH_INTERVAL = float(getenv("METRICS_FLUSH_INTERVAL", 5))
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.075,
+    0.1,
+    0.25,
+    0.5,
+    0.75,
+    1.0,
+    2.5,
+    5.0,
+    7.5,
+    10.0,
+)
+
+Labels = tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format_labels(names: tuple[str, ...], values: Labels) -> str:
+    if not names:
+        return ""
+    pairs = (f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return f"{{{','.join(pairs)}}}"
+
+
+class Metric:
+    """Values of one metric family, keyed by label values.
+
+    Metrics are only updated from the event loop, so plain dict updates need
+    no lock; other threads may replace a value, which is atomic on its own.
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.values: dict[Labels, Any] = {}
+
+    def merge(self, current: Any, value: Any) -> Any:
+        return value if current is None else current + value
+
+    def samples(self, labels: Labels, value: Any) -> Iterator[str]:
+        label_text = _format_labels(self.labelnames, labels)
+        yield f"{self.name}{label_text} {_format_value(value)}"
+
+    def render(self, values: dict[Labels, Any]) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for labels, value in sorted(values.items()):
+            yield from self.samples(labels, value)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def set_total(self, value: float, *labels: str):
+        """Mirrors a running total that is kept elsewhere."""
+        self.values[labels] = value
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, value: float, *labels: str):
+        self.values[labels] = value
+
+    def inc(self, *labels: str, amount: float = 1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def dec(self, *labels: str, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(Metric):
+    """Observations counted per bucket; each value is ``[*bucket counts, sum]``.
+
+    Bucket counts are stored per bucket and only made cumulative when rendered,
+    so values from several workers can be added element-wise.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = (*buckets, float("inf"))
+
+    def observe(self, value: float, *labels: str):
+        counts = self.values.get(labels)
+        if counts is None:
+            counts = self.values[labels] = [0] * len(self.buckets) + [0.0]
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def merge(self, current: list | None, value: list) -> list:
+        if current is None:
+            return list(value)
+        return [a + b for a, b in zip(current, value)]
+
+    def samples(self, labels: Labels, value: list) -> Iterator[str]:
+        names = (*self.labelnames, "le")
+        cumulative = 0
+        for bound, count in zip(self.buckets, value):
+            cumulative += count
+            bucket_labels = _format_labels(names, (*labels, _format_value(bound)))
+            yield f"{self.name}_bucket{bucket_labels} {cumulative}"
+        label_text = _format_labels(self.labelnames, labels)
+        yield f"{self.name}_sum{label_text} {_format_value(value[-1])}"
+        yield f"{self.name}_count{label_text} {cumulative}"
+
+
+class MetricsRegistry:
+    """Metric families of this worker, plus collectors run before each export.
+
+    With ``multiprocess_dir`` set, every worker periodically writes its values
+    to ``<multiprocess_dir>/<pid>.json`` and an export adds up the files of
+    all workers. Counters and histograms of workers that exited keep counting;
+    gauges only include live workers.
+    """
+
+    def __init__(self, multiprocess_dir: str | None = None):
+        self.multiprocess_dir = multiprocess_dir
+        self.metrics: dict[str, Metric] = {}
+        self.collectors: list[Callable[[], None]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, *labelnames: str) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, *labelnames: str) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        *labelnames: str,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def collector(self, collect: Callable[[], None]) -> Callable[[], None]:
+        self.collectors.append(collect)
+        return collect
+
+    def collect(self):
+        for collect in self.collectors:
+            collect()
+
+    def snapshot(self) -> dict[str, list]:
+        return {
+            name: [
+                [list(labels), value] for labels, value in list(metric.values.items())
+            ]
+            for name, metric in self.metrics.items()
+        }
+
+    def write_snapshot(self):
+        path = os.path.join(self.multiprocess_dir, f"{os.getpid()}.json")
+        with open(f"{path}.tmp", "wb") as snapshot_file:
+            snapshot_file.write(orjson.dumps(self.snapshot()))
+        os.replace(f"{path}.tmp", path)
+
+    def read_snapshots(self) -> Iterator[tuple[dict[str, list], bool]]:
+        for filename in os.listdir(self.multiprocess_dir):
+            pid, extension = os.path.splitext(filename)
+            if extension != ".json" or not pid.isdigit():
+                continue
+            try:
+                with open(os.path.join(self.multiprocess_dir, filename), "rb") as f:
+                    snapshot = orjson.loads(f.read())
+            except (OSError, orjson.JSONDecodeError):
+                # The worker is replacing its file; it is read next time.
+                continue
+            yield snapshot, _is_alive(int(pid))
+
+    def merged_values(self) -> dict[str, dict[Labels, Any]]:
+        values = {name: {} for name in self.metrics}
+        for snapshot, alive in self.read_snapshots():
+            for name, samples in snapshot.items():
+                metric = self.metrics.get(name)
+                if metric is None or (metric.kind == "gauge" and not alive):
+                    continue
+                for labels, value in samples:
+                    labels = tuple(labels)
+                    values[name][labels] = metric.merge(values[name].get(labels), value)
+        return values
+
+    def render(self) -> str:
+        """Renders every metric in the Prometheus text exposition format."""
+        self.collect()
+        if self.multiprocess_dir:
+            self.write_snapshot()
+            values = self.merged_values()
+        else:
+            values = {
+                name: dict(metric.values) for name, metric in self.metrics.items()
+            }
+
+        lines = []
+        for name, metric in self.metrics.items():
+            lines.extend(metric.render(values[name]))
+        return "\n".join(lines) + "\n"
+
+    async def flush_periodically(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            self.collect()
+            self.write_snapshot()
+
+
+def _is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+registry = MetricsRegistry(multiprocess_dir=METRICS_MULTIPROC_DIR)
+
+http_requests_total = registry.counter(
+    "http_requests_total",
+    "Requests served, by route template and status code.",
+    "method",
+    "route",
+    "status",
+)
+http_request_duration_seconds = registry.histogram(
+    "http_request_duration_seconds",
+    "Time to serve a request, by route template.",
+    "method",
+    "route",
+)
+# Not labelled by route: the route is only known once the router ran.
+http_requests_in_progress = registry.gauge(
+    "http_requests_in_progress", "Requests being served, by method.", "method"
+)
+
+db_pool_size = registry.gauge(
+    "db_pool_size", "Connections the pool keeps open.", "pool"
+)
+db_pool_connections = registry.gauge(
+    "db_pool_connections", "Pool connections by state.", "pool", "state"
+)
+db_pool_checkouts_total = registry.counter(
+    "db_pool_checkouts_total", "Connections handed out by the pool.", "pool"
+)
+db_pool_checkout_wait_seconds_total = registry.counter(
+    "db_pool_checkout_wait_seconds_total",
+    "Time spent waiting for a free pool connection.",
+    "pool",
+)
+
+cache_entries = registry.gauge("cache_entries", "Entries held by a cache.", "cache")
+cache_hits_total = registry.counter("cache_hits_total", "Cache hits.", "cache")
+cache_misses_total = registry.counter("cache_misses_total", "Cache misses.", "cache")
+cache_evictions_total = registry.counter(
+    "cache_evictions_total", "Entries evicted to make room.", "cache"
+)
+
+password_hasher_pending = registry.gauge(
+    "password_hasher_pending", "Password hashes running or queued."
+)
+password_hasher_completed_total = registry.counter(
+    "password_hasher_completed_total", "Password hashes computed."
+)
+password_hasher_rejected_total = registry.counter(
+    "password_hasher_rejected_total", "Password hashes rejected by a full queue."
+)
+error_reports_total = registry.counter(
+    "error_reports_total",
+    "Errors seen by the error reporter, by what happened to them.",
+    "outcome",
+)
+
+
+@registry.collector
+def collect_pools():
+    pools = [("primary", engine)] + [
+        (f"replica-{n}", replica_engine)
+        for n, (replica_engine, _) in enumerate(replica_router.replicas)
+    ]
+    for name, db_engine in pools:
+        stats = get_pool_stats(db_engine)
+        db_pool_size.set(stats["size"], name)
+        for state in ("checked_in", "checked_out", "overflow"):
+            db_pool_connections.set(stats[state], name, state)
+        if "checkouts" in stats:
+            db_pool_checkouts_total.set_total(stats["checkouts"], name)
+            db_pool_checkout_wait_seconds_total.set_total(
+                db_engine.pool.total_wait_seconds, name
+            )
+
+
+@registry.collector
+def collect_caches():
+    for name, cache in caches.items():
+        stats = cache.stats()
+        cache_entries.set(stats["size"], name)
+        cache_hits_total.set_total(stats["hits"], name)
+        cache_misses_total.set_total(stats["misses"], name)
+        cache_evictions_total.set_total(stats["evictions"], name)
+
+
+@registry.collector
+def collect_password_hasher():
+    stats = password_hasher.stats()
+    password_hasher_pending.set(stats["pending"])
+    password_hasher_completed_total.set_total(stats["completed"])
+    password_hasher_rejected_total.set_total(stats["rejected"])
+
+
+@registry.collector
+def collect_error_reports():
+    stats = error_reporter.stats()
+    for outcome in ("reported", "sampled_out", "deduplicated", "dropped"):
+        error_reports_total.set_total(stats[outcome], outcome)
+
+
+_flush_task: asyncio.Task | None = None
+
+
+async def start_metrics_flush():
+    global _flush_task
+    if registry.multiprocess_dir and _flush_task is None:
+        _flush_task = asyncio.create_task(
+            registry.flush_periodically(METRICS_FLUSH_INTERVAL)
+        )
+
+
+async def stop_metrics_flush():
+    global _flush_task
+    if _flush_task is not None:
+        _flush_task.cancel()
+        _flush_task = None
+        registry.collect()
+        registry.write_snapshot()
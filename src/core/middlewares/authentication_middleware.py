@@ -1,12 +1,19 @@
 from datetime import datetime, timedelta
+from hashlib import sha256
 from os import getenv
+from typing import Callable
 
 from dotenv import load_dotenv
-from fastapi import Depends
-from fastapi.security import OAuth2PasswordBearer
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.security import HTTPBearer, OAuth2PasswordBearer
 from jose import JWTError, jwt, ExpiredSignatureError
+from starlette.routing import BaseRoute, Match
+from starlette.types import ASGIApp, Receive, Scope, Send
 
+from src.core.cache import TTLCache, register_cache
 from src.core.exceptions import Unauthorized, Forbidden
+from src.core.middlewares.exceptions_handler import error_handler_middleware
 from src.core.models import User
 
 load_dotenv("src/config/.env")
@@ -17,24 +24,38 @@ CUSTOMER_ROLE = ROLES[1]
 JWT_SECRET = getenv("JWT_SECRET")
 JWT_ALGORITHM = getenv("JWT_ALGORITHM")
 JWT_EXPIRATION_DAYS = getenv("JWT_EXPIRATION_DAYS")
+JWT_CACHE_SIZE = int(getenv("JWT_CACHE_SIZE", 1024))
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+# Only documents the token in the OpenAPI schema, see ``document_bearer_auth``.
+bearer_scheme = HTTPBearer(bearerFormat="JWT", auto_error=False)
+
+# Decoded token claims keyed by the token digest. Entries expire together with
+# the token, so a cached claim is never served past its "exp".
+token_cache = register_cache("token", TTLCache(max_size=JWT_CACHE_SIZE))
 
 
 async def validate_token(access_token: str = Depends(oauth2_scheme)) -> User:
+    token_digest = sha256(access_token.encode()).digest()
+    token_user = token_cache.get(token_digest)
+    if token_user is not None:
+        return token_user
+
     try:
         payload = jwt.decode(access_token, key=JWT_SECRET, algorithms=[JWT_ALGORITHM])
-
-        return User(
-            id=payload["user_id"],
-            username=payload["username"],
-            role=payload["user_role"],
-        )
     except ExpiredSignatureError:
         raise Unauthorized()
     except JWTError:
         raise Unauthorized()
 
+    token_user = User(
+        id=payload["user_id"],
+        username=payload["username"],
+        role=payload["user_role"],
+    )
+    token_cache.set(token_digest, token_user, expires_at=payload.get("exp"))
+    return token_user
+
 
 async def create_token(user_id: int, username: str, role: str):
     expire = datetime.utcnow() + timedelta(days=int(JWT_EXPIRATION_DAYS))
@@ -51,26 +72,146 @@ async def create_token(user_id: int, username: str, role: str):
     return access_token
 
 
-async def check_authorization(authorization: str) -> bool:
+async def authenticate(authorization: str | None) -> User | None:
     if authorization is None:
+        return None
+
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token.strip():
+        raise Unauthorized()
+
+    return await validate_token(token.strip())
+
+
+async def check_authorization(token_user: User | None) -> bool:
+    if token_user is None:
         raise Unauthorized()
 
-    token = authorization.split()[1]
-    token_user = await validate_token(token)
     if token_user.role != ADMIN_ROLE:
         raise Forbidden()
 
     return True
 
 
-async def check_customer_authorization(authorization: str, user_id: int) -> bool:
-    if authorization is None:
+async def check_customer_authorization(token_user: User | None, user_id: int) -> bool:
+    if token_user is None:
         raise Unauthorized()
 
-    token = authorization.split()[1]
-    token_user = await validate_token(token)
-
     if token_user.role not in (ADMIN_ROLE, CUSTOMER_ROLE) or token_user.id != user_id:
         raise Forbidden()
 
     return True
+
+
+def admin_required(endpoint: Callable) -> Callable:
+    async def policy(token_user: User | None, path_params: dict) -> bool:
+        return await check_authorization(token_user)
+
+    endpoint.authorization_policy = policy
+    return endpoint
+
+
+def customer_owner_required(path_param: str) -> Callable[[Callable], Callable]:
+    def decorator(endpoint: Callable) -> Callable:
+        async def policy(token_user: User | None, path_params: dict) -> bool:
+            try:
+                user_id = int(path_params[path_param])
+            except (KeyError, ValueError):
+                raise Forbidden()
+            return await check_customer_authorization(token_user, user_id)
+
+        endpoint.authorization_policy = policy
+        return endpoint
+
+    return decorator
+
+
+class AuthenticationMiddleware:
+    """Authenticates and authorizes requests before they reach the router.
+
+    The Authorization header is parsed once and the resulting principal is
+    stored on ``request.state.user``. Routes tagged with ``admin_required`` or
+    ``customer_owner_required`` are rejected here, before any dependency (and
+    therefore any database session) is resolved.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._protected_routes: list[tuple[BaseRoute, Callable]] | None = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        try:
+            await self._authorize(request)
+        except HTTPException as e:
+            response = await error_handler_middleware(request, e)
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+    async def _authorize(self, request: Request):
+        authorization = request.headers.get("authorization")
+        policy, path_params = self._match_policy(request.scope)
+
+        if policy is None:
+            try:
+                request.state.user = await authenticate(authorization)
+            except Unauthorized:
+                request.state.user = None
+            return
+
+        request.state.user = await authenticate(authorization)
+        await policy(request.state.user, path_params)
+
+    def _match_policy(self, scope: Scope) -> tuple[Callable | None, dict]:
+        if self._protected_routes is None:
+            self._protected_routes = [
+                (route, route.endpoint.authorization_policy)
+                for route in scope["app"].router.routes
+                if hasattr(getattr(route, "endpoint", None), "authorization_policy")
+            ]
+
+        for route, policy in self._protected_routes:
+            match, child_scope = route.matches(scope)
+            if match == Match.FULL:
+                return policy, child_scope.get("path_params", {})
+        return None, {}
+
+
+def document_bearer_auth(app: FastAPI):
+    """Declares the bearer token of protected routes in the OpenAPI schema.
+
+    Tokens are checked by ``AuthenticationMiddleware`` rather than by a route
+    dependency, so FastAPI cannot find them on its own.
+    """
+    build_openapi = app.openapi
+
+    def openapi() -> dict:
+        if app.openapi_schema is not None:
+            return app.openapi_schema
+
+        schema = build_openapi()
+        security_schemes = schema.setdefault("components", {}).setdefault(
+            "securitySchemes", {}
+        )
+        security_schemes[bearer_scheme.scheme_name] = jsonable_encoder(
+            bearer_scheme.model, by_alias=True, exclude_none=True
+        )
+        for route in app.routes:
+            endpoint = getattr(route, "endpoint", None)
+            if not hasattr(endpoint, "authorization_policy"):
+                continue
+            operations = schema["paths"].get(route.path_format, {})
+            for method in route.methods:
+                if method.lower() in operations:
+                    operations[method.lower()]["security"] = [
+                        {bearer_scheme.scheme_name: []}
+                    ]
+        return schema
+
+    app.openapi = openapi
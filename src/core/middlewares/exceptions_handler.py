@@ -1,21 +1,13 @@
-import sentry_sdk
-from os import getenv
 from http.client import INTERNAL_SERVER_ERROR
 
-from fastapi.responses import JSONResponse
-
-from dotenv import load_dotenv
 from fastapi import HTTPException
+from fastapi.responses import JSONResponse
 
-load_dotenv()
+from src.core.error_reporting import error_reporter
 
 
 async def error_handler_middleware(request, e):
-    sentry_sdk.capture_exception(e)
-
-    ENVIRONMENT = getenv("ENV", None)
-    if ENVIRONMENT == "development":
-        print(e)
+    error_reporter.report(e, request)
 
     if isinstance(e, HTTPException):
         return JSONResponse(status_code=e.status_code, content={"detail": e.detail})
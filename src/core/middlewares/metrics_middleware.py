@@ -0,0 +1,48 @@
+from http import HTTPStatus
+from time import perf_counter
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.metrics import (
+    http_request_duration_seconds,
+    http_requests_in_progress,
+    http_requests_total,
+)
+from src.core.routing import route_template
+
+# Requests no route matched share one label instead of one per raw path.
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """Counts requests and their latency per method and route template."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = HTTPStatus.INTERNAL_SERVER_ERROR
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_progress.inc(method)
+        started_at = perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_progress.dec(method)
+            # Read once the router has resolved the endpoint of the request.
+            route = route_template(scope) or UNMATCHED_ROUTE
+            http_request_duration_seconds.observe(
+                perf_counter() - started_at, method, route
+            )
+            http_requests_total.inc(method, route, str(int(status_code)))
@@ -0,0 +1,86 @@
+from cProfile import Profile
+from datetime import datetime
+from time import perf_counter
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders, QueryParams
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.middlewares.authentication_middleware import ADMIN_ROLE
+from src.core.profiling import ProfileInfo, ProfileStore, profile_store
+from src.core.routing import route_template
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_QUERY_PARAM = "profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+TRUTHY = ("1", "true")
+
+
+def profiling_requested(scope: Scope) -> bool:
+    flag = Headers(scope=scope).get(PROFILE_HEADER) or QueryParams(
+        scope["query_string"]
+    ).get(PROFILE_QUERY_PARAM)
+    return flag is not None and flag.lower() in TRUTHY
+
+
+def is_admin(scope: Scope) -> bool:
+    token_user = scope.get("state", {}).get("user")
+    return token_user is not None and token_user.role == ADMIN_ROLE
+
+
+class ProfilingMiddleware:
+    """Profiles single requests on demand for admins.
+
+    A request sent with ``X-Profile: 1`` (or ``?profile=1``) by an admin runs
+    under cProfile, and the profile id is returned in ``X-Profile-Id``. Must be
+    installed inside ``AuthenticationMiddleware``, which identifies the user.
+
+    cProfile sees everything the event loop runs meanwhile, so only one
+    request is profiled at a time and others asking are served unprofiled.
+    """
+
+    def __init__(self, app: ASGIApp, store: ProfileStore = profile_store):
+        self.app = app
+        self.store = store
+        self.active = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if (
+            scope["type"] != "http"
+            or self.active
+            or not profiling_requested(scope)
+            or not is_admin(scope)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = self.store.new_id()
+        status_code = None
+
+        async def send_with_profile_id(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append(PROFILE_ID_HEADER, profile_id)
+            await send(message)
+
+        profiler = Profile()
+        created_at = datetime.utcnow()
+        started_at = perf_counter()
+        self.active = True
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profiler.disable()
+            self.active = False
+            info = ProfileInfo(
+                id=profile_id,
+                method=scope["method"],
+                path=scope["path"],
+                route=route_template(scope),
+                status_code=status_code,
+                duration_ms=round((perf_counter() - started_at) * 1000, 2),
+                created_at=created_at,
+            )
+            await run_in_threadpool(self.store.save, profiler, info)
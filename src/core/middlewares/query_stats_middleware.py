@@ -0,0 +1,128 @@
+import logging
+from os import getenv
+from time import perf_counter
+from typing import Callable
+
+from dotenv import load_dotenv
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config.database.setup import QueryStats, collect_query_stats
+
+load_dotenv("src/config/.env")
+
+ENVIRONMENT = getenv("ENV", None)
+DATABASE_QUERY_BUDGET = int(getenv("DATABASE_QUERY_BUDGET", 20))
+# The budget is checked once the response has been sent, so raising can only
+# fail a test: elsewhere an over-budget request is logged as a warning.
+DATABASE_ENFORCE_QUERY_BUDGET = ENVIRONMENT == "test"
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def query_budget(max_queries: int) -> Callable[[Callable], Callable]:
+    """Overrides ``DATABASE_QUERY_BUDGET`` for one endpoint.
+
+    Meant for endpoints whose statement count grows with the request body
+    (bulk writes, imports) rather than with the rows they return.
+    """
+
+    def decorator(endpoint: Callable) -> Callable:
+        endpoint.query_budget = max_queries
+        return endpoint
+
+    return decorator
+
+
+def server_timing(stats: QueryStats) -> str:
+    return f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries"'
+
+
+class QueryStatsMiddleware:
+    """Measures the database work behind each request.
+
+    The number of statements and the time spent waiting on them are sent back
+    in a ``Server-Timing`` header and logged with the request. A request that
+    runs more statements than its endpoint's budget is logged as a warning;
+    when ``enforce_budget`` is set (by default under ``ENV=test``) it also
+    raises ``QueryBudgetExceeded``, so N+1 query patterns fail the test suite
+    instead of reaching production.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        budget: int | None = None,
+        enforce_budget: bool | None = None,
+    ):
+        self.app = app
+        self.budget = budget
+        self.enforce_budget = enforce_budget
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started_at = perf_counter()
+        status_code = None
+
+        with collect_query_stats(scope) as stats:
+
+            async def send_with_timing(message: Message):
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", server_timing(stats))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                logger.info(
+                    "%s %s",
+                    scope["method"],
+                    scope["path"],
+                    extra={
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "status_code": status_code,
+                        "duration_ms": round((perf_counter() - started_at) * 1000, 2),
+                        "db_queries": stats.count,
+                        "db_duration_ms": round(stats.duration * 1000, 2),
+                    },
+                )
+
+        enforce_budget = (
+            DATABASE_ENFORCE_QUERY_BUDGET
+            if self.enforce_budget is None
+            else self.enforce_budget
+        )
+        budget = getattr(
+            scope.get("endpoint"),
+            "query_budget",
+            DATABASE_QUERY_BUDGET if self.budget is None else self.budget,
+        )
+        if stats.count <= budget:
+            return
+
+        message = (
+            f"{scope['method']} {scope['path']} ran {stats.count} queries, "
+            f"over its budget of {budget}."
+        )
+        if enforce_budget:
+            raise QueryBudgetExceeded(message)
+        logger.warning(
+            message,
+            extra={
+                "method": scope["method"],
+                "path": scope["path"],
+                "db_queries": stats.count,
+                "db_query_budget": budget,
+            },
+        )
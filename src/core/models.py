@@ -2,6 +2,7 @@ from datetime import datetime
 from os import getenv
 
 from dotenv import load_dotenv
+from sqlalchemy import Index, func, literal_column
 from sqlmodel import SQLModel, Field, Relationship
 
 load_dotenv("src/config/.env")
@@ -11,10 +12,10 @@ CUSTOMER_ROLE = ROLES[1]
 
 
 class TimestampMixin(SQLModel):
-    created_at: datetime = Field(default=datetime.now(), nullable=False)
+    created_at: datetime = Field(default_factory=datetime.now, nullable=False)
     updated_at: datetime = Field(
-        default=datetime.now(),
-        schema_extra={"onupdate": datetime.now()},
+        default_factory=datetime.now,
+        sa_column_kwargs={"onupdate": datetime.now},
         nullable=False,
     )
 
@@ -29,9 +30,18 @@ class Address(SQLModel, table=True):
     customer: "Customer" = Relationship(back_populates="address")
 
 
+# Address columns are nullable, so the unique index compares them through
+# COALESCE; inserts must use the same expressions as their conflict target.
+ADDRESS_UNIQUE_EXPRESSIONS = [
+    func.coalesce(Address.__table__.c[column], literal_column("''"))
+    for column in ("street", "city", "state", "complement", "zipcode")
+]
+Index("uq_address_location", *ADDRESS_UNIQUE_EXPRESSIONS, unique=True)
+
+
 class Customer(TimestampMixin, table=True):
     id: int = Field(nullable=False, foreign_key="user.id", primary_key=True)
-    address_id: int | None = Field(nullable=True, foreign_key="address.id")
+    address_id: int | None = Field(nullable=True, foreign_key="address.id", index=True)
     address: Address | None = Relationship(back_populates="customer")
     user: "User" = Relationship(back_populates="customer")
 
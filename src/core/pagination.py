@@ -0,0 +1,159 @@
+import json
+from datetime import datetime
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from os import getenv
+from typing import Any, Callable, Generic, TypeVar
+
+from dotenv import load_dotenv
+from pydantic.generics import GenericModel
+from sqlalchemy import and_, or_
+from sqlalchemy.sql import ColumnElement, Select
+
+from src.core.exceptions import InvalidCursor
+
+load_dotenv("src/config/.env")
+
+DEFAULT_PAGE_SIZE = int(getenv("DEFAULT_PAGE_SIZE", 50))
+MAX_PAGE_SIZE = int(getenv("MAX_PAGE_SIZE", 500))
+
+T = TypeVar("T")
+
+
+class Page(GenericModel, Generic[T]):
+    items: list[T]
+    next_cursor: str | None
+
+
+def encode_cursor(key: Any) -> str:
+    return urlsafe_b64encode(json.dumps(key, default=_encode_value).encode()).decode()
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot encode {type(value).__name__} in a cursor")
+
+
+def decode_cursor(cursor: str) -> Any:
+    try:
+        return json.loads(urlsafe_b64decode(cursor.encode()))
+    except (BinasciiError, UnicodeError, ValueError):
+        raise InvalidCursor()
+
+
+def paginate(
+    query: Select,
+    key_column: ColumnElement,
+    cursor: str | None,
+    limit: int,
+    descending: bool = False,
+) -> Select:
+    """Restricts ``query`` to the page after ``cursor``, ordered by ``key_column``.
+
+    One extra row is fetched so ``build_page`` can tell whether another page
+    follows without a COUNT query.
+    """
+    if cursor is not None:
+        last_key = decode_cursor(cursor)
+        if not isinstance(last_key, int):
+            raise InvalidCursor()
+        query = query.where(
+            key_column < last_key if descending else key_column > last_key
+        )
+
+    order = key_column.desc() if descending else key_column
+    return query.order_by(order).limit(limit + 1)
+
+
+def paginate_sorted(
+    query: Select,
+    sort_column: ColumnElement,
+    key_column: ColumnElement,
+    cursor: str | None,
+    limit: int,
+    descending: bool = False,
+) -> Select:
+    """Keyset pagination ordered by ``sort_column``, ties broken by ``key_column``.
+
+    The cursor holds the last row's ``[sort value, key]``. NULL sort values
+    keep PostgreSQL's default placement: last when ascending, first when
+    descending.
+    """
+    if cursor is not None:
+        last_value, last_key = _decode_sort_cursor(cursor, sort_column, key_column)
+        query = query.where(
+            _after(sort_column, key_column, last_value, last_key, descending)
+        )
+
+    if descending:
+        query = query.order_by(sort_column.desc(), key_column.desc())
+    else:
+        query = query.order_by(sort_column, key_column)
+    return query.limit(limit + 1)
+
+
+def _decode_sort_cursor(
+    cursor: str, sort_column: ColumnElement, key_column: ColumnElement
+) -> tuple[Any, Any]:
+    last_key = decode_cursor(cursor)
+    if not isinstance(last_key, list) or len(last_key) != 2:
+        raise InvalidCursor()
+
+    last_value, last_key = last_key
+    if last_value is None and not _is_nullable(sort_column):
+        raise InvalidCursor()
+    return _decode_value(sort_column, last_value), _decode_value(key_column, last_key)
+
+
+def _decode_value(column: ColumnElement, value: Any) -> Any:
+    if value is None:
+        return None
+
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        python_type = str
+
+    if python_type is datetime and isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            raise InvalidCursor()
+    if not isinstance(value, python_type) or isinstance(value, bool):
+        raise InvalidCursor()
+    return value
+
+
+def _is_nullable(column: ColumnElement) -> bool:
+    return getattr(column, "nullable", True)
+
+
+def _after(
+    sort_column: ColumnElement,
+    key_column: ColumnElement,
+    last_value: Any,
+    last_key: Any,
+    descending: bool,
+):
+    key_after = key_column < last_key if descending else key_column > last_key
+    if last_value is None:
+        after_nulls = and_(sort_column.is_(None), key_after)
+        return or_(sort_column.is_not(None), after_nulls) if descending else after_nulls
+
+    if descending:
+        value_after = sort_column < last_value
+    else:
+        value_after = sort_column > last_value
+    condition = or_(value_after, and_(sort_column == last_value, key_after))
+    if not descending and _is_nullable(sort_column):
+        condition = or_(condition, sort_column.is_(None))
+    return condition
+
+
+def build_page(rows: list, limit: int, key: Callable[[Any], Any]) -> Page:
+    if len(rows) <= limit:
+        return Page(items=rows, next_cursor=None)
+
+    items = rows[:limit]
+    return Page(items=items, next_cursor=encode_cursor(key(items[-1])))
@@ -0,0 +1,120 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from os import getenv
+from time import perf_counter
+from typing import Callable
+
+from dotenv import load_dotenv
+from passlib.hash import pbkdf2_sha512
+
+from src.core.exceptions import PasswordHashingUnavailable
+
+load_dotenv("src/config/.env")
+
+PASSWORD_HASHING_WORKERS = int(getenv("PASSWORD_HASHING_WORKERS", 2))
+PASSWORD_HASHING_QUEUE_SIZE = int(getenv("PASSWORD_HASHING_QUEUE_SIZE", 64))
+
+
+class PasswordHasher:
+    """Runs pbkdf2_sha512 in a dedicated thread pool behind a bounded queue.
+
+    hashlib releases the GIL while deriving keys, so worker threads keep the
+    event loop free. Jobs beyond ``workers + queue_size`` are rejected instead
+    of piling up behind a burst of sign-ins.
+    """
+
+    def __init__(self, workers: int, queue_size: int):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+        self.total_hash_seconds = 0.0
+        self.max_hash_seconds = 0.0
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hasher"
+        )
+
+    @property
+    def queue_depth(self) -> int:
+        return max(self.pending - self.workers, 0)
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(pbkdf2_sha512.hash, password)
+
+    async def hash_many(self, passwords: list[str]) -> list[str]:
+        """Hashes a batch on all workers, keeping at most ``workers`` of its jobs
+        queued so interactive sign-ins still find room in the queue.
+        """
+        slots = asyncio.Semaphore(self.workers)
+
+        async def hash_one(password: str) -> str:
+            async with slots:
+                return await self.hash(password)
+
+        return list(await asyncio.gather(*(hash_one(p) for p in passwords)))
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._submit(pbkdf2_sha512.verify, password, hashed_password)
+
+    async def _submit(self, function: Callable, *args):
+        if self.pending >= self.workers + self.queue_size:
+            self.rejected += 1
+            raise PasswordHashingUnavailable()
+
+        self.pending += 1
+        submitted_at = perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            started_at, finished_at, result = await loop.run_in_executor(
+                self._executor, _timed, function, *args
+            )
+        finally:
+            self.pending -= 1
+
+        hash_seconds = finished_at - started_at
+        self.completed += 1
+        self.total_wait_seconds += started_at - submitted_at
+        self.total_hash_seconds += hash_seconds
+        self.max_hash_seconds = max(self.max_hash_seconds, hash_seconds)
+        return result
+
+    def stats(self) -> dict[str, int | float]:
+        return {
+            "workers": self.workers,
+            "pending": self.pending,
+            "queue_depth": self.queue_depth,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_seconds": (
+                self.total_wait_seconds / self.completed if self.completed else 0.0
+            ),
+            "avg_hash_seconds": (
+                self.total_hash_seconds / self.completed if self.completed else 0.0
+            ),
+            "max_hash_seconds": self.max_hash_seconds,
+        }
+
+
+def _timed(function: Callable, *args) -> tuple[float, float, object]:
+    started_at = perf_counter()
+    result = function(*args)
+    return started_at, perf_counter(), result
+
+
+password_hasher = PasswordHasher(
+    workers=PASSWORD_HASHING_WORKERS, queue_size=PASSWORD_HASHING_QUEUE_SIZE
+)
+
+
+async def hash_password(password: str) -> str:
+    return await password_hasher.hash(password)
+
+
+async def hash_passwords(passwords: list[str]) -> list[str]:
+    return await password_hasher.hash_many(passwords)
+
+
+async def verify_password(password: str, hashed_password: str) -> bool:
+    return await password_hasher.verify(password, hashed_password)
@@ -0,0 +1,90 @@
+import os
+import re
+import tempfile
+from cProfile import Profile
+from datetime import datetime
+from os import getenv
+from uuid import uuid4
+
+import orjson
+from dotenv import load_dotenv
+from pydantic import BaseModel
+
+load_dotenv("src/config/.env")
+
+PROFILES_DIR = getenv("PROFILES_DIR", os.path.join(tempfile.gettempdir(), "profiles"))
+PROFILES_MAX_FILES = int(getenv("PROFILES_MAX_FILES", 50))
+
+PROFILE_ID = re.compile(r"[0-9a-f]{32}")
+
+
+class ProfileInfo(BaseModel):
+    id: str
+    method: str
+    path: str
+    route: str | None
+    status_code: int | None
+    duration_ms: float
+    created_at: datetime
+
+
+class ProfileStore:
+    """Keeps the latest ``max_files`` request profiles in ``directory``.
+
+    Each profile is a cProfile dump (``<id>.prof``, readable with ``pstats``
+    and flame graph viewers such as snakeviz or flameprof) next to a
+    ``<id>.json`` file describing the request.
+    """
+
+    def __init__(self, directory: str, max_files: int):
+        self.directory = directory
+        self.max_files = max_files
+
+    @staticmethod
+    def new_id() -> str:
+        return uuid4().hex
+
+    def path(self, profile_id: str) -> str | None:
+        if not PROFILE_ID.fullmatch(profile_id):
+            return None
+        path = os.path.join(self.directory, f"{profile_id}.prof")
+        return path if os.path.exists(path) else None
+
+    def save(self, profiler: Profile, info: ProfileInfo):
+        os.makedirs(self.directory, exist_ok=True)
+        profiler.dump_stats(os.path.join(self.directory, f"{info.id}.prof"))
+        with open(os.path.join(self.directory, f"{info.id}.json"), "wb") as f:
+            f.write(orjson.dumps(info.dict()))
+        self.prune()
+
+    def profiles(self) -> list[ProfileInfo]:
+        """Returns the stored profiles, newest first."""
+        profiles = []
+        for filename in self._metadata_files():
+            try:
+                with open(os.path.join(self.directory, filename), "rb") as f:
+                    profiles.append(ProfileInfo.parse_raw(f.read()))
+            except (OSError, ValueError):
+                continue
+        return sorted(profiles, key=lambda info: info.created_at, reverse=True)
+
+    def prune(self):
+        for info in self.profiles()[self.max_files :]:
+            for extension in (".prof", ".json"):
+                try:
+                    os.remove(os.path.join(self.directory, info.id + extension))
+                except FileNotFoundError:
+                    pass
+
+    def _metadata_files(self) -> list[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        return [
+            filename
+            for filename in os.listdir(self.directory)
+            if PROFILE_ID.fullmatch(filename.removesuffix(".json"))
+            and filename.endswith(".json")
+        ]
+
+
+profile_store = ProfileStore(directory=PROFILES_DIR, max_files=PROFILES_MAX_FILES)
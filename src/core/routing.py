@@ -0,0 +1,44 @@
+from typing import Callable
+
+from starlette.routing import BaseRoute, Match
+from starlette.types import ASGIApp, Scope
+
+
+def match_route(scope: Scope) -> BaseRoute | None:
+    """Returns the route serving ``scope``, or the one only its method misses."""
+    partial = None
+    for route in scope["app"].router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route
+        if match == Match.PARTIAL and partial is None:
+            partial = route
+    return partial
+
+
+def route_template(scope: Scope) -> str | None:
+    """Returns the path template (``/api/v1/orders/{order_id}/``) of ``scope``.
+
+    Labelling by template instead of the raw path keeps per-route statistics
+    bounded no matter how many ids are requested. Once the router has set the
+    endpoint of ``scope``, the template is looked up by endpoint; requests
+    that never reached the router are matched against every route.
+    """
+    endpoint = scope.get("endpoint")
+    if endpoint is not None:
+        key = (scope["app"], endpoint)
+        if key not in _templates:
+            paths = {
+                route.path
+                for route in scope["app"].router.routes
+                if getattr(route, "endpoint", None) is endpoint
+            }
+            # An endpoint served on several paths must be matched each time.
+            _templates[key] = paths.pop() if len(paths) == 1 else None
+        if _templates[key] is not None:
+            return _templates[key]
+    return getattr(match_route(scope), "path", None)
+
+
+# Path templates by app and endpoint, filled as requests are routed.
+_templates: dict[tuple[ASGIApp, Callable], str | None] = {}
@@ -0,0 +1,93 @@
+import csv
+import json
+from enum import Enum
+from io import StringIO
+from os import getenv
+from typing import AsyncIterator
+
+import orjson
+from dotenv import load_dotenv
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from src.core.responses import encode_json, model_encoder
+
+load_dotenv("src/config/.env")
+
+EXPORT_BATCH_SIZE = int(getenv("EXPORT_BATCH_SIZE", 1000))
+MAX_EXPORT_BATCH_SIZE = int(getenv("MAX_EXPORT_BATCH_SIZE", 10000))
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def export_response(
+    batches: AsyncIterator[list],
+    schema: type[BaseModel],
+    export_format: ExportFormat,
+    filename: str,
+) -> StreamingResponse:
+    """Streams ``batches`` of rows as NDJSON or CSV, one chunk per batch.
+
+    Each chunk is only produced after the previous one was handed to the
+    server, so memory stays bounded by the batch size regardless of how slow
+    the client reads.
+    """
+    if export_format == ExportFormat.CSV:
+        chunks = _csv_chunks(batches, schema)
+    else:
+        chunks = _ndjson_chunks(batches, schema)
+
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}.{export_format.value}"'
+        },
+    )
+
+
+async def _ndjson_chunks(
+    batches: AsyncIterator[list], schema: type[BaseModel]
+) -> AsyncIterator[bytes]:
+    encode = model_encoder(schema)
+    async for batch in batches:
+        yield b"".join(
+            encode_json(encode(row), option=orjson.OPT_APPEND_NEWLINE) for row in batch
+        )
+
+
+async def _csv_chunks(
+    batches: AsyncIterator[list], schema: type[BaseModel]
+) -> AsyncIterator[bytes]:
+    fieldnames = list(schema.__fields__)
+    buffer = StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+    writer.writeheader()
+
+    async for batch in batches:
+        for row in batch:
+            writer.writerow(_csv_row(schema.validate(row)))
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def _csv_row(row: BaseModel) -> dict:
+    values = jsonable_encoder(row)
+    return {
+        field: json.dumps(value) if isinstance(value, (list, dict)) else value
+        for field, value in values.items()
+    }
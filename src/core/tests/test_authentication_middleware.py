@@ -0,0 +1,72 @@
+from http import HTTPStatus
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+
+from src.config.database.setup import get_db_session
+from src.core.middlewares.authentication_middleware import create_token
+from src.main import app
+
+
+@pytest_asyncio.fixture
+async def app_client() -> AsyncClient:
+    async def _unexpected_session():
+        raise AssertionError("A database session was requested")
+
+    app.dependency_overrides[get_db_session] = _unexpected_session
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.pop(get_db_session)
+
+
+class TestAuthenticationMiddleware:
+    @pytest.mark.asyncio
+    async def test_missing_token_is_rejected_before_database_access(self, app_client):
+        response = await app_client.post(url="/api/v1/vehicles/", json={})
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+        assert response.json() == {"detail": "Invalid token"}
+
+    @pytest.mark.asyncio
+    async def test_malformed_authorization_header(self, app_client):
+        response = await app_client.post(
+            url="/api/v1/vehicles/", json={}, headers={"Authorization": "Bearer"}
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    @pytest.mark.asyncio
+    async def test_forbidden_role_is_rejected_before_database_access(
+        self, app_client, customer_role
+    ):
+        token = await create_token(2, "john.doe@email.com", customer_role)
+        response = await app_client.post(
+            url="/api/v1/vehicles/",
+            json={},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+    @pytest.mark.asyncio
+    async def test_customer_cannot_update_another_customer(
+        self, app_client, customer_role
+    ):
+        token = await create_token(2, "john.doe@email.com", customer_role)
+        response = await app_client.put(
+            url="/api/v1/users/customer/3/",
+            json={},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+    def test_protected_routes_declare_the_bearer_token(self):
+        schema = app.openapi()
+
+        assert schema["components"]["securitySchemes"]["HTTPBearer"] == {
+            "type": "http",
+            "scheme": "bearer",
+            "bearerFormat": "JWT",
+        }
+        assert schema["paths"]["/api/v1/vehicles/"]["post"]["security"] == [
+            {"HTTPBearer": []}
+        ]
+        assert "security" not in schema["paths"]["/api/v1/vehicles/"]["get"]
@@ -0,0 +1,34 @@
+from src.core.bulk import (
+    BulkItemResult,
+    BulkStatus,
+    batches,
+    bulk_response,
+    resolve_keys,
+)
+
+
+class TestBulk:
+    def test_batches_respect_the_parameter_cap(self):
+        rows = list(range(20000))
+        sizes = [len(batch) for batch in batches(rows, columns=4)]
+        assert sizes == [8191, 8191, 3618]
+
+    def test_resolve_keys(self):
+        results = resolve_keys(
+            ["a", "b", "a", "c"], created={"a": 1, "c": 3}, existing={"b": 2}
+        )
+        assert [(result.status, result.id) for result in results] == [
+            (BulkStatus.CREATED, 1),
+            (BulkStatus.EXISTING, 2),
+            (BulkStatus.EXISTING, 1),
+            (BulkStatus.CREATED, 3),
+        ]
+
+    def test_bulk_response_counts(self):
+        response = bulk_response(
+            [
+                BulkItemResult(index=0, status=BulkStatus.CREATED, id=1),
+                BulkItemResult(index=1, status=BulkStatus.REJECTED, detail="taken"),
+            ]
+        )
+        assert (response.created, response.existing, response.rejected) == (1, 0, 1)
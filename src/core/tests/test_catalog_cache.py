@@ -0,0 +1,91 @@
+from http import HTTPStatus
+
+import pytest
+from httpx import AsyncClient
+
+from src.core.cache import CatalogCache
+from src.core.middlewares.authentication_middleware import create_token
+from src.main import app
+
+
+class TestCatalogCache:
+    @pytest.mark.asyncio
+    async def test_values_are_loaded_once(self):
+        cache = CatalogCache(max_size=10)
+        loads = []
+
+        async def load():
+            loads.append(1)
+            return b"[]"
+
+        assert await cache.get_or_load("list", load) == b"[]"
+        assert await cache.get_or_load("list", load) == b"[]"
+        assert len(loads) == 1
+        assert cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_missing_values_are_not_cached(self):
+        cache = CatalogCache(max_size=10)
+
+        async def load():
+            return None
+
+        assert await cache.get_or_load(("item", 1), load) is None
+        assert cache.stats()["size"] == 0
+
+    @pytest.mark.asyncio
+    async def test_invalidate_drops_every_key(self):
+        cache = CatalogCache(max_size=10)
+        values = iter([b"old", b"new"])
+
+        async def load():
+            return next(values)
+
+        await cache.get_or_load("list", load)
+        cache.invalidate()
+        assert await cache.get_or_load("list", load) == b"new"
+
+    @pytest.mark.asyncio
+    async def test_value_loaded_during_a_write_is_not_stored(self):
+        cache = CatalogCache(max_size=10)
+
+        async def load():
+            cache.invalidate()
+            return b"stale"
+
+        assert await cache.get_or_load("list", load) == b"stale"
+        assert cache.stats()["size"] == 0
+
+    @pytest.mark.asyncio
+    async def test_values_that_may_predate_a_write_are_not_stored(self):
+        cache = CatalogCache(max_size=10)
+
+        async def load():
+            return b"from a replica"
+
+        cache.invalidate()
+        assert await cache.get_or_load("list", load, max_staleness=60) == (
+            b"from a replica"
+        )
+        assert cache.stats()["size"] == 0
+
+        await cache.get_or_load("list", load)
+        assert cache.stats()["size"] == 1
+
+        cache.invalidated_at -= 61
+        await cache.get_or_load("item", load, max_staleness=60)
+        assert cache.stats()["size"] == 2
+
+    @pytest.mark.asyncio
+    async def test_cache_healthcheck_requires_an_admin(self, admin_role):
+        token = await create_token(1, "admin@email.com", admin_role)
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.get("/api/healthcheck/cache/")
+            assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+            response = await client.get(
+                "/api/healthcheck/cache/",
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            assert response.status_code == HTTPStatus.OK
+            assert "service_catalog" in response.json()["data"]
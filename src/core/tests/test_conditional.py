@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta
+from http import HTTPStatus
+
+from fastapi import Request
+
+from src.core.conditional import (
+    conditional_response,
+    content_etag,
+    http_date,
+    is_not_modified,
+    make_etag,
+)
+
+
+def build_request(**headers: str) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "headers": [
+                (name.replace("_", "-").encode(), value.encode())
+                for name, value in headers.items()
+            ],
+        }
+    )
+
+
+class TestConditionalRequests:
+    def test_etags_are_quoted_and_stable(self):
+        assert make_etag(1, datetime(2023, 7, 28)) == make_etag(
+            1, datetime(2023, 7, 28)
+        )
+        assert make_etag(1) != make_etag(2)
+        assert content_etag(b"{}").startswith('"')
+        assert content_etag(b"{}").endswith('"')
+
+    def test_if_none_match(self):
+        etag = make_etag(1)
+
+        assert is_not_modified(build_request(if_none_match=etag), etag, None)
+        assert is_not_modified(
+            build_request(if_none_match=f'"x", W/{etag}'), etag, None
+        )
+        assert is_not_modified(build_request(if_none_match="*"), etag, None)
+        assert not is_not_modified(build_request(if_none_match='"x"'), etag, None)
+
+    def test_if_modified_since(self):
+        last_modified = datetime.now().replace(microsecond=500)
+        etag = make_etag(1)
+
+        assert is_not_modified(
+            build_request(if_modified_since=http_date(last_modified)),
+            etag,
+            last_modified,
+        )
+        assert not is_not_modified(
+            build_request(
+                if_modified_since=http_date(last_modified - timedelta(seconds=1))
+            ),
+            etag,
+            last_modified,
+        )
+        assert not is_not_modified(
+            build_request(if_modified_since="yesterday"), etag, last_modified
+        )
+
+    def test_if_none_match_takes_precedence(self):
+        last_modified = datetime.now()
+        request = build_request(
+            if_none_match='"x"', if_modified_since=http_date(last_modified)
+        )
+
+        assert not is_not_modified(request, make_etag(1), last_modified)
+
+    def test_not_modified_response_skips_rendering(self):
+        etag = make_etag(1)
+
+        def render():
+            raise AssertionError("The body was rendered")
+
+        response = conditional_response(
+            build_request(if_none_match=etag), etag, render, datetime.now()
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        assert response.headers["etag"] == etag
+        assert "last-modified" in response.headers
+        assert response.body == b""
+
+    def test_full_response_carries_validators(self):
+        etag = make_etag(1)
+
+        response = conditional_response(build_request(), etag, lambda: b"{}")
+        assert response.status_code == HTTPStatus.OK
+        assert response.headers["etag"] == etag
+        assert response.body == b"{}"
@@ -0,0 +1,82 @@
+from http import HTTPStatus
+
+import pytest
+from httpx import AsyncClient
+
+from src.config.database.setup import (
+    InstrumentedQueuePool,
+    async_session,
+    engine,
+    get_db_session,
+    get_echo_level,
+    get_pool_stats,
+    run_after_commit,
+    unit_of_work,
+)
+from src.core.middlewares.authentication_middleware import create_token
+from src.main import app
+
+
+class TestDatabaseSetup:
+    def test_engine_uses_instrumented_pool(self):
+        assert isinstance(engine.pool, InstrumentedQueuePool)
+
+    def test_pool_stats(self):
+        stats = get_pool_stats(engine)
+        assert stats["checked_out"] == 0
+        assert stats["overflow"] == 0
+        assert {"size", "checked_in", "checkouts", "max_wait_seconds"} <= set(stats)
+
+    def test_echo_level(self):
+        assert get_echo_level("debug") == "debug"
+        assert get_echo_level("true") is True
+        assert get_echo_level("false") is False
+
+    @pytest.mark.asyncio
+    async def test_healthcheck_does_not_open_a_session(self):
+        async def _unexpected_session():
+            raise AssertionError("A database session was requested")
+
+        app.dependency_overrides[get_db_session] = _unexpected_session
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.get(url="/api/healthcheck/")
+        app.dependency_overrides.pop(get_db_session)
+
+        assert response.status_code == HTTPStatus.OK
+
+    @pytest.mark.asyncio
+    async def test_database_healthcheck_requires_an_admin(self, admin_role):
+        token = await create_token(1, "admin@email.com", admin_role)
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.get("/api/healthcheck/database/")
+            assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+            response = await client.get(
+                "/api/healthcheck/database/",
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            assert response.status_code == HTTPStatus.OK
+            assert response.json()["data"]["pool"]["checked_out"] == 0
+
+    @pytest.mark.asyncio
+    async def test_after_commit_callbacks_run_when_outermost_unit_commits(self):
+        calls = []
+        async with async_session() as session:
+            async with unit_of_work(session):
+                async with unit_of_work(session):
+                    run_after_commit(session, lambda: calls.append("committed"))
+                assert calls == []
+            assert calls == ["committed"]
+
+    @pytest.mark.asyncio
+    async def test_after_commit_callbacks_are_dropped_on_rollback(self):
+        calls = []
+        async with async_session() as session:
+            with pytest.raises(ValueError):
+                async with unit_of_work(session):
+                    run_after_commit(session, lambda: calls.append("committed"))
+                    raise ValueError()
+
+            async with unit_of_work(session):
+                pass
+        assert calls == []
@@ -0,0 +1,177 @@
+import threading
+from http import HTTPStatus
+
+import pytest
+from fastapi import HTTPException
+from httpx import ASGITransport, AsyncClient
+from starlette.requests import Request
+
+from src.core.error_reporting import (
+    REPORTER_TAG,
+    ErrorReport,
+    ErrorReporter,
+    drop_duplicate_reports,
+    fingerprint,
+    is_expected,
+)
+from src.core.exceptions import Forbidden
+from src.core.metrics import registry
+from src.core.middlewares.exceptions_handler import error_handler_middleware
+from src.main import app
+
+
+def raise_error(error: Exception) -> Exception:
+    try:
+        raise error
+    except Exception as e:
+        return e
+
+
+def build_reporter(sent: list, **options) -> ErrorReporter:
+    options = {
+        "sample_rate": 1.0,
+        "expected_sample_rate": 0.0,
+        "dedupe_window": 60,
+        "queue_size": 10,
+        **options,
+    }
+    return ErrorReporter(send=sent.append, **options)
+
+
+def build_request() -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "PUT",
+            "path": "/api/v1/orders/1/",
+            "query_string": b"",
+            "headers": [],
+        }
+    )
+
+
+class TestErrorReporter:
+    def test_classifies_client_errors_as_expected(self):
+        assert is_expected(Forbidden())
+        assert not is_expected(HTTPException(status_code=503))
+        assert not is_expected(ValueError())
+
+    def test_fingerprint_depends_on_type_and_origin(self):
+        errors = [raise_error(ValueError(n)) for n in range(2)]
+
+        assert fingerprint(errors[0]) == fingerprint(errors[1])
+        assert fingerprint(errors[0]) != fingerprint(raise_error(KeyError()))
+
+    def test_expected_errors_are_not_reported_by_default(self):
+        sent = []
+        reporter = build_reporter(sent)
+        reporter.report(raise_error(Forbidden()))
+        reporter.flush()
+
+        assert sent == []
+        assert reporter.stats()["sampled_out"] == 1
+
+    def test_repeated_errors_are_reported_once_per_window(self):
+        sent = []
+        reporter = build_reporter(sent)
+        for _ in range(3):
+            reporter.report(raise_error(ValueError()), build_request())
+        reporter.flush()
+
+        assert len(sent) == 1
+        assert (sent[0].method, sent[0].path) == ("PUT", "/api/v1/orders/1/")
+        assert reporter.stats()["deduplicated"] == 2
+
+        reporter.dedupe_window = 0
+        reporter.report(raise_error(ValueError()))
+        reporter.flush()
+
+        assert len(sent) == 2
+        assert sent[1].suppressed == 2
+
+    def test_errors_sampled_out_after_their_window_are_not_lost(self, monkeypatch):
+        sent = []
+        reporter = build_reporter(sent, sample_rate=0.5)
+        for now, draw in [(0, 0.0), (10, 0.0), (61, 0.9), (70, 0.0), (122, 0.0)]:
+            monkeypatch.setattr("src.core.error_reporting.monotonic", lambda: now)
+            monkeypatch.setattr("src.core.error_reporting.random", lambda: draw)
+            reporter.report(raise_error(ValueError()))
+        reporter.flush()
+
+        assert [report.suppressed for report in sent] == [0, 3]
+        assert reporter.stats()["sampled_out"] == 1
+        assert reporter.stats()["deduplicated"] == 2
+
+    def test_full_queue_drops_reports(self):
+        sent = []
+        reporter = build_reporter(sent, queue_size=1)
+        reporter.queue.put_nowait(None)
+        reporter.report(raise_error(ValueError()))
+
+        assert reporter.stats()["dropped"] == 1
+
+    @pytest.mark.asyncio
+    async def test_responses_do_not_wait_for_the_report(self, monkeypatch):
+        release = threading.Event()
+        sent = []
+
+        def slow_send(report: ErrorReport):
+            release.wait(timeout=5)
+            sent.append(report)
+
+        reporter = build_reporter(sent)
+        reporter.send = slow_send
+        monkeypatch.setattr(
+            "src.core.middlewares.exceptions_handler.error_reporter", reporter
+        )
+
+        error = raise_error(HTTPException(status_code=HTTPStatus.BAD_GATEWAY))
+        response = await error_handler_middleware(build_request(), error)
+
+        assert response.status_code == HTTPStatus.BAD_GATEWAY
+        assert sent == []
+        release.set()
+        reporter.flush()
+        assert len(sent) == 1
+
+    def test_sentry_hook_drops_errors_reported_elsewhere(self):
+        error = HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR)
+        hint = {"exc_info": (type(error), error, None)}
+        event = {"tags": {}}
+        assert drop_duplicate_reports(event, hint) is event
+
+        build_reporter([]).report(error)
+        assert drop_duplicate_reports({"tags": {}}, hint) is None
+        event = {"tags": {REPORTER_TAG: "true"}}
+        assert drop_duplicate_reports(event, hint) is event
+        event = {"tags": {}}
+        assert drop_duplicate_reports(event, {}) is event
+
+    @pytest.mark.asyncio
+    async def test_unhandled_errors_are_reported(self, monkeypatch):
+        sent = []
+        reporter = build_reporter(sent)
+        monkeypatch.setattr(
+            "src.core.middlewares.exceptions_handler.error_reporter", reporter
+        )
+
+        def broken_render() -> str:
+            raise ValueError("broken")
+
+        monkeypatch.setattr(registry, "render", broken_render)
+
+        # The server error middleware re-raises after sending the response.
+        transport = ASGITransport(app=app, raise_app_exceptions=False)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/metrics")
+
+        assert response.status_code == HTTPStatus.INTERNAL_SERVER_ERROR
+        assert response.json() == {"message": "An unidentified error has ocurred."}
+        reporter.flush()
+        assert len(sent) == 1
+        assert isinstance(sent[0].exception, ValueError)
+        assert (sent[0].method, sent[0].path) == ("GET", "/metrics")
+
+        error = sent[0].exception
+        hint = {"exc_info": (type(error), error, error.__traceback__)}
+        assert drop_duplicate_reports({"tags": {}}, hint) is None
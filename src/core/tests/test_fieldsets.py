@@ -0,0 +1,52 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlmodel import select
+
+from src.core.exceptions import InvalidFields
+from src.core.fieldsets import load_fields, parse_fields, sparse_page, sparse_schema
+from src.core.responses import dump_json
+from src.services.models import Service
+from src.services.schemas import ServiceResponse
+
+
+class TestFieldsets:
+    def test_fields_are_returned_in_schema_order(self):
+        assert parse_fields(None, ServiceResponse) is None
+        assert parse_fields(" name, id ,name", ServiceResponse) == ("id", "name")
+
+    def test_unknown_fields_are_rejected(self):
+        with pytest.raises(InvalidFields) as error:
+            parse_fields("id,created_at,hashed_password", ServiceResponse)
+        assert error.value.detail == (
+            "Unknown fields requested: created_at, hashed_password."
+        )
+
+        with pytest.raises(InvalidFields):
+            parse_fields(",", ServiceResponse)
+
+    def test_sparse_schema_keeps_only_requested_fields(self):
+        schema = sparse_schema(ServiceResponse, ("id", "name"))
+        assert list(schema.__fields__) == ["id", "name"]
+        assert sparse_schema(ServiceResponse, ("id", "name")) is schema
+        assert sparse_schema(ServiceResponse, None) is ServiceResponse
+
+        service = Service(id=1, name="Oil change", price=10.0, description="Long")
+        assert (
+            dump_json(
+                sparse_page(ServiceResponse, ("id", "name")),
+                {
+                    "items": [service],
+                    "next_cursor": None,
+                },
+            )
+            == b'{"items":[{"id":1,"name":"Oil change"}],"next_cursor":null}'
+        )
+
+    def test_load_fields_prunes_selected_columns(self):
+        query = select(Service).options(
+            *load_fields(Service, ("name", "unknown"), "id")
+        )
+        statement = str(query.compile(dialect=postgresql.dialect()))
+        assert statement.startswith("SELECT service.id, service.name \nFROM service")
+
+        assert load_fields(Service, None, "id") == []
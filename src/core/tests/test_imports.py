@@ -0,0 +1,128 @@
+import pytest
+
+from src.core import imports
+from src.core.exceptions import InvalidImportFile
+from src.core.imports import Rejections, csv_rows, required, stage_csv
+
+
+async def byte_chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+def parse_row(fields: list[str]) -> tuple:
+    brand, year = fields
+    return required(brand, "brand"), int(year)
+
+
+class TestImports:
+    @pytest.mark.asyncio
+    async def test_csv_rows_across_chunks(self):
+        chunks = byte_chunks(
+            "\ufeffbrand,year\nfi".encode(),
+            b'at,1990\n"chev',
+            'rolet, inc",2007\nfusca \xc3'.encode("latin-1"),
+            b"\xa7,1970",
+        )
+        rows = [row async for row in csv_rows(chunks)]
+        assert rows == [
+            (1, ["brand", "year"]),
+            (2, ["fiat", "1990"]),
+            (3, ["chevrolet, inc", "2007"]),
+            (4, ["fusca ç", "1970"]),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_csv_rows_quoted_fields_span_chunks(self):
+        chunks = byte_chunks(
+            b'brand,notes\nfiat,"first\nsec',
+            b'ond ""line""\n',
+            b'third"\nford,"a\xe2\x80\xa8b\x0cc"\r\n',
+        )
+        rows = [row async for row in csv_rows(chunks)]
+        assert rows == [
+            (1, ["brand", "notes"]),
+            (2, ["fiat", 'first\nsecond "line"\nthird']),
+            (5, ["ford", "a\u2028b\x0cc"]),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_csv_rows_reports_malformed_records(self):
+        errors = []
+        chunks = byte_chunks(b'brand\nfi\x00at\nford\n"kia', b"\nvw\n")
+        rows = [
+            row
+            async for row in csv_rows(
+                chunks, on_error=lambda *error: errors.append(error)
+            )
+        ]
+        assert rows == [(1, ["brand"]), (3, ["ford"])]
+        assert errors == [(2, "Contains NUL bytes"), (4, "Quoted field is not closed")]
+
+        with pytest.raises(InvalidImportFile) as error:
+            [row async for row in csv_rows(byte_chunks(b'brand\n"fiat\n'))]
+        assert "Line 2: Quoted field is not closed" in error.value.detail
+
+    @pytest.mark.asyncio
+    async def test_csv_rows_rejects_invalid_encoding(self):
+        with pytest.raises(InvalidImportFile):
+            [row async for row in csv_rows(byte_chunks(b"brand\n\xff\n"))]
+
+    @pytest.mark.asyncio
+    async def test_stage_csv_batches_and_rejections(self, monkeypatch):
+        monkeypatch.setattr(imports, "IMPORT_BATCH_SIZE", 2)
+        staged = []
+
+        async def stage(batch):
+            staged.append(batch)
+
+        rejections = Rejections()
+        chunks = byte_chunks(
+            b"Year,Brand,ignored\n1990,fiat,x\n2007,chevrolet\n\n",
+            b'abc,ford\n1970,\n2010,kia\n2011,vw\n2012,"\x00"\n',
+        )
+        received = await stage_csv(
+            chunks, ("brand", "year"), parse_row, stage, rejections
+        )
+
+        assert received == 7
+        assert staged == [
+            [(2, "fiat", 1990), (3, "chevrolet", 2007)],
+            [(7, "kia", 2010), (8, "vw", 2011)],
+        ]
+        assert rejections.count == 3
+        assert [(row.line, row.reason) for row in rejections.rows] == [
+            (5, "invalid literal for int() with base 10: 'abc'"),
+            (6, "Missing brand"),
+            (9, "Contains NUL bytes"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_stage_csv_requires_the_columns(self):
+        async def stage(batch):
+            raise AssertionError("Nothing should be staged")
+
+        with pytest.raises(InvalidImportFile) as error:
+            await stage_csv(
+                byte_chunks(b"brand,model\nfiat,uno\n"),
+                ("brand", "year"),
+                parse_row,
+                stage,
+                Rejections(),
+            )
+        assert error.value.detail == "Invalid import file: Missing columns: year."
+
+        with pytest.raises(InvalidImportFile):
+            await stage_csv(
+                byte_chunks(b""), ("brand",), parse_row, stage, Rejections()
+            )
+
+    def test_rejections_keep_a_bounded_sample(self, monkeypatch):
+        monkeypatch.setattr(imports, "MAX_REPORTED_REJECTIONS", 2)
+        rejections = Rejections()
+        for line in (5, 3, 9):
+            rejections.add(line, "Missing brand")
+
+        report = rejections.report(received=10, created=7)
+        assert report.rejected == 3
+        assert [row.line for row in report.rejections] == [3, 5]
@@ -0,0 +1,59 @@
+import asyncio
+import time
+from http import HTTPStatus
+
+import pytest
+from httpx import AsyncClient
+
+from src.core.loop_monitor import LoopMonitor, quantile
+from src.core.middlewares.authentication_middleware import create_token
+from src.main import app
+
+
+def block_the_loop(seconds: float):
+    time.sleep(seconds)
+
+
+class TestLoopMonitor:
+    def test_quantile(self):
+        assert quantile([], 0.5) == 0.0
+        assert quantile([1.0, 2.0, 3.0, 4.0], 0.5) == 3.0
+        assert quantile([1.0, 2.0, 3.0, 4.0], 0.99) == 4.0
+
+    @pytest.mark.asyncio
+    async def test_records_the_stack_that_blocked_the_loop(self):
+        monitor = LoopMonitor(
+            interval=0.01, block_threshold=0.05, window=100, max_stalls=5
+        )
+        await monitor.start()
+        try:
+            await asyncio.sleep(0.05)
+            block_the_loop(0.2)
+            await asyncio.sleep(0.05)
+        finally:
+            await monitor.stop()
+
+        assert not monitor.running
+        assert len(monitor.stalls) == 1
+        assert "block_the_loop" in "".join(monitor.stalls[0].stack)
+        assert monitor.stalls[0].blocked_ms >= 50
+        assert max(monitor.lags) >= 0.15
+        assert monitor.lag_quantiles()[0.99] == max(monitor.lags)
+
+    @pytest.mark.asyncio
+    async def test_event_loop_endpoint_requires_an_admin(self, admin_role):
+        token = await create_token(1, "admin@email.com", admin_role)
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.get("/api/healthcheck/event-loop/")
+            assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+            response = await client.get(
+                "/api/healthcheck/event-loop/",
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            assert response.status_code == HTTPStatus.OK
+            assert set(response.json()["data"]["lag_seconds"]) == {
+                "0.5",
+                "0.9",
+                "0.99",
+            }
@@ -0,0 +1,121 @@
+import os
+from http import HTTPStatus
+
+import orjson
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+
+from src.core.metrics import MetricsRegistry, http_requests_total
+from src.core.routing import route_template
+from src.main import app
+
+# Larger than any pid the kernel hands out, so never a live process.
+DEAD_PID = 999999999
+
+
+def build_registry(multiprocess_dir: str | None = None) -> MetricsRegistry:
+    registry = MetricsRegistry(multiprocess_dir=multiprocess_dir)
+    registry.counter("jobs_total", "Jobs done.", "queue")
+    registry.gauge("jobs_running", "Jobs running.", "queue")
+    registry.histogram("job_seconds", "Job duration.", "queue", buckets=(0.1, 1.0))
+    return registry
+
+
+class TestMetricsRegistry:
+    def test_renders_the_prometheus_text_format(self):
+        registry = build_registry()
+        registry.metrics["jobs_total"].inc("emails")
+        registry.metrics["jobs_total"].inc("emails", amount=2)
+        registry.metrics["jobs_running"].set(1.5, 'say "hi"')
+        registry.metrics["job_seconds"].observe(0.05, "emails")
+        registry.metrics["job_seconds"].observe(0.5, "emails")
+        registry.metrics["job_seconds"].observe(5, "emails")
+
+        assert registry.render() == (
+            "# HELP jobs_total Jobs done.\n"
+            "# TYPE jobs_total counter\n"
+            'jobs_total{queue="emails"} 3\n'
+            "# HELP jobs_running Jobs running.\n"
+            "# TYPE jobs_running gauge\n"
+            'jobs_running{queue="say \\"hi\\""} 1.5\n'
+            "# HELP job_seconds Job duration.\n"
+            "# TYPE job_seconds histogram\n"
+            'job_seconds_bucket{queue="emails",le="0.1"} 1\n'
+            'job_seconds_bucket{queue="emails",le="1"} 2\n'
+            'job_seconds_bucket{queue="emails",le="+Inf"} 3\n'
+            'job_seconds_sum{queue="emails"} 5.55\n'
+            'job_seconds_count{queue="emails"} 3\n'
+        )
+
+    def test_collectors_run_before_rendering(self):
+        registry = build_registry()
+        registry.collector(lambda: registry.metrics["jobs_running"].set(4, "emails"))
+
+        assert 'jobs_running{queue="emails"} 4' in registry.render()
+
+    def test_multiprocess_mode_adds_up_workers(self, tmp_path):
+        registry = build_registry(multiprocess_dir=str(tmp_path))
+        registry.metrics["jobs_total"].inc("emails")
+        registry.metrics["jobs_running"].set(1, "emails")
+        registry.metrics["job_seconds"].observe(0.5, "emails")
+
+        dead_worker = {
+            "jobs_total": [[["emails"], 2]],
+            "jobs_running": [[["emails"], 7]],
+            "job_seconds": [[["emails"], [1, 0, 0, 0.05]]],
+        }
+        (tmp_path / f"{DEAD_PID}.json").write_bytes(orjson.dumps(dead_worker))
+
+        output = registry.render()
+
+        assert (tmp_path / f"{os.getpid()}.json").exists()
+        assert 'jobs_total{queue="emails"} 3' in output
+        assert 'jobs_running{queue="emails"} 1' in output
+        assert 'job_seconds_bucket{queue="emails",le="1"} 2' in output
+        assert 'job_seconds_count{queue="emails"} 2' in output
+
+    @pytest.mark.asyncio
+    async def test_requests_are_labelled_by_route_template(self):
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            await client.get("/api/v1/vehicles/not-a-number/")
+            await client.get("/missing/")
+            response = await client.get("/metrics")
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.headers["content-type"].startswith("text/plain")
+        assert (
+            "GET",
+            "/api/v1/vehicles/{vehicle_id}/",
+            "422",
+        ) in http_requests_total.values
+        assert ("GET", "unmatched", "404") in http_requests_total.values
+        assert 'db_pool_connections{pool="primary",state="checked_out"} 0' in (
+            response.text
+        )
+        assert "cache_hits_total" in response.text
+
+    def test_route_templates_are_cached_by_endpoint(self):
+        route_app = FastAPI()
+
+        @route_app.get("/orders/{order_id}/")
+        async def get_order(order_id: int):
+            return {}
+
+        @route_app.get("/first/")
+        @route_app.get("/second/")
+        async def aliased():
+            return {}
+
+        scope = {"type": "http", "method": "GET", "app": route_app}
+        assert route_template({**scope, "path": "/orders/1/"}) == "/orders/{order_id}/"
+        assert route_template({**scope, "path": "/missing/"}) is None
+
+        routed = {**scope, "path": "/orders/1/", "endpoint": get_order}
+        assert route_template(routed) == "/orders/{order_id}/"
+        aliased_scope = {**scope, "path": "/second/", "endpoint": aliased}
+        assert route_template(aliased_scope) == "/second/"
+
+        # Routed requests no longer scan the routes.
+        route_app.router.routes.clear()
+        assert route_template(routed) == "/orders/{order_id}/"
@@ -0,0 +1,104 @@
+from datetime import datetime
+
+import pytest
+from sqlmodel import select
+
+from src.core.exceptions import InvalidCursor
+from src.core.pagination import (
+    build_page,
+    decode_cursor,
+    encode_cursor,
+    paginate,
+    paginate_sorted,
+)
+from src.orders.models import Order
+from src.vehicles.models import Vehicle
+
+
+class TestPagination:
+    def test_cursor_round_trip(self):
+        assert decode_cursor(encode_cursor(42)) == 42
+
+    def test_invalid_cursor(self):
+        with pytest.raises(InvalidCursor):
+            decode_cursor("not a cursor")
+
+        with pytest.raises(InvalidCursor):
+            paginate(select(Vehicle), Vehicle.id, encode_cursor("1"), limit=10)
+
+    def test_paginate_filters_after_cursor(self):
+        query = paginate(select(Vehicle), Vehicle.id, encode_cursor(10), limit=5)
+        compiled = query.compile(compile_kwargs={"literal_binds": True})
+
+        assert "WHERE vehicle.id > 10 ORDER BY vehicle.id" in str(compiled)
+        assert "LIMIT 6" in str(compiled)
+
+    def test_paginate_descending(self):
+        query = paginate(
+            select(Vehicle), Vehicle.id, encode_cursor(10), limit=5, descending=True
+        )
+        compiled = query.compile(compile_kwargs={"literal_binds": True})
+
+        assert "WHERE vehicle.id < 10 ORDER BY vehicle.id DESC" in str(compiled)
+
+    def test_paginate_sorted_after_cursor(self):
+        cursor = encode_cursor([datetime(2023, 7, 28), 3])
+        query = paginate_sorted(
+            select(Order.id), Order.start_date, Order.id, cursor, limit=5
+        )
+        compiled = str(query.compile(compile_kwargs={"literal_binds": True}))
+
+        assert (
+            "\"order\".start_date > '2023-07-28 00:00:00' OR "
+            '"order".start_date = \'2023-07-28 00:00:00\' AND "order".id > 3 OR '
+            '"order".start_date IS NULL'
+        ) in compiled
+        assert 'ORDER BY "order".start_date, "order".id' in compiled
+
+    def test_paginate_sorted_descending(self):
+        cursor = encode_cursor(["DONE", 3])
+        query = paginate_sorted(
+            select(Order.id), Order.status, Order.id, cursor, limit=5, descending=True
+        )
+        compiled = str(query.compile(compile_kwargs={"literal_binds": True}))
+
+        assert (
+            "\"order\".status < 'DONE' OR "
+            '"order".status = \'DONE\' AND "order".id < 3'
+        ) in compiled
+        assert 'ORDER BY "order".status DESC, "order".id DESC' in compiled
+
+    def test_paginate_sorted_rejects_mismatched_cursor(self):
+        with pytest.raises(InvalidCursor):
+            paginate_sorted(
+                select(Order), Order.start_date, Order.id, encode_cursor(3), limit=5
+            )
+
+        with pytest.raises(InvalidCursor):
+            paginate_sorted(
+                select(Order),
+                Order.start_date,
+                Order.id,
+                encode_cursor(["DONE", 3]),
+                limit=5,
+            )
+
+        with pytest.raises(InvalidCursor):
+            paginate_sorted(
+                select(Order),
+                Order.status,
+                Order.id,
+                encode_cursor([None, 3]),
+                limit=5,
+            )
+
+    def test_build_page(self):
+        rows = [Vehicle(id=vehicle_id) for vehicle_id in (1, 2, 3)]
+
+        page = build_page(rows, limit=2, key=lambda vehicle: vehicle.id)
+        assert [vehicle.id for vehicle in page.items] == [1, 2]
+        assert decode_cursor(page.next_cursor) == 2
+
+        last_page = build_page(rows, limit=3, key=lambda vehicle: vehicle.id)
+        assert len(last_page.items) == 3
+        assert last_page.next_cursor is None
@@ -0,0 +1,38 @@
+import asyncio
+
+import pytest
+
+from src.core.exceptions import PasswordHashingUnavailable
+from src.core.passwords import PasswordHasher
+
+
+class TestPasswordHasher:
+    @pytest.mark.asyncio
+    async def test_hash_and_verify_password(self):
+        hasher = PasswordHasher(workers=1, queue_size=1)
+        hashed_password = await hasher.hash("test123")
+
+        assert await hasher.verify("test123", hashed_password)
+        assert not await hasher.verify("wrong_password", hashed_password)
+        assert hasher.stats()["completed"] == 3
+        assert hasher.stats()["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_reject_when_queue_is_full(self):
+        hasher = PasswordHasher(workers=1, queue_size=1)
+        results = await asyncio.gather(
+            *(hasher.hash("test123") for _ in range(3)), return_exceptions=True
+        )
+
+        rejected = [r for r in results if isinstance(r, PasswordHashingUnavailable)]
+        assert len(rejected) == 1
+        assert hasher.stats()["rejected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_hash_many_stays_within_the_queue(self):
+        hasher = PasswordHasher(workers=2, queue_size=0)
+        hashed_passwords = await hasher.hash_many([f"test{n}" for n in range(6)])
+
+        assert len(hashed_passwords) == 6
+        assert await hasher.verify("test5", hashed_passwords[5])
+        assert hasher.stats()["rejected"] == 0
@@ -0,0 +1,97 @@
+import pstats
+from cProfile import Profile
+from datetime import datetime, timedelta
+from http import HTTPStatus
+
+import pytest
+from httpx import AsyncClient
+
+from src.core.middlewares.authentication_middleware import create_token
+from src.core.profiling import ProfileInfo, ProfileStore, profile_store
+from src.main import app
+
+
+def profile_info(profile_id: str, minutes: int = 0) -> ProfileInfo:
+    return ProfileInfo(
+        id=profile_id,
+        method="GET",
+        path="/api/healthcheck/",
+        route="/api/healthcheck/",
+        status_code=200,
+        duration_ms=1.5,
+        created_at=datetime(2023, 7, 28) + timedelta(minutes=minutes),
+    )
+
+
+class TestProfileStore:
+    def test_keeps_only_the_latest_profiles(self, tmp_path):
+        store = ProfileStore(directory=str(tmp_path), max_files=2)
+        ids = [store.new_id() for _ in range(3)]
+        for minutes, profile_id in enumerate(ids):
+            store.save(Profile(), profile_info(profile_id, minutes))
+
+        assert [info.id for info in store.profiles()] == [ids[2], ids[1]]
+        assert store.path(ids[0]) is None
+        assert store.path(ids[2]).endswith(f"{ids[2]}.prof")
+
+    def test_rejects_ids_outside_the_store(self, tmp_path):
+        store = ProfileStore(directory=str(tmp_path), max_files=2)
+        assert store.path("../../etc/passwd") is None
+        assert store.profiles() == []
+
+
+class TestProfilingMiddleware:
+    @pytest.mark.asyncio
+    async def test_admins_can_profile_a_request(
+        self, tmp_path, monkeypatch, admin_role
+    ):
+        monkeypatch.setattr(profile_store, "directory", str(tmp_path))
+        token = await create_token(1, "admin@email.com", admin_role)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.get(
+                "/api/healthcheck/", headers={**headers, "X-Profile": "1"}
+            )
+            profile_id = response.headers["x-profile-id"]
+
+            response = await client.get("/api/healthcheck/profiles/", headers=headers)
+            assert response.json()[0]["id"] == profile_id
+            assert response.json()[0]["route"] == "/api/healthcheck/"
+
+            response = await client.get(
+                f"/api/healthcheck/profiles/{profile_id}/", headers=headers
+            )
+            assert response.status_code == HTTPStatus.OK
+
+        path = tmp_path / "downloaded.prof"
+        path.write_bytes(response.content)
+        assert pstats.Stats(str(path)).total_calls > 0
+
+    @pytest.mark.asyncio
+    async def test_other_users_are_not_profiled(
+        self, tmp_path, monkeypatch, customer_role
+    ):
+        monkeypatch.setattr(profile_store, "directory", str(tmp_path))
+        token = await create_token(2, "john.doe@email.com", customer_role)
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.get(
+                "/api/healthcheck/?profile=true",
+                headers={"Authorization": f"Bearer {token}"},
+            )
+
+        assert response.status_code == HTTPStatus.OK
+        assert "x-profile-id" not in response.headers
+        assert profile_store.profiles() == []
+
+    @pytest.mark.asyncio
+    async def test_unknown_profile(self, admin_role):
+        token = await create_token(1, "admin@email.com", admin_role)
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.get(
+                f"/api/healthcheck/profiles/{'0' * 32}/",
+                headers={"Authorization": f"Bearer {token}"},
+            )
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
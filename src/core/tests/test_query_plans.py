@@ -0,0 +1,240 @@
+import json
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, text
+
+from src.orders import services as orders_services
+from src.orders.schemas import OrderFilters, OrderSort
+from src.services import services as services_services
+from src.users import service as users_service
+from src.vehicles import service as vehicles_service
+
+SEED_STATEMENTS = [
+    """
+    INSERT INTO address (street, city, state, complement, zipcode)
+    SELECT 'Street ' || n, 'City ' || (n % 300), 'RJ', '', lpad(n::text, 8, '0')
+    FROM generate_series(1, 8000) AS n
+    """,
+    """
+    INSERT INTO "user" (
+        created_at, updated_at, username, hashed_password, first_name, last_name,
+        is_active, role
+    )
+    SELECT now(), now(), 'user' || n || '@email.com', 'hash', 'First', 'Last',
+        true, 'CUSTOMER'
+    FROM generate_series(1, 10000) AS n
+    """,
+    """
+    INSERT INTO customer (created_at, updated_at, id, address_id)
+    SELECT now(), now(), n, n FROM generate_series(1, 8000) AS n
+    """,
+    """
+    INSERT INTO employee (created_at, updated_at, id)
+    SELECT now(), now(), n FROM generate_series(8001, 10000) AS n
+    """,
+    """
+    INSERT INTO vehicle (brand, model, color, year)
+    SELECT 'Brand ' || (n % 50), 'Model ' || n, 'Color ' || (n % 12),
+        (1990 + n % 34)::text
+    FROM generate_series(1, 2000) AS n
+    """,
+    """
+    INSERT INTO service (name, price, description, image, estimated_time, category)
+    SELECT 'Service ' || n, n * 1.5, 'Description ' || n, 'image.png', n % 240,
+        'Category ' || (n % 20)
+    FROM generate_series(1, 1000) AS n
+    """,
+    """
+    INSERT INTO customer_vehicle (
+        created_at, updated_at, vin, plate_code, customer_id, vehicle_id
+    )
+    SELECT now(), now(), 'VIN' || n, 'PLT' || n, n % 8000 + 1, n % 2000 + 1
+    FROM generate_series(1, 10000) AS n
+    """,
+    """
+    INSERT INTO "order" (
+        created_at, updated_at, customer_id, start_date, estimated_time, status
+    )
+    SELECT now(), now(), n % 8000 + 1, '2023-01-01'::timestamp + n * interval '1 hour',
+        '2023-01-01'::timestamp + n * interval '1 hour' + interval '2 hours',
+        (ARRAY['REQUESTED', 'UNDER_REVIEW', 'DONE'])[n % 3 + 1]
+    FROM generate_series(1, 20000) AS n
+    """,
+    """
+    INSERT INTO order_vehicle (order_id, customer_vehicle_id)
+    SELECT n, n % 10000 + 1 FROM generate_series(1, 20000) AS n
+    """,
+    """
+    INSERT INTO order_service (order_id, service_id)
+    SELECT n, n % 1000 + 1 FROM generate_series(1, 20000) AS n
+    """,
+    """
+    INSERT INTO order_employee (order_id, employee_id)
+    SELECT n, 8001 + n % 2000 FROM generate_series(1, 20000) AS n
+    """,
+]
+SEEDED_TABLES = [
+    "address",
+    '"user"',
+    "customer",
+    "employee",
+    "vehicle",
+    "service",
+    "customer_vehicle",
+    '"order"',
+    "order_vehicle",
+    "order_service",
+    "order_employee",
+]
+INDEX_NODE_TYPES = ("Index Scan", "Index Only Scan", "Bitmap Index Scan")
+
+
+def collect_scans(plan: dict) -> list[dict]:
+    scans = [plan] if "Relation Name" in plan or "Index Name" in plan else []
+    for child in plan.get("Plans", []):
+        scans.extend(collect_scans(child))
+    return scans
+
+
+@pytest_asyncio.fixture
+async def seeded_session(db_connection, db_session):
+    for statement in SEED_STATEMENTS:
+        await db_connection.execute(text(statement))
+    for table in SEEDED_TABLES:
+        await db_connection.execute(text(f"ANALYZE {table}"))
+    await db_connection.commit()
+    yield db_session
+
+
+@pytest_asyncio.fixture
+async def captured_statements(db_connection):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            statements.append((statement, parameters))
+
+    sync_connection = db_connection.sync_connection
+    event.listen(sync_connection, "before_cursor_execute", capture)
+    yield statements
+    event.remove(sync_connection, "before_cursor_execute", capture)
+
+
+async def assert_index_scans(db_connection, statements: list):
+    assert statements
+    for statement, parameters in statements:
+        result = await db_connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {statement}", parameters
+        )
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        for scan in collect_scans(plan[0]["Plan"]):
+            assert scan["Node Type"] in INDEX_NODE_TYPES, (
+                f"{scan['Node Type']} on {scan.get('Relation Name')} for:\n"
+                f"{statement}"
+            )
+
+
+class TestQueryPlans:
+    """Seeds a realistic volume and checks every lookup in the service modules
+    is served by an index. Exports (``stream_*``) read whole tables on purpose
+    and are not covered here.
+    """
+
+    @pytest.mark.asyncio
+    async def test_users_queries_use_indexes(
+        self, db_connection, seeded_session, captured_statements
+    ):
+        await users_service.get_users(seeded_session)
+        await users_service.get_users(seeded_session, limit=10)
+        await users_service.get_customers(seeded_session)
+        await users_service.get_user_by_id(5000, seeded_session)
+        await users_service.get_user_by_username("user5000@email.com", seeded_session)
+        await users_service.get_customer_by_id(5000, seeded_session)
+
+        await assert_index_scans(db_connection, captured_statements)
+
+    @pytest.mark.asyncio
+    async def test_vehicles_queries_use_indexes(
+        self, db_connection, seeded_session, captured_statements
+    ):
+        await vehicles_service.get_vehicles(seeded_session)
+        await vehicles_service.get_vehicle_by_id(1000, seeded_session)
+        await vehicles_service.get_vehicle(
+            brand="Brand 0",
+            model="Model 1000",
+            color="Color 4",
+            year="2004",
+            db_session=seeded_session,
+        )
+
+        await assert_index_scans(db_connection, captured_statements)
+
+    @pytest.mark.asyncio
+    async def test_services_queries_use_indexes(
+        self, db_connection, seeded_session, captured_statements
+    ):
+        await services_services.get_services(seeded_session)
+        await services_services.get_services(seeded_session, fields=("id", "name"))
+        await services_services.get_service_by_id(500, seeded_session)
+        await services_services.get_service(
+            name="Service 500",
+            price=750.0,
+            description="Description 500",
+            image="image.png",
+            estimated_time=20,
+            category="Category 0",
+            db_session=seeded_session,
+        )
+        await services_services.update_service(
+            service_id=500,
+            name="Service 500",
+            price=800.0,
+            description="Description 500",
+            image="image.png",
+            estimated_time=20,
+            category="Category 0",
+            db_session=seeded_session,
+        )
+        await services_services.delete_service(999, seeded_session)
+
+        await assert_index_scans(db_connection, captured_statements)
+
+    @pytest.mark.asyncio
+    async def test_orders_queries_use_indexes(
+        self, db_connection, seeded_session, captured_statements
+    ):
+        await orders_services.get_orders(seeded_session)
+        await orders_services.get_orders(
+            seeded_session, sort=OrderSort.STATUS, fields=("id", "service_ids")
+        )
+        await orders_services.get_orders(
+            seeded_session,
+            filters=OrderFilters(status="DONE", start_date_from=datetime(2024, 1, 1)),
+            sort=OrderSort.START_DATE_DESC,
+        )
+        await orders_services.get_orders(
+            seeded_session,
+            filters=OrderFilters(customer_id=2001),
+            sort=OrderSort.ESTIMATED_TIME,
+        )
+        await orders_services.get_order_revision(10000, seeded_session)
+        await orders_services.get_orders_by_vehicle(2001, seeded_session)
+        await orders_services.get_orders_by_employee(8001, seeded_session)
+        await orders_services.get_order(
+            customer_id=2001,
+            customer_vehicle_ids=[2001],
+            service_ids=[1],
+            employee_ids=[8001],
+            start_date=datetime(2023, 3, 25, 8),
+            estimated_time=datetime(2023, 3, 25, 10),
+            status="DONE",
+            db_session=seeded_session,
+        )
+        await orders_services.delete_order(19999, seeded_session)
+
+        await assert_index_scans(db_connection, captured_statements)
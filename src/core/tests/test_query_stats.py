@@ -0,0 +1,104 @@
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from src.config.database.setup import collect_query_stats, track_queries
+from src.core.middlewares.query_stats_middleware import (
+    QueryBudgetExceeded,
+    QueryStatsMiddleware,
+    query_budget,
+    server_timing,
+)
+
+sqlite_engine = create_engine("sqlite://")
+track_queries(sqlite_engine)
+
+
+def run_queries(count: int):
+    with sqlite_engine.connect() as connection:
+        for _ in range(count):
+            connection.execute(text("SELECT 1"))
+
+
+def build_app(**options) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/orders/")
+    async def list_orders():
+        run_queries(3)
+        return []
+
+    @app.post("/orders/import/")
+    @query_budget(10)
+    async def import_orders():
+        run_queries(5)
+        return {}
+
+    app.add_middleware(QueryStatsMiddleware, **options)
+    return app
+
+
+class TestQueryStats:
+    def test_counts_statements_inside_the_block(self):
+        run_queries(2)
+
+        with collect_query_stats() as stats:
+            run_queries(3)
+
+        assert stats.count == 3
+        assert stats.duration > 0
+
+    def test_counts_failed_statements(self):
+        with collect_query_stats() as stats:
+            with sqlite_engine.connect() as connection:
+                with pytest.raises(OperationalError):
+                    connection.execute(text("SELECT * FROM missing"))
+                connection.execute(text("SELECT 1"))
+
+        assert stats.count == 2
+
+    def test_tracking_twice_does_not_double_count(self):
+        track_queries(sqlite_engine)
+
+        with collect_query_stats() as stats:
+            run_queries(1)
+
+        assert stats.count == 1
+
+    def test_server_timing(self):
+        with collect_query_stats() as stats:
+            stats.count, stats.duration = 4, 0.0125
+
+        assert server_timing(stats) == 'db;dur=12.50;desc="4 queries"'
+
+    @pytest.mark.asyncio
+    async def test_middleware_reports_queries(self):
+        app = build_app(budget=5, enforce_budget=True)
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.get("/orders/")
+
+        assert response.headers["server-timing"].startswith("db;dur=")
+        assert response.headers["server-timing"].endswith('desc="3 queries"')
+
+    @pytest.mark.asyncio
+    async def test_middleware_fails_requests_over_budget(self):
+        app = build_app(budget=2, enforce_budget=True)
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            with pytest.raises(QueryBudgetExceeded, match="ran 3 queries"):
+                await client.get("/orders/")
+
+            response = await client.post("/orders/import/")
+            assert response.headers["server-timing"].endswith('desc="5 queries"')
+
+    @pytest.mark.asyncio
+    async def test_middleware_only_warns_when_not_enforced(self, caplog):
+        app = build_app(budget=2, enforce_budget=False)
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.get("/orders/")
+
+        assert response.status_code == 200
+        [warning] = [r for r in caplog.records if r.levelname == "WARNING"]
+        assert warning.db_queries == 3
+        assert warning.db_query_budget == 2
@@ -0,0 +1,81 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.config.database.setup import ReplicaRouter
+
+
+class FakeReplica:
+    def __init__(self, lag: float):
+        self.lag = lag
+
+    def connect(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def execute(self, query):
+        return self
+
+    def scalar(self):
+        return self.lag
+
+
+@pytest.fixture
+def replicas():
+    return [(FakeReplica(lag=0), "replica_1"), (FakeReplica(lag=60), "replica_2")]
+
+
+@pytest.fixture
+def replica_router(replicas):
+    return ReplicaRouter(
+        primary="primary",
+        replicas=replicas,
+        max_lag=5,
+        lag_check_interval=60,
+        sticky_window=60,
+    )
+
+
+class TestReplicaRouter:
+    @pytest.mark.asyncio
+    async def test_reads_fall_back_to_primary_until_lag_is_known(self, replica_router):
+        assert replica_router.choose("GET") == "primary"
+
+        await asyncio.sleep(0)
+        assert replica_router.choose("GET") == "replica_1"
+
+    @pytest.mark.asyncio
+    async def test_lagging_replica_is_skipped(self, replica_router, replicas):
+        for replica_engine, _ in replicas:
+            await replica_router.check_lag(replica_engine)
+
+        chosen = {replica_router.choose("GET") for _ in range(4)}
+        assert chosen == {"replica_1"}
+
+    @pytest.mark.asyncio
+    async def test_writes_go_to_primary(self, replica_router, replicas):
+        for replica_engine, _ in replicas:
+            await replica_router.check_lag(replica_engine)
+
+        assert replica_router.choose("POST") == "primary"
+        assert replica_router.choose("DELETE", user_id=1) == "primary"
+
+    @pytest.mark.asyncio
+    async def test_recent_writer_reads_from_primary(self, replica_router, replicas):
+        for replica_engine, _ in replicas:
+            await replica_router.check_lag(replica_engine)
+
+        replica_router.mark_write(user_id=1)
+        assert replica_router.choose("GET", user_id=1) == "primary"
+        assert replica_router.choose("GET", user_id=2) == "replica_1"
+
+    def test_max_staleness_of_a_session(self, replica_router, replicas):
+        replica_engine, _ = replicas[0]
+        assert replica_router.max_staleness(SimpleNamespace(bind=replica_engine)) == 65
+        assert replica_router.max_staleness(SimpleNamespace(bind="primary")) == 0
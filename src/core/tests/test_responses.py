@@ -0,0 +1,94 @@
+from datetime import datetime
+from http import HTTPStatus
+
+import pytest
+from fastapi import APIRouter, FastAPI, Response
+from httpx import AsyncClient
+from pydantic import BaseModel
+
+from src.core.pagination import Page
+from src.core.responses import FastJSONRoute, dump_json
+from src.orders.schemas import OrderResponse
+from src.vehicles.models import Vehicle
+from src.vehicles.schemas import VehicleResponse
+
+
+class Account(BaseModel):
+    id: int
+    username: str
+    hashed_password: str
+
+
+def build_app() -> FastAPI:
+    router = APIRouter(route_class=FastJSONRoute)
+
+    @router.get("/vehicles/", response_model=Page[VehicleResponse])
+    async def list_vehicles():
+        vehicle = Vehicle(id=1, brand="fiat", model="uno", color="red", year="1990")
+        return Page(items=[vehicle], next_cursor=None)
+
+    @router.post(
+        "/accounts/",
+        response_model=Account,
+        response_model_exclude={"hashed_password"},
+        status_code=HTTPStatus.CREATED,
+    )
+    async def post_account():
+        return {"id": 1, "username": "john", "hashed_password": "secret"}
+
+    @router.get("/raw/", response_model=Account)
+    async def raw():
+        return Response(content=b"raw")
+
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+class TestFastJSON:
+    def test_dump_json_reads_rows_without_validation(self):
+        page = Page[Vehicle](
+            items=[Vehicle(id=1, brand="fiat", model="uno", color="red", year="1990")],
+            next_cursor=None,
+        )
+
+        assert dump_json(Page[VehicleResponse], page) == (
+            b'{"items":[{"id":1,"model":"uno","brand":"fiat",'
+            b'"color":"red","year":"1990"}],"next_cursor":null}'
+        )
+
+    def test_dump_json_matches_pydantic(self):
+        order = OrderResponse(
+            id=1,
+            customer_id=2,
+            customer_vehicle_ids=[3],
+            service_ids=[4, 5],
+            employee_ids=None,
+            start_date=datetime(2023, 7, 28, 10, 30, 15, 120),
+            estimated_time=datetime(2023, 7, 28, 12),
+            status="REQUESTED",
+        )
+
+        assert (
+            dump_json(OrderResponse, order)
+            == order.json(separators=(",", ":")).encode()
+        )
+
+    @pytest.mark.asyncio
+    async def test_route_class_serializes_return_values(self):
+        async with AsyncClient(app=build_app(), base_url="http://test") as client:
+            response = await client.get("/vehicles/")
+            assert response.status_code == HTTPStatus.OK
+            assert response.headers["content-type"] == "application/json"
+            assert response.json()["items"][0]["brand"] == "fiat"
+
+            response = await client.post("/accounts/")
+            assert response.status_code == HTTPStatus.CREATED
+            assert response.json() == {"id": 1, "username": "john"}
+
+            response = await client.get("/raw/")
+            assert response.content == b"raw"
+
+    def test_route_keeps_response_model_in_openapi(self):
+        schema = build_app().openapi()
+        assert "Account" in schema["components"]["schemas"]
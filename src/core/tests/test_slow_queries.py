@@ -0,0 +1,142 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy import create_engine, text
+
+from src.config.database.setup import track_queries
+from src.config.database.slow_queries import (
+    SlowQueryRecorder,
+    is_explainable,
+    parameter_shape,
+    route_name,
+)
+from src.core.middlewares.authentication_middleware import create_token
+from src.core.middlewares.query_stats_middleware import QueryStatsMiddleware
+from src.main import app
+
+sqlite_engine = create_engine("sqlite://")
+track_queries(sqlite_engine)
+
+
+def build_recorder(**options) -> SlowQueryRecorder:
+    options = {"threshold_ms": 100, "explain_rate": 0, "buffer_size": 3, **options}
+    return SlowQueryRecorder(**options)
+
+
+def observe(recorder: SlowQueryRecorder, statement: str, duration: float, **options):
+    recorder.observe(sqlite_engine, statement, (1, "a"), False, duration, **options)
+
+
+class TestSlowQueryRecorder:
+    def test_parameter_shape(self):
+        assert parameter_shape((1, "john", None, [1, 2])) == [
+            "int",
+            "str",
+            "null",
+            "list[2]",
+        ]
+        assert parameter_shape({"id": 1}) == {"id": "int"}
+        assert parameter_shape([(1, "a"), (2, "b")], executemany=True) == {
+            "rows": 2,
+            "row": ["int", "str"],
+        }
+
+    def test_only_reads_are_explained(self):
+        assert is_explainable("  select * from orders")
+        assert not is_explainable("WITH inserted AS (INSERT ...) SELECT count(*)")
+        assert not is_explainable("DELETE FROM vehicle")
+        assert not is_explainable("SELECT * FROM orders WHERE id = $1 FOR UPDATE")
+        assert not is_explainable("select id from orders for no key update of orders")
+        assert not is_explainable("SELECT * FROM orders FOR KEY SHARE SKIP LOCKED")
+        assert not is_explainable("SELECT pg_advisory_xact_lock($1, $2)")
+        assert not is_explainable("SELECT pg_try_advisory_lock(1)")
+        assert is_explainable("SELECT * FROM orders ORDER BY updated_for")
+
+    def test_disabled_without_threshold(self):
+        recorder = build_recorder(threshold_ms=0)
+        observe(recorder, "SELECT 1", 10)
+
+        assert not recorder.enabled
+        assert not recorder.entries
+
+    def test_keeps_the_latest_slow_statements(self):
+        recorder = build_recorder()
+        observe(recorder, "SELECT fast", 0.01)
+        for n in range(4):
+            observe(recorder, f"SELECT {n}", 0.2)
+
+        assert [entry.statement for entry in recorder.entries] == [
+            "SELECT 1",
+            "SELECT 2",
+            "SELECT 3",
+        ]
+        assert recorder.entries[0].parameters == ["int", "str"]
+
+    def test_worst_offenders_are_grouped_by_statement(self):
+        recorder = build_recorder(buffer_size=10)
+        observe(recorder, "SELECT orders", 0.2)
+        observe(recorder, "SELECT orders", 0.3)
+        observe(recorder, "SELECT customers", 0.4)
+
+        offenders = recorder.offenders(limit=10)
+
+        assert [offender.statement for offender in offenders] == [
+            "SELECT orders",
+            "SELECT customers",
+        ]
+        assert offenders[0].count == 2
+        assert offenders[0].total_duration_ms == 500
+        assert offenders[0].max_duration_ms == 300
+        assert recorder.offenders(limit=1) == offenders[:1]
+
+    def test_writes_a_json_line_per_slow_statement(self, tmp_path):
+        log_path = tmp_path / "slow_queries.log"
+        recorder = build_recorder(log_path=str(log_path))
+        observe(recorder, "SELECT orders", 0.2)
+        recorder.close()
+
+        entry = json.loads(log_path.read_text().splitlines()[0])
+        assert entry["statement"] == "SELECT orders"
+        assert entry["duration_ms"] == 200
+        assert entry["plan"] is None
+
+    @pytest.mark.asyncio
+    async def test_attributes_statements_to_the_route_template(self, monkeypatch):
+        recorder = build_recorder(threshold_ms=0.000001)
+        monkeypatch.setattr("src.config.database.setup.slow_query_recorder", recorder)
+
+        route_app = FastAPI()
+
+        @route_app.get("/orders/{order_id}/")
+        async def get_order(order_id: int):
+            with sqlite_engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+            return {}
+
+        route_app.add_middleware(QueryStatsMiddleware)
+        async with AsyncClient(app=route_app, base_url="http://test") as client:
+            await client.get("/orders/1/")
+
+        assert recorder.entries[0].route == "GET /orders/{order_id}/"
+
+    def test_route_name_without_a_matched_route(self):
+        scope = {"type": "http", "method": "GET", "path": "/missing/", "app": app}
+        assert route_name(scope) == "GET /missing/"
+        assert route_name(None) is None
+
+    @pytest.mark.asyncio
+    async def test_offenders_endpoint_requires_an_admin(self, admin_role):
+        token = await create_token(1, "admin@email.com", admin_role)
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.get("/api/healthcheck/slow-queries/")
+            assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+            response = await client.get(
+                "/api/healthcheck/slow-queries/",
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            assert response.status_code == HTTPStatus.OK
+            assert response.json()["data"]["offenders"] == []
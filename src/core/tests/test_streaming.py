@@ -0,0 +1,55 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from src.core.streaming import ExportFormat, export_response
+from src.orders.schemas import OrderResponse
+
+
+async def order_batches():
+    order = {
+        "id": 1,
+        "customer_id": 1,
+        "customer_vehicle_ids": [1, 2],
+        "service_ids": [1],
+        "employee_ids": None,
+        "start_date": datetime(2023, 7, 28, 10),
+        "estimated_time": datetime(2023, 7, 28, 11),
+        "status": "REQUESTED",
+    }
+    yield [order, {**order, "id": 2}]
+    yield [{**order, "id": 3}]
+
+
+async def read_body(response) -> str:
+    chunks = [chunk async for chunk in response.body_iterator]
+    assert len(chunks) == 2
+    return b"".join(chunks).decode()
+
+
+class TestExportResponse:
+    @pytest.mark.asyncio
+    async def test_ndjson_export(self):
+        response = export_response(
+            order_batches(), OrderResponse, ExportFormat.NDJSON, "orders"
+        )
+        assert response.media_type == "application/x-ndjson"
+
+        lines = (await read_body(response)).splitlines()
+        assert [json.loads(line)["id"] for line in lines] == [1, 2, 3]
+        assert json.loads(lines[0])["customer_vehicle_ids"] == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_csv_export(self):
+        response = export_response(
+            order_batches(), OrderResponse, ExportFormat.CSV, "orders"
+        )
+        assert response.headers["content-disposition"] == (
+            'attachment; filename="orders.csv"'
+        )
+
+        lines = (await read_body(response)).splitlines()
+        assert lines[0] == ",".join(OrderResponse.__fields__)
+        assert lines[1].startswith('1,1,"[1, 2]",[1],,2023-07-28T10:00:00,')
+        assert len(lines) == 4
@@ -0,0 +1,56 @@
+from time import time
+
+import pytest
+
+from src.core.cache import TTLCache
+from src.core.exceptions import Unauthorized
+from src.core.middlewares.authentication_middleware import (
+    create_token,
+    token_cache,
+    validate_token,
+)
+
+
+class TestTokenCache:
+    @pytest.mark.asyncio
+    async def test_validate_token_is_served_from_cache(self, admin_role):
+        token_cache.clear()
+        token = await create_token(1, "alex.doe@email.com", admin_role)
+
+        first_user = await validate_token(token)
+        hits = token_cache.hits
+        second_user = await validate_token(token)
+
+        assert token_cache.hits == hits + 1
+        assert second_user.id == first_user.id == 1
+        assert second_user.role == admin_role
+
+    @pytest.mark.asyncio
+    async def test_invalid_token_is_not_cached(self):
+        token_cache.clear()
+        with pytest.raises(Unauthorized):
+            await validate_token("fake_token")
+
+        assert len(token_cache) == 0
+
+    def test_entries_are_evicted_at_expiration(self):
+        cache = TTLCache(max_size=10)
+        cache.set("expired", "value", expires_at=time() - 1)
+        cache.set("valid", "value", expires_at=time() + 60)
+
+        assert cache.get("expired") is None
+        assert cache.get("valid") == "value"
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = TTLCache(max_size=2)
+        cache.set("first", 1)
+        cache.set("second", 2)
+        cache.get("first")
+        cache.set("third", 3)
+
+        assert cache.get("second") is None
+        assert cache.get("first") == 1
+        assert cache.get("third") == 3
+        assert cache.evictions == 1
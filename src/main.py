@@ -1,12 +1,24 @@
 import json
+import logging
 from os import getenv
 
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 
-from src.config.database.setup import get_db_session
+from src.config.database.slow_queries import slow_query_recorder
 from src.core.api import api_router
+from src.core.error_reporting import drop_duplicate_reports
+from src.core.healthcheck import metrics_router
+from src.core.loop_monitor import LOOP_MONITOR_ENABLED, loop_monitor
+from src.core.metrics import METRICS_ENABLED, start_metrics_flush, stop_metrics_flush
+from src.core.middlewares.authentication_middleware import (
+    AuthenticationMiddleware,
+    document_bearer_auth,
+)
 from src.core.middlewares.exceptions_handler import error_handler_middleware
+from src.core.middlewares.metrics_middleware import MetricsMiddleware
+from src.core.middlewares.profiling_middleware import ProfilingMiddleware
+from src.core.middlewares.query_stats_middleware import QueryStatsMiddleware
 
 app = FastAPI()
 
@@ -16,6 +28,11 @@ async def validation_exception_handler(request, e):
     return await error_handler_middleware(request, e)
 
 
+@app.exception_handler(Exception)
+async def unhandled_exception_handler(request, e):
+    return await error_handler_middleware(request, e)
+
+
 ENVIRONMENT = getenv("ENV", None)
 
 if ENVIRONMENT in ["production", "staging"]:
@@ -29,8 +46,17 @@ if ENVIRONMENT in ["production", "staging"]:
         sentry_sdk.init(
             dsn=sentry_dsn,
             traces_sample_rate=float(SAMPLE_RATE),
+            before_send=drop_duplicate_reports,
         )
 
+if ENVIRONMENT == "development":
+    src_logger = logging.getLogger("src")
+    src_logger.setLevel(logging.INFO)
+    src_logger.addHandler(logging.StreamHandler())
+
+
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(AuthenticationMiddleware)
 
 origins = json.loads(getenv("CORS_ORIGINS"))
 app.add_middleware(
@@ -40,6 +66,21 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(QueryStatsMiddleware)
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+
+app.include_router(api_router)
+if METRICS_ENABLED:
+    app.include_router(metrics_router)
+document_bearer_auth(app)
 
+if METRICS_ENABLED:
+    app.add_event_handler("startup", start_metrics_flush)
+    app.add_event_handler("shutdown", stop_metrics_flush)
+app.add_event_handler("shutdown", slow_query_recorder.close)
 
-app.include_router(api_router, dependencies=[Depends(get_db_session)])
+if LOOP_MONITOR_ENABLED:
+    app.add_event_handler("startup", loop_monitor.start)
+    app.add_event_handler("shutdown", loop_monitor.stop)
@@ -25,3 +25,11 @@ class OrderStatusNotFoundException(HTTPException):
             status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
             detail=f"Problem occurred when trying to load orders status",
         )
+
+
+class OrderReferenceNotFoundException(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail="Customer, vehicle, service or employee not found for given order",
+        )
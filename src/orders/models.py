@@ -1,8 +1,7 @@
 from datetime import datetime
 
-from sqlalchemy import Column, Integer
-from sqlalchemy.dialects import postgresql
-from sqlmodel import Field
+from sqlalchemy import Column, ForeignKey, Index, Integer
+from sqlmodel import Field, SQLModel
 
 from src.core.models import TimestampMixin
 
@@ -10,15 +9,55 @@ from src.core.models import TimestampMixin
 class Order(TimestampMixin, table=True):
     id: int | None = Field(nullable=False, default=None, primary_key=True, index=True)
     customer_id: int = Field(nullable=False, foreign_key="customer.id")
-    customer_vehicle_ids: list[int] = Field(
-        nullable=False, sa_column=Column(postgresql.ARRAY(Integer()))
+    start_date: datetime = Field(default=None, index=True)
+    estimated_time: datetime = Field(nullable=False, index=True)
+    status: str = Field(nullable=False, default="REQUESTED")
+
+
+# Leads with customer_id, so it also serves the customer foreign key.
+Index(
+    "ix_order_definition",
+    Order.customer_id,
+    Order.start_date,
+    Order.estimated_time,
+    Order.status,
+)
+Index("ix_order_status_start_date", Order.status, Order.start_date)
+
+
+def order_reference(target: str) -> Column:
+    return Column(Integer, ForeignKey(target, ondelete="CASCADE"), primary_key=True)
+
+
+# Each association is keyed by (order_id, <reference>) for loading an order's
+# references, and indexed the other way round so "orders for X" is an
+# index-only scan already sorted by order id.
+class OrderVehicle(SQLModel, table=True):
+    __tablename__ = "order_vehicle"
+    __table_args__ = (
+        Index(
+            "ix_order_vehicle_customer_vehicle_id_order_id",
+            "customer_vehicle_id",
+            "order_id",
+        ),
     )
-    service_ids: list[int] = Field(
-        nullable=False, sa_column=Column(postgresql.ARRAY(Integer()))
+    order_id: int = Field(sa_column=order_reference("order.id"))
+    customer_vehicle_id: int = Field(sa_column=order_reference("customer_vehicle.id"))
+
+
+class OrderService(SQLModel, table=True):
+    __tablename__ = "order_service"
+    __table_args__ = (
+        Index("ix_order_service_service_id_order_id", "service_id", "order_id"),
     )
-    employee_ids: list[int] | None = Field(
-        default=None, sa_column=Column(postgresql.ARRAY(Integer()))
+    order_id: int = Field(sa_column=order_reference("order.id"))
+    service_id: int = Field(sa_column=order_reference("service.id"))
+
+
+class OrderEmployee(SQLModel, table=True):
+    __tablename__ = "order_employee"
+    __table_args__ = (
+        Index("ix_order_employee_employee_id_order_id", "employee_id", "order_id"),
     )
-    start_date: datetime = Field(default=None)
-    estimated_time: datetime = Field(nullable=False)
-    status: str = Field(nullable=False, default="REQUESTED")
+    order_id: int = Field(sa_column=order_reference("order.id"))
+    employee_id: int = Field(sa_column=order_reference("employee.id"))
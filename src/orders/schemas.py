@@ -1,8 +1,19 @@
 from datetime import datetime
+from enum import Enum
 
 from pydantic import BaseModel
 
 
+class OrderRequest(BaseModel):
+    customer_id: int
+    customer_vehicle_ids: list[int]
+    service_ids: list[int]
+    employee_ids: list[int] | None
+    start_date: datetime | None
+    estimated_time: datetime
+    status: str = "REQUESTED"
+
+
 class OrderResponse(BaseModel):
     id: int
     customer_id: int
@@ -12,3 +23,25 @@ class OrderResponse(BaseModel):
     start_date: datetime
     estimated_time: datetime
     status: str
+
+
+class OrderFilters(BaseModel):
+    status: str | None = None
+    customer_id: int | None = None
+    start_date_from: datetime | None = None
+    start_date_to: datetime | None = None
+    estimated_time_from: datetime | None = None
+    estimated_time_to: datetime | None = None
+
+
+class OrderSort(str, Enum):
+    ID = "id"
+    ID_DESC = "-id"
+    START_DATE = "start_date"
+    START_DATE_DESC = "-start_date"
+    ESTIMATED_TIME = "estimated_time"
+    ESTIMATED_TIME_DESC = "-estimated_time"
+    STATUS = "status"
+    STATUS_DESC = "-status"
+    CUSTOMER_ID = "customer_id"
+    CUSTOMER_ID_DESC = "-customer_id"
@@ -1,19 +1,54 @@
 from datetime import datetime
 from os import getenv
+from typing import Any, AsyncIterator, Callable
 
 from dotenv import load_dotenv
+from sqlalchemy import Integer, delete, func, literal_column, null, update
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.sql import Select
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from src.config.database.setup import unit_of_work
+from src.core.conditional import Revision, latest, make_etag
+from src.core.fieldsets import Fields, load_fields, sparse_page, sparse_schema
+from src.core.pagination import (
+    DEFAULT_PAGE_SIZE,
+    Page,
+    build_page,
+    paginate,
+    paginate_sorted,
+)
 from src.orders.exceptions import (
     OrderAlreadyExistsException,
+    OrderReferenceNotFoundException,
     OrderStatusNotFoundException,
     OrderNotFoundException,
 )
-from src.orders.models import Order
+from src.orders.models import Order, OrderEmployee, OrderService, OrderVehicle
+from src.orders.schemas import OrderFilters, OrderResponse, OrderSort
 
 load_dotenv("src/config/.env")
 
+# First key of the transaction-level advisory lock taken while creating an
+# order; the second key is the customer id.
+ORDER_CREATION_LOCK = 1
+
+ORDER_REFERENCES = (
+    ("customer_vehicle_ids", OrderVehicle, "customer_vehicle_id"),
+    ("service_ids", OrderService, "service_id"),
+    ("employee_ids", OrderEmployee, "employee_id"),
+)
+
+# Whitelist of columns clients may sort by; each one is backed by an index.
+ORDER_SORT_COLUMNS = {
+    "start_date": Order.start_date,
+    "estimated_time": Order.estimated_time,
+    "status": Order.status,
+    "customer_id": Order.customer_id,
+}
+
 
 def get_orders_status_values() -> list[str]:
     status_list = getenv("ORDER_STATUS", None)
@@ -22,9 +57,172 @@ def get_orders_status_values() -> list[str]:
     return status_list.split(",")
 
 
-async def get_orders(db_session: AsyncSession) -> list[Order]:
-    result = await db_session.scalars(select(Order))
-    return result.all()
+def reference_ids(model, column_name: str):
+    column = getattr(model, column_name)
+    return (
+        select(
+            func.coalesce(
+                func.array_agg(aggregate_order_by(column, column)),
+                literal_column("'{}'::integer[]"),
+                type_=ARRAY(Integer),
+            )
+        )
+        .where(model.order_id == Order.id)
+        .correlate(Order)
+        .scalar_subquery()
+    )
+
+
+def select_orders(fields: Fields = None, *required: str) -> Select:
+    """Selects orders with their reference arrays, in ``ORDER_REFERENCES`` order.
+
+    With ``fields``, only those columns and arrays are read (plus ``required``
+    columns); the other arrays come back as NULL.
+    """
+    return select(
+        Order,
+        *(
+            (
+                reference_ids(model, column_name)
+                if fields is None or field in fields
+                else null()
+            ).label(field)
+            for field, model, column_name in ORDER_REFERENCES
+        ),
+    ).options(*load_fields(Order, fields, "id", "updated_at", *required))
+
+
+def order_response(
+    order: Order,
+    customer_vehicle_ids: list[int] | None,
+    service_ids: list[int] | None,
+    employee_ids: list[int] | None,
+    fields: Fields = None,
+) -> OrderResponse:
+    references = {
+        "customer_vehicle_ids": customer_vehicle_ids,
+        "service_ids": service_ids,
+        "employee_ids": employee_ids,
+    }
+    return sparse_schema(OrderResponse, fields).construct(
+        **{
+            field: references[field] if field in references else getattr(order, field)
+            for field in fields or OrderResponse.__fields__
+        }
+    )
+
+
+def filter_orders(query: Select, filters: OrderFilters | None) -> Select:
+    if filters is None:
+        return query
+
+    conditions = []
+    if filters.status is not None:
+        conditions.append(Order.status == filters.status)
+    if filters.customer_id is not None:
+        conditions.append(Order.customer_id == filters.customer_id)
+    if filters.start_date_from is not None:
+        conditions.append(Order.start_date >= filters.start_date_from)
+    if filters.start_date_to is not None:
+        conditions.append(Order.start_date <= filters.start_date_to)
+    if filters.estimated_time_from is not None:
+        conditions.append(Order.estimated_time >= filters.estimated_time_from)
+    if filters.estimated_time_to is not None:
+        conditions.append(Order.estimated_time <= filters.estimated_time_to)
+    return query.where(*conditions) if conditions else query
+
+
+def order_etag(order: Order, *references: list[int]) -> str:
+    return make_etag(order.id, order.updated_at, *references)
+
+
+async def get_orders_page(
+    query: Select,
+    db_session: AsyncSession,
+    limit: int,
+    key: Callable[[Order], Any] = lambda order: order.id,
+    fields: Fields = None,
+) -> Revision[Page[OrderResponse]]:
+    result = await db_session.execute(query)
+    page = build_page(result.all(), limit, key=lambda row: key(row[0]))
+    etag = make_etag(
+        fields, page.next_cursor, *(order_etag(*row) for row in page.items)
+    )
+    last_modified = latest(row[0].updated_at for row in page.items)
+    page = sparse_page(OrderResponse, fields).construct(
+        items=[order_response(*row, fields=fields) for row in page.items],
+        next_cursor=page.next_cursor,
+    )
+    return Revision(value=page, etag=etag, last_modified=last_modified)
+
+
+async def get_orders(
+    db_session: AsyncSession,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    filters: OrderFilters | None = None,
+    sort: OrderSort = OrderSort.ID,
+    fields: Fields = None,
+) -> Revision[Page[OrderResponse]]:
+    descending = sort.value.startswith("-")
+    sort_field = sort.value.lstrip("-")
+    query = filter_orders(select_orders(fields, sort_field), filters)
+
+    if sort_field == "id":
+        query = paginate(query, Order.id, cursor, limit, descending)
+        return await get_orders_page(query, db_session, limit, fields=fields)
+
+    sort_column = ORDER_SORT_COLUMNS[sort_field]
+    query = paginate_sorted(query, sort_column, Order.id, cursor, limit, descending)
+    return await get_orders_page(
+        query,
+        db_session,
+        limit,
+        key=lambda order: [getattr(order, sort_field), order.id],
+        fields=fields,
+    )
+
+
+async def get_orders_by_vehicle(
+    customer_vehicle_id: int,
+    db_session: AsyncSession,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    fields: Fields = None,
+) -> Revision[Page[OrderResponse]]:
+    query = (
+        select_orders(fields)
+        .join(OrderVehicle, OrderVehicle.order_id == Order.id)
+        .where(OrderVehicle.customer_vehicle_id == customer_vehicle_id)
+    )
+    query = paginate(query, OrderVehicle.order_id, cursor, limit)
+    return await get_orders_page(query, db_session, limit, fields=fields)
+
+
+async def get_orders_by_employee(
+    employee_id: int,
+    db_session: AsyncSession,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    fields: Fields = None,
+) -> Revision[Page[OrderResponse]]:
+    query = (
+        select_orders(fields)
+        .join(OrderEmployee, OrderEmployee.order_id == Order.id)
+        .where(OrderEmployee.employee_id == employee_id)
+    )
+    query = paginate(query, OrderEmployee.order_id, cursor, limit)
+    return await get_orders_page(query, db_session, limit, fields=fields)
+
+
+async def stream_orders(
+    db_session: AsyncSession, batch_size: int
+) -> AsyncIterator[list[OrderResponse]]:
+    result = await db_session.stream(
+        select_orders().order_by(Order.id).execution_options(yield_per=batch_size)
+    )
+    async for rows in result.partitions(batch_size):
+        yield [order_response(*row) for row in rows]
 
 
 async def get_order(
@@ -36,25 +234,65 @@ async def get_order(
     estimated_time: datetime,
     status: str,
     db_session: AsyncSession,
-) -> Order:
+) -> Order | None:
+    references = {
+        "customer_vehicle_ids": customer_vehicle_ids,
+        "service_ids": service_ids,
+        "employee_ids": employee_ids,
+    }
     result = await db_session.execute(
-        select(Order)
-        .where(
+        select(Order).where(
             Order.customer_id == customer_id,
             Order.start_date == start_date,
             Order.estimated_time == estimated_time,
             Order.status == status,
+            *(
+                reference_ids(model, column_name)
+                == sorted(set(references[field] or []))
+                for field, model, column_name in ORDER_REFERENCES
+            ),
         )
-        .filter(Order.customer_vehicle_ids.contains(customer_vehicle_ids))
-        .filter(Order.service_ids.contains(service_ids))
-        .filter(Order.employee_ids.contains(employee_ids))
     )
-    return result.scalar_one_or_none()
+    return result.scalars().first()
 
 
-async def get_order_by_id(order_id: int, db_session: AsyncSession) -> Order | None:
-    result = await db_session.execute(select(Order).where(Order.id == order_id))
-    return result.scalar_one_or_none()
+async def get_order_revision(
+    order_id: int, db_session: AsyncSession
+) -> Revision[OrderResponse]:
+    result = await db_session.execute(select_orders().where(Order.id == order_id))
+    row = result.one_or_none()
+    if row is None:
+        raise OrderNotFoundException()
+    return Revision(
+        value=order_response(*row),
+        etag=order_etag(*row),
+        last_modified=row[0].updated_at,
+    )
+
+
+async def insert_order_references(
+    order_id: int,
+    customer_vehicle_ids: list[int],
+    service_ids: list[int],
+    employee_ids: list[int] | None,
+    db_session: AsyncSession,
+) -> dict[str, list[int]]:
+    references = {
+        "customer_vehicle_ids": sorted(set(customer_vehicle_ids)),
+        "service_ids": sorted(set(service_ids)),
+        "employee_ids": sorted(set(employee_ids or [])),
+    }
+    for field, model, column_name in ORDER_REFERENCES:
+        if references[field]:
+            await db_session.execute(
+                insert(model).values(
+                    [
+                        {"order_id": order_id, column_name: reference_id}
+                        for reference_id in references[field]
+                    ]
+                )
+            )
+    return references
 
 
 async def create_order(
@@ -66,34 +304,45 @@ async def create_order(
     estimated_time: datetime,
     status: str,
     db_session: AsyncSession,
-) -> Order:
-    registered_order = await get_order(
-        customer_id=customer_id,
-        customer_vehicle_ids=customer_vehicle_ids,
-        service_ids=service_ids,
-        employee_ids=employee_ids,
-        start_date=start_date,
-        estimated_time=estimated_time,
-        status=status,
-        db_session=db_session,
-    )
-    if registered_order is not None:
-        raise OrderAlreadyExistsException(registered_order.id)
-
-    order = Order(
-        customer_id=customer_id,
-        customer_vehicle_ids=customer_vehicle_ids,
-        service_ids=service_ids,
-        employee_ids=employee_ids,
-        start_date=start_date,
-        estimated_time=estimated_time,
-        status=status,
-    )
+) -> OrderResponse:
+    async with unit_of_work(db_session):
+        # Serializes concurrent creations for the same customer, so two
+        # identical requests cannot both pass the duplicate check below.
+        await db_session.execute(
+            select(func.pg_advisory_xact_lock(ORDER_CREATION_LOCK, customer_id))
+        )
+        registered_order = await get_order(
+            customer_id=customer_id,
+            customer_vehicle_ids=customer_vehicle_ids,
+            service_ids=service_ids,
+            employee_ids=employee_ids,
+            start_date=start_date,
+            estimated_time=estimated_time,
+            status=status,
+            db_session=db_session,
+        )
+        if registered_order is not None:
+            raise OrderAlreadyExistsException(registered_order.id)
 
-    db_session.add(order)
-    await db_session.commit()
-    await db_session.refresh(order)
-    return order
+        order = Order(
+            customer_id=customer_id,
+            start_date=start_date,
+            estimated_time=estimated_time,
+            status=status,
+        )
+        db_session.add(order)
+        try:
+            await db_session.flush()
+            references = await insert_order_references(
+                order_id=order.id,
+                customer_vehicle_ids=customer_vehicle_ids,
+                service_ids=service_ids,
+                employee_ids=employee_ids,
+                db_session=db_session,
+            )
+        except IntegrityError:
+            raise OrderReferenceNotFoundException()
+    return order_response(order, **references)
 
 
 async def update_order(
@@ -106,30 +355,49 @@ async def update_order(
     estimated_time: datetime,
     status: str,
     db_session: AsyncSession,
-) -> Order:
-    result = await db_session.execute(select(Order).where(Order.id == order_id))
-    order = result.scalar_one_or_none()
-    if order is None:
-        raise OrderNotFoundException()
+) -> OrderResponse:
+    statement = (
+        update(Order)
+        .where(Order.id == order_id)
+        .values(
+            customer_id=customer_id,
+            start_date=start_date,
+            estimated_time=estimated_time,
+            status=status,
+        )
+        .returning(*Order.__table__.c)
+    )
+    async with unit_of_work(db_session):
+        try:
+            result = await db_session.execute(
+                select(Order)
+                .from_statement(statement)
+                .execution_options(populate_existing=True)
+            )
+            order = result.scalar_one_or_none()
+            if order is None:
+                raise OrderNotFoundException()
 
-    order.customer_id = customer_id
-    order.customer_vehicle_ids = customer_vehicle_ids
-    order.service_ids = service_ids
-    order.employee_ids = employee_ids
-    order.start_date = start_date
-    order.estimated_time = estimated_time
-    order.status = status
-    db_session.add(order)
-    await db_session.commit()
-    await db_session.refresh(order)
-    return order
+            for _, model, _ in ORDER_REFERENCES:
+                await db_session.execute(
+                    delete(model).where(model.order_id == order_id)
+                )
+            references = await insert_order_references(
+                order_id=order_id,
+                customer_vehicle_ids=customer_vehicle_ids,
+                service_ids=service_ids,
+                employee_ids=employee_ids,
+                db_session=db_session,
+            )
+        except IntegrityError:
+            raise OrderReferenceNotFoundException()
+    return order_response(order, **references)
 
 
 async def delete_order(order_id: int, db_session: AsyncSession):
-    result = await db_session.execute(select(Order).where(Order.id == order_id))
-    service = result.scalar_one_or_none()
-    if service is None:
-        raise OrderNotFoundException()
-
-    await db_session.delete(service)
-    await db_session.commit()
+    async with unit_of_work(db_session):
+        result = await db_session.execute(
+            delete(Order).where(Order.id == order_id).returning(Order.id)
+        )
+        if result.scalar_one_or_none() is None:
+            raise OrderNotFoundException()
@@ -4,8 +4,9 @@ from http import HTTPStatus
 import pytest
 from sqlmodel import select
 
-from src.orders.models import Order
+from src.orders.models import Order, OrderEmployee
 from src.orders.services import get_orders_status_values
+from src.users.service import create_employee
 
 
 class TestServicesEndpoint:
@@ -14,19 +15,129 @@ class TestServicesEndpoint:
     async def test_list_orders_successfully(self, client, order, order_payload):
         response = await client.get(url="/api/v1/orders/")
         assert response.status_code == HTTPStatus.OK
-        assert response.json() == [
-            {
-                "id": order_payload["id"],
-                "customer_id": order_payload["customer_id"],
-                "customer_vehicle_ids": order_payload["customer_vehicle_ids"],
-                "service_ids": order_payload["service_ids"],
-                "employee_ids": order_payload["employee_ids"],
-                "start_date": order_payload["start_date"].isoformat(),
-                "estimated_time": order_payload["estimated_time"].isoformat(),
+        assert response.json() == {
+            "items": [
+                {
+                    "id": order_payload["id"],
+                    "customer_id": order_payload["customer_id"],
+                    "customer_vehicle_ids": order_payload["customer_vehicle_ids"],
+                    "service_ids": order_payload["service_ids"],
+                    "employee_ids": order_payload["employee_ids"],
+                    "start_date": order_payload["start_date"].isoformat(),
+                    "estimated_time": order_payload["estimated_time"].isoformat(),
+                    "status": order_payload["status"],
+                },
+            ],
+            "next_cursor": None,
+        }
+
+    @pytest.mark.asyncio
+    async def test_list_orders_with_filters(self, client, order, order_payload):
+        response = await client.get(
+            url="/api/v1/orders/",
+            params={
                 "status": order_payload["status"],
+                "customer_id": order_payload["customer_id"],
+                "start_date_from": order_payload["start_date"].isoformat(),
             },
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert [item["id"] for item in response.json()["items"]] == [
+            order_payload["id"]
         ]
 
+        response = await client.get(
+            url="/api/v1/orders/",
+            params={
+                "estimated_time_to": order_payload["start_date"].isoformat(),
+            },
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {"items": [], "next_cursor": None}
+
+    @pytest.mark.asyncio
+    async def test_list_orders_sorted(self, client, order, order_payload):
+        response = await client.get(
+            url="/api/v1/orders/", params={"sort": "-start_date", "limit": 1}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()["items"][0]["id"] == order_payload["id"]
+        assert response.json()["next_cursor"] is None
+
+        response = await client.get(
+            url="/api/v1/orders/", params={"sort": "hashed_password"}
+        )
+        assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+    @pytest.mark.asyncio
+    async def test_list_orders_with_fields(self, client, order, order_payload):
+        response = await client.get(
+            url="/api/v1/orders/",
+            params={"fields": "status,service_ids", "sort": "-start_date"},
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {
+            "items": [
+                {
+                    "service_ids": order_payload["service_ids"],
+                    "status": order_payload["status"],
+                }
+            ],
+            "next_cursor": None,
+        }
+        etag = response.headers["etag"]
+
+        response = await client.get(
+            url="/api/v1/orders/", params={"sort": "-start_date"}
+        )
+        assert response.headers["etag"] != etag
+
+        response = await client.get(url="/api/v1/orders/", params={"fields": ""})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    @pytest.mark.asyncio
+    async def test_list_orders_for_vehicle(self, client, order, order_payload):
+        customer_vehicle_id = order_payload["customer_vehicle_ids"][0]
+        response = await client.get(
+            url=f"/api/v1/orders/vehicle/{customer_vehicle_id}/"
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert [item["id"] for item in response.json()["items"]] == [
+            order_payload["id"]
+        ]
+
+        response = await client.get(url="/api/v1/orders/vehicle/999/")
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {"items": [], "next_cursor": None}
+
+    @pytest.mark.asyncio
+    async def test_list_orders_for_employee(
+        self, client, order, order_payload, db_session
+    ):
+        employee = await create_employee("jane.doe@email.com", "test000", db_session)
+        db_session.add(OrderEmployee(order_id=order.id, employee_id=employee.id))
+        await db_session.commit()
+
+        response = await client.get(url=f"/api/v1/orders/employee/{employee.id}/")
+        assert response.status_code == HTTPStatus.OK
+        items = response.json()["items"]
+        assert [item["id"] for item in items] == [order_payload["id"]]
+        assert items[0]["employee_ids"] == [employee.id]
+
+    @pytest.mark.asyncio
+    async def test_export_orders_as_ndjson(
+        self, client, order, order_payload, admin_token
+    ):
+        test_token = await admin_token()
+        headers = {"Authorization": f"Bearer {test_token}"}
+        response = await client.get(url="/api/v1/orders/export/", headers=headers)
+        assert response.status_code == HTTPStatus.OK
+        assert response.headers["content-type"] == "application/x-ndjson"
+
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["id"] for row in rows] == [order_payload["id"]]
+        assert rows[0]["service_ids"] == order_payload["service_ids"]
+
     @pytest.mark.asyncio
     async def test_get_order_by_id_successfully(self, client, order, order_payload):
         response = await client.get(url=f"/api/v1/orders/{order_payload['id']}/")
@@ -42,16 +153,42 @@ class TestServicesEndpoint:
             "status": order_payload["status"],
         }
 
+    @pytest.mark.asyncio
+    async def test_get_order_revalidation(self, client, order, order_payload):
+        url = f"/api/v1/orders/{order_payload['id']}/"
+        response = await client.get(url=url)
+        etag = response.headers["etag"]
+        last_modified = response.headers["last-modified"]
+
+        response = await client.get(url=url, headers={"If-None-Match": etag})
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        response = await client.get(
+            url=url, headers={"If-Modified-Since": last_modified}
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        response = await client.get(url="/api/v1/orders/")
+        list_etag = response.headers["etag"]
+        response = await client.get(
+            url="/api/v1/orders/", headers={"If-None-Match": list_etag}
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    @pytest.mark.asyncio
+    async def test_get_nonexistent_order(self, client):
+        response = await client.get(url="/api/v1/orders/999/")
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
     @pytest.mark.asyncio
     @pytest.mark.freeze_time("2023-07-28")
     async def test_create_order_successfully(
-        self, client, order_payload, customer, admin_token
+        self, client, order_payload, service, customer_vehicle, admin_token
     ):
         test_token = await admin_token()
-        test_customer = await customer()
         headers = {"Authorization": f"Bearer {test_token}"}
         updated_order_payload = order_payload.copy()
-        updated_order_payload["customer_id"] = test_customer.id
+        updated_order_payload["customer_id"] = customer_vehicle.customer_id
         updated_order_payload["start_date"] = order_payload["start_date"].isoformat()
         updated_order_payload["estimated_time"] = order_payload[
             "estimated_time"
@@ -63,7 +200,7 @@ class TestServicesEndpoint:
         assert response.status_code == HTTPStatus.CREATED
         assert response.json() == {
             "id": order_payload["id"],
-            "customer_id": test_customer.id,
+            "customer_id": customer_vehicle.customer_id,
             "customer_vehicle_ids": order_payload["customer_vehicle_ids"],
             "service_ids": order_payload["service_ids"],
             "employee_ids": order_payload["employee_ids"],
@@ -72,6 +209,26 @@ class TestServicesEndpoint:
             "status": order_payload["status"],
         }
 
+    @pytest.mark.asyncio
+    async def test_create_existent_order(
+        self, client, order, order_payload, admin_token
+    ):
+        test_token = await admin_token()
+        headers = {"Authorization": f"Bearer {test_token}"}
+        existent_order_payload = order_payload.copy()
+        existent_order_payload["start_date"] = order_payload["start_date"].isoformat()
+        existent_order_payload["estimated_time"] = order_payload[
+            "estimated_time"
+        ].isoformat()
+        payload = json.dumps(existent_order_payload)
+        response = await client.post(
+            url="/api/v1/orders/", data=payload, headers=headers
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == {
+            "detail": f"Service already exists with id {order_payload['id']}"
+        }
+
     @pytest.mark.asyncio
     async def test_create_order_with_unauthorized_user(
         self, client, order_payload, user_token
@@ -1,29 +1,103 @@
 from http import HTTPStatus
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Path, Header
+from fastapi import APIRouter, Depends, Path, Query, Request
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.config.database.setup import get_db_session
-from src.core.middlewares.authentication_middleware import check_authorization
-from src.orders.models import Order
-from src.orders.schemas import OrderResponse
+from src.core.conditional import render_json, revision_response
+from src.core.fieldsets import Fields, fields_query
+from src.core.middlewares.authentication_middleware import admin_required
+from src.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Page
+from src.core.responses import FastJSONRoute
+from src.core.streaming import (
+    EXPORT_BATCH_SIZE,
+    MAX_EXPORT_BATCH_SIZE,
+    ExportFormat,
+    export_response,
+)
+from src.orders.schemas import OrderFilters, OrderRequest, OrderResponse, OrderSort
 from src.orders.services import (
     get_orders,
-    get_order_by_id,
+    get_orders_by_employee,
+    get_orders_by_vehicle,
+    stream_orders,
+    get_order_revision,
     create_order,
     update_order,
     delete_order,
 )
 
-orders_v1_router = APIRouter(prefix="/v1/orders")
+orders_v1_router = APIRouter(prefix="/v1/orders", route_class=FastJSONRoute)
 
 
-@orders_v1_router.get("/", response_model=list[OrderResponse], summary="Get all Orders")
+@orders_v1_router.get("/", response_model=Page[OrderResponse], summary="Get all Orders")
 async def list_orders(
+    request: Request,
+    filters: OrderFilters = Depends(),
+    sort: OrderSort = OrderSort.ID,
+    cursor: str | None = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+    fields: Fields = Depends(fields_query(OrderResponse)),
+    db_session: AsyncSession = Depends(get_db_session),
+):
+    orders = await get_orders(db_session, cursor, limit, filters, sort, fields)
+    return revision_response(request, orders, render_json)
+
+
+@orders_v1_router.get("/export/", summary="Export all Orders")
+@admin_required
+async def export_orders(
+    export_format: Annotated[ExportFormat, Query(alias="format")] = ExportFormat.NDJSON,
+    batch_size: Annotated[
+        int, Query(ge=1, le=MAX_EXPORT_BATCH_SIZE)
+    ] = EXPORT_BATCH_SIZE,
+    db_session: AsyncSession = Depends(get_db_session),
+):
+    return export_response(
+        stream_orders(db_session, batch_size),
+        schema=OrderResponse,
+        export_format=export_format,
+        filename="orders",
+    )
+
+
+@orders_v1_router.get(
+    "/vehicle/{customer_vehicle_id}/",
+    response_model=Page[OrderResponse],
+    summary="Get all Orders for a customer vehicle",
+)
+async def list_vehicle_orders(
+    request: Request,
+    customer_vehicle_id: int,
+    cursor: str | None = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+    fields: Fields = Depends(fields_query(OrderResponse)),
+    db_session: AsyncSession = Depends(get_db_session),
+):
+    orders = await get_orders_by_vehicle(
+        customer_vehicle_id, db_session, cursor, limit, fields
+    )
+    return revision_response(request, orders, render_json)
+
+
+@orders_v1_router.get(
+    "/employee/{employee_id}/",
+    response_model=Page[OrderResponse],
+    summary="Get all Orders assigned to an employee",
+)
+async def list_employee_orders(
+    request: Request,
+    employee_id: int,
+    cursor: str | None = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+    fields: Fields = Depends(fields_query(OrderResponse)),
     db_session: AsyncSession = Depends(get_db_session),
 ):
-    return await get_orders(db_session)
+    orders = await get_orders_by_employee(
+        employee_id, db_session, cursor, limit, fields
+    )
+    return revision_response(request, orders, render_json)
 
 
 @orders_v1_router.get(
@@ -32,10 +106,12 @@ async def list_orders(
     summary="Get order details for a given id",
 )
 async def get_service(
+    request: Request,
     order_id: Annotated[int, Path(title="The ID of the order", ge=0, le=1000)],
     db_session: AsyncSession = Depends(get_db_session),
 ):
-    return await get_order_by_id(order_id, db_session)
+    order = await get_order_revision(order_id, db_session)
+    return revision_response(request, order, render_json)
 
 
 @orders_v1_router.post(
@@ -44,24 +120,22 @@ async def get_service(
     status_code=HTTPStatus.CREATED,
     summary="Create new order",
 )
+@admin_required
 async def post_order(
-    order: Order,
-    authorization: Annotated[str | None, Header()] = None,
+    order: OrderRequest,
     db_session: AsyncSession = Depends(get_db_session),
 ):
-    is_authorized = await check_authorization(authorization)
-    if is_authorized:
-        new_service = await create_order(
-            customer_id=order.customer_id,
-            customer_vehicle_ids=order.customer_vehicle_ids,
-            service_ids=order.service_ids,
-            employee_ids=order.employee_ids,
-            start_date=order.start_date,
-            estimated_time=order.estimated_time,
-            status=order.status,
-            db_session=db_session,
-        )
-        return new_service
+    new_service = await create_order(
+        customer_id=order.customer_id,
+        customer_vehicle_ids=order.customer_vehicle_ids,
+        service_ids=order.service_ids,
+        employee_ids=order.employee_ids,
+        start_date=order.start_date,
+        estimated_time=order.estimated_time,
+        status=order.status,
+        db_session=db_session,
+    )
+    return new_service
 
 
 @orders_v1_router.put(
@@ -70,26 +144,24 @@ async def post_order(
     status_code=HTTPStatus.OK,
     summary="Update an order",
 )
+@admin_required
 async def put_order(
     order_id: int,
-    order: Order,
-    authorization: Annotated[str | None, Header()] = None,
+    order: OrderRequest,
     db_session: AsyncSession = Depends(get_db_session),
 ):
-    is_authorized = await check_authorization(authorization)
-    if is_authorized:
-        updated_service = await update_order(
-            order_id=order_id,
-            customer_id=order.customer_id,
-            customer_vehicle_ids=order.customer_vehicle_ids,
-            service_ids=order.service_ids,
-            employee_ids=order.employee_ids,
-            start_date=order.start_date,
-            estimated_time=order.estimated_time,
-            status=order.status,
-            db_session=db_session,
-        )
-        return updated_service
+    updated_service = await update_order(
+        order_id=order_id,
+        customer_id=order.customer_id,
+        customer_vehicle_ids=order.customer_vehicle_ids,
+        service_ids=order.service_ids,
+        employee_ids=order.employee_ids,
+        start_date=order.start_date,
+        estimated_time=order.estimated_time,
+        status=order.status,
+        db_session=db_session,
+    )
+    return updated_service
 
 
 @orders_v1_router.delete(
@@ -97,11 +169,9 @@ async def put_order(
     status_code=HTTPStatus.OK,
     summary="Delete an order",
 )
+@admin_required
 async def del_order(
     order_id: int,
-    authorization: Annotated[str | None, Header()] = None,
     db_session: AsyncSession = Depends(get_db_session),
 ):
-    is_authorized = await check_authorization(authorization)
-    if is_authorized:
-        await delete_order(order_id=order_id, db_session=db_session)
+    await delete_order(order_id=order_id, db_session=db_session)
@@ -4,11 +4,11 @@ from fastapi import HTTPException
 
 
 class ServiceAlreadyExistsException(HTTPException):
-    def __init__(self, service_id):
-        super().__init__(
-            status_code=HTTPStatus.BAD_REQUEST,
-            detail=f"Service already exists with id {service_id}",
-        )
+    def __init__(self, service_id: int | None = None):
+        detail = "Service already exists"
+        if service_id is not None:
+            detail = f"{detail} with id {service_id}"
+        super().__init__(status_code=HTTPStatus.BAD_REQUEST, detail=detail)
 
 
 class ServiceNotFoundException(HTTPException):
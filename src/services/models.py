@@ -1,3 +1,4 @@
+from sqlalchemy import Index, func
 from sqlmodel import Field
 
 from src.core.models import TimestampMixin
@@ -11,3 +12,17 @@ class Service(TimestampMixin, table=True):
     image: str | None = Field(nullable=False, default=None)
     estimated_time: int = Field(nullable=False)
     category: str = Field(nullable=False, default="maintenance")
+
+
+# Descriptions and image URLs can exceed the btree row size limit, so the
+# unique index compares their hashes; inserts must use the same expressions
+# as their conflict target.
+SERVICE_UNIQUE_EXPRESSIONS = [
+    Service.__table__.c.name,
+    Service.__table__.c.price,
+    func.md5(Service.__table__.c.description),
+    func.md5(Service.__table__.c.image),
+    Service.__table__.c.estimated_time,
+    Service.__table__.c.category,
+]
+Index("uq_service_definition", *SERVICE_UNIQUE_EXPRESSIONS, unique=True)
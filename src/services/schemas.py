@@ -1,6 +1,15 @@
 from pydantic import BaseModel
 
 
+class ServiceRequest(BaseModel):
+    name: str
+    price: float
+    description: str
+    image: str
+    estimated_time: int
+    category: str = "maintenance"
+
+
 class ServiceResponse(BaseModel):
     id: int
     name: str
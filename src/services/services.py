@@ -1,16 +1,74 @@
+from sqlalchemy import delete, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from src.config.database.setup import replica_router, run_after_commit, unit_of_work
+from src.core.bulk import BulkItemResult, BulkStatus, insert_unique
+from src.core.cache import (
+    CATALOG_CACHE_SIZE,
+    CATALOG_CACHE_TTL,
+    CatalogCache,
+    register_cache,
+)
+from src.core.conditional import Revision, content_etag, latest
+from src.core.fieldsets import Fields, load_fields, sparse_page
+from src.core.pagination import DEFAULT_PAGE_SIZE, Page, build_page, paginate
+from src.core.responses import dump_json
 from src.services.exceptions import (
     ServiceAlreadyExistsException,
     ServiceNotFoundException,
 )
-from src.services.models import Service
+from src.services.models import SERVICE_UNIQUE_EXPRESSIONS, Service
+from src.services.schemas import ServiceRequest, ServiceResponse
+
+SERVICE_DEFINITION = (
+    "name",
+    "price",
+    "description",
+    "image",
+    "estimated_time",
+    "category",
+)
+
+service_catalog_cache = register_cache(
+    "service_catalog",
+    CatalogCache(max_size=CATALOG_CACHE_SIZE, ttl=CATALOG_CACHE_TTL),
+)
+
 
+async def get_services(
+    db_session: AsyncSession,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    fields: Fields = None,
+) -> Page[Service]:
+    query = select(Service).options(*load_fields(Service, fields, "id", "updated_at"))
+    result = await db_session.scalars(paginate(query, Service.id, cursor, limit))
+    return build_page(result.all(), limit, key=lambda service: service.id)
 
-async def get_services(db_session: AsyncSession) -> list[Service]:
-    result = await db_session.scalars(select(Service))
-    return result.all()
+
+async def get_services_revision(
+    db_session: AsyncSession,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    fields: Fields = None,
+) -> Revision[bytes]:
+    async def load() -> Revision[bytes]:
+        services = await get_services(db_session, cursor, limit, fields)
+        body = dump_json(sparse_page(ServiceResponse, fields), services)
+        return Revision(
+            value=body,
+            etag=content_etag(body),
+            last_modified=latest(service.updated_at for service in services.items),
+        )
+
+    return await service_catalog_cache.get_or_load(
+        ("list", cursor, limit, fields),
+        load,
+        max_staleness=replica_router.max_staleness(db_session),
+    )
 
 
 async def get_service(
@@ -42,6 +100,28 @@ async def get_service_by_id(
     return result.scalar_one_or_none()
 
 
+async def get_service_revision(
+    service_id: int, db_session: AsyncSession
+) -> Revision[bytes]:
+    async def load() -> Revision[bytes] | None:
+        service = await get_service_by_id(service_id, db_session)
+        if service is None:
+            return None
+        body = dump_json(ServiceResponse, service)
+        return Revision(
+            value=body, etag=content_etag(body), last_modified=service.updated_at
+        )
+
+    service = await service_catalog_cache.get_or_load(
+        ("item", service_id),
+        load,
+        max_staleness=replica_router.max_staleness(db_session),
+    )
+    if service is None:
+        raise ServiceNotFoundException()
+    return service
+
+
 async def create_service(
     name: str,
     price: float,
@@ -51,33 +131,57 @@ async def create_service(
     category: str,
     db_session: AsyncSession,
 ) -> Service:
-    registered_service = await get_service(
-        name=name,
-        price=price,
-        description=description,
-        image=image,
-        estimated_time=estimated_time,
-        category=category,
-        db_session=db_session,
-    )
-    if registered_service is not None:
-        raise ServiceAlreadyExistsException(registered_service.id)
-
-    service = Service(
-        name=name,
-        price=price,
-        description=description,
-        image=image,
-        estimated_time=estimated_time,
-        category=category,
+    statement = (
+        insert(Service)
+        .values(
+            name=name,
+            price=price,
+            description=description,
+            image=image,
+            estimated_time=estimated_time,
+            category=category,
+        )
+        .on_conflict_do_nothing(index_elements=SERVICE_UNIQUE_EXPRESSIONS)
+        .returning(*Service.__table__.c)
     )
-
-    db_session.add(service)
-    await db_session.commit()
-    await db_session.refresh(service)
+    async with unit_of_work(db_session):
+        result = await db_session.execute(select(Service).from_statement(statement))
+        service = result.scalar_one_or_none()
+        if service is None:
+            registered_service = await get_service(
+                name=name,
+                price=price,
+                description=description,
+                image=image,
+                estimated_time=estimated_time,
+                category=category,
+                db_session=db_session,
+            )
+            # The conflicting row may be invisible to this transaction or
+            # already deleted again; it still exists as far as the insert knows.
+            raise ServiceAlreadyExistsException(
+                registered_service.id if registered_service is not None else None
+            )
+        run_after_commit(db_session, service_catalog_cache.invalidate)
     return service
 
 
+async def create_services(
+    services: list[ServiceRequest], db_session: AsyncSession
+) -> list[BulkItemResult]:
+    async with unit_of_work(db_session):
+        results = await insert_unique(
+            Service,
+            index_elements=SERVICE_UNIQUE_EXPRESSIONS,
+            keys=SERVICE_DEFINITION,
+            rows=[service.dict() for service in services],
+            db_session=db_session,
+        )
+        if any(result.status == BulkStatus.CREATED for result in results):
+            run_after_commit(db_session, service_catalog_cache.invalidate)
+    return results
+
+
 async def update_service(
     service_id: int,
     name: str,
@@ -88,28 +192,41 @@ async def update_service(
     category: str,
     db_session: AsyncSession,
 ) -> Service:
-    result = await db_session.execute(select(Service).where(Service.id == service_id))
-    service = result.scalar_one_or_none()
-    if service is None:
-        raise ServiceNotFoundException()
-
-    service.name = name
-    service.price = price
-    service.description = description
-    service.image = image
-    service.estimated_time = estimated_time
-    service.category = category
-    db_session.add(service)
-    await db_session.commit()
-    await db_session.refresh(service)
+    statement = (
+        update(Service)
+        .where(Service.id == service_id)
+        .values(
+            name=name,
+            price=price,
+            description=description,
+            image=image,
+            estimated_time=estimated_time,
+            category=category,
+        )
+        .returning(*Service.__table__.c)
+    )
+    async with unit_of_work(db_session):
+        try:
+            result = await db_session.execute(
+                select(Service)
+                .from_statement(statement)
+                .execution_options(populate_existing=True)
+            )
+        except IntegrityError:
+            # Another service already has this definition.
+            raise ServiceAlreadyExistsException()
+        service = result.scalar_one_or_none()
+        if service is None:
+            raise ServiceNotFoundException()
+        run_after_commit(db_session, service_catalog_cache.invalidate)
     return service
 
 
 async def delete_service(service_id: int, db_session: AsyncSession):
-    result = await db_session.execute(select(Service).where(Service.id == service_id))
-    service = result.scalar_one_or_none()
-    if service is None:
-        raise ServiceNotFoundException()
-
-    await db_session.delete(service)
-    await db_session.commit()
+    async with unit_of_work(db_session):
+        result = await db_session.execute(
+            delete(Service).where(Service.id == service_id).returning(Service.id)
+        )
+        if result.scalar_one_or_none() is None:
+            raise ServiceNotFoundException()
+        run_after_commit(db_session, service_catalog_cache.invalidate)
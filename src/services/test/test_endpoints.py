@@ -12,17 +12,34 @@ class TestServicesEndpoint:
     async def test_list_services_successfully(self, client, service, service_payload):
         response = await client.get(url="/api/v1/services/")
         assert response.status_code == HTTPStatus.OK
-        assert response.json() == [
-            {
-                "id": service_payload["id"],
-                "name": service_payload["name"],
-                "price": service_payload["price"],
-                "description": service_payload["description"],
-                "image": service_payload["image"],
-                "estimated_time": service_payload["estimated_time"],
-                "category": service_payload["category"],
-            },
-        ]
+        assert response.json() == {
+            "items": [
+                {
+                    "id": service_payload["id"],
+                    "name": service_payload["name"],
+                    "price": service_payload["price"],
+                    "description": service_payload["description"],
+                    "image": service_payload["image"],
+                    "estimated_time": service_payload["estimated_time"],
+                    "category": service_payload["category"],
+                },
+            ],
+            "next_cursor": None,
+        }
+
+    @pytest.mark.asyncio
+    async def test_list_services_with_fields(self, client, service, service_payload):
+        response = await client.get(
+            url="/api/v1/services/", params={"fields": "id,name"}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {
+            "items": [{"id": service_payload["id"], "name": service_payload["name"]}],
+            "next_cursor": None,
+        }
+
+        response = await client.get(url="/api/v1/services/")
+        assert "description" in response.json()["items"][0]
 
     @pytest.mark.asyncio
     async def test_get_service_by_id_successfully(
@@ -61,6 +78,78 @@ class TestServicesEndpoint:
             "category": service_payload["category"],
         }
 
+    @pytest.mark.asyncio
+    async def test_create_service_with_a_long_description(
+        self, client, service_payload, admin_token
+    ):
+        test_token = await admin_token()
+        headers = {"Authorization": f"Bearer {test_token}"}
+        payload = {**service_payload, "description": "Drain motor oil. " * 1000}
+        response = await client.post(
+            url="/api/v1/services/", data=json.dumps(payload), headers=headers
+        )
+        assert response.status_code == HTTPStatus.CREATED
+
+        response = await client.post(
+            url="/api/v1/services/", data=json.dumps(payload), headers=headers
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    @pytest.mark.asyncio
+    async def test_create_services_in_bulk(
+        self, client, service, service_payload, admin_token
+    ):
+        test_token = await admin_token()
+        headers = {"Authorization": f"Bearer {test_token}"}
+        existing = {key: value for key, value in service_payload.items() if key != "id"}
+        new = {**existing, "name": "Tire rotation"}
+
+        response = await client.post(
+            url="/api/v1/services/bulk/", json=[existing, new], headers=headers
+        )
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert (data["created"], data["existing"]) == (1, 1)
+        assert data["items"][0]["id"] == service_payload["id"]
+        assert data["items"][1]["status"] == "created"
+
+        response = await client.get(url="/api/v1/services/", params={"fields": "name"})
+        assert [item["name"] for item in response.json()["items"]] == [
+            service_payload["name"],
+            "Tire rotation",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_create_existent_service(
+        self, client, service, service_payload, admin_token
+    ):
+        test_token = await admin_token()
+        headers = {"Authorization": f"Bearer {test_token}"}
+        payload = json.dumps(service_payload)
+        response = await client.post(
+            url="/api/v1/services/", data=payload, headers=headers
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == {
+            "detail": f"Service already exists with id {service_payload['id']}"
+        }
+
+    @pytest.mark.asyncio
+    async def test_create_service_conflicting_with_an_unseen_row(
+        self, client, service, service_payload, admin_token, monkeypatch
+    ):
+        async def get_service(**kwargs):
+            return None
+
+        monkeypatch.setattr("src.services.services.get_service", get_service)
+        test_token = await admin_token()
+        headers = {"Authorization": f"Bearer {test_token}"}
+        response = await client.post(
+            url="/api/v1/services/", data=json.dumps(service_payload), headers=headers
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == {"detail": "Service already exists"}
+
     @pytest.mark.asyncio
     async def test_create_service_with_unauthorized_user(
         self, client, service_payload, user_token
@@ -89,6 +178,46 @@ class TestServicesEndpoint:
         assert response.status_code == HTTPStatus.UNAUTHORIZED
         assert response.json() == {"detail": "Invalid token"}
 
+    @pytest.mark.asyncio
+    async def test_get_service_revalidation(self, client, service, service_payload):
+        url = f"/api/v1/services/{service_payload['id']}/"
+        response = await client.get(url=url)
+        assert response.status_code == HTTPStatus.OK
+        etag = response.headers["etag"]
+        assert "last-modified" in response.headers
+
+        response = await client.get(url=url, headers={"If-None-Match": etag})
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        assert response.headers["etag"] == etag
+        assert response.content == b""
+
+        response = await client.get(
+            url="/api/v1/services/", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == HTTPStatus.OK
+
+    @pytest.mark.asyncio
+    async def test_cached_service_is_invalidated_on_update(
+        self, client, service, service_payload, admin_token
+    ):
+        url = f"/api/v1/services/{service_payload['id']}/"
+        response = await client.get(url=url)
+        assert response.json()["name"] == service_payload["name"]
+
+        test_token = await admin_token()
+        headers = {"Authorization": f"Bearer {test_token}"}
+        updated_service_payload = service_payload.copy()
+        updated_service_payload["name"] = "test cached service"
+        response = await client.put(
+            url=url, data=json.dumps(updated_service_payload), headers=headers
+        )
+        assert response.status_code == HTTPStatus.OK
+
+        response = await client.get(url=url)
+        assert response.json()["name"] == updated_service_payload["name"]
+        response = await client.get(url="/api/v1/services/")
+        assert response.json()["items"][0]["name"] == updated_service_payload["name"]
+
     @pytest.mark.asyncio
     async def test_update_service_successfully(
         self, client, service, service_payload, admin_token, db_session
@@ -124,6 +253,26 @@ class TestServicesEndpoint:
         assert updated_service.price == updated_service_payload["price"]
         assert updated_service.description == updated_service_payload["description"]
 
+    @pytest.mark.asyncio
+    async def test_update_service_to_an_existing_definition(
+        self, client, service, service_payload, admin_token
+    ):
+        test_token = await admin_token()
+        headers = {"Authorization": f"Bearer {test_token}"}
+        other_service = {**service_payload, "name": "Tire rotation"}
+        response = await client.post(
+            url="/api/v1/services/", data=json.dumps(other_service), headers=headers
+        )
+        assert response.status_code == HTTPStatus.CREATED
+
+        response = await client.put(
+            url=f"/api/v1/services/{response.json()['id']}/",
+            data=json.dumps(service_payload),
+            headers=headers,
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == {"detail": "Service already exists"}
+
     @pytest.mark.asyncio
     async def test_update_nonexistent_service(
         self, client, service_payload, admin_token
@@ -1,31 +1,42 @@
 from http import HTTPStatus
 from typing import Annotated
 
-from fastapi import Depends, APIRouter, Header, Path
+from fastapi import Depends, APIRouter, Path, Query, Request
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.config.database.setup import get_db_session
-from src.core.middlewares.authentication_middleware import check_authorization
+from src.core.bulk import BulkResponse, bulk_request, bulk_response
+from src.core.conditional import revision_response
+from src.core.fieldsets import Fields, fields_query
+from src.core.middlewares.authentication_middleware import admin_required
+from src.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Page
+from src.core.responses import FastJSONRoute
 from src.services.models import Service
-from src.services.schemas import ServiceResponse
+from src.services.schemas import ServiceRequest, ServiceResponse
 from src.services.services import (
-    get_services,
-    get_service_by_id,
+    get_services_revision,
+    get_service_revision,
     create_service,
+    create_services,
     update_service,
     delete_service,
 )
 
-services_v1_router = APIRouter(prefix="/v1/services")
+services_v1_router = APIRouter(prefix="/v1/services", route_class=FastJSONRoute)
 
 
 @services_v1_router.get(
-    "/", response_model=list[ServiceResponse], summary="Get all Services"
+    "/", response_model=Page[ServiceResponse], summary="Get all Services"
 )
 async def list_services(
+    request: Request,
+    cursor: str | None = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+    fields: Fields = Depends(fields_query(ServiceResponse)),
     db_session: AsyncSession = Depends(get_db_session),
 ):
-    return await get_services(db_session)
+    services = await get_services_revision(db_session, cursor, limit, fields)
+    return revision_response(request, services)
 
 
 @services_v1_router.get(
@@ -34,10 +45,12 @@ async def list_services(
     summary="Get service details for a given id",
 )
 async def get_service(
+    request: Request,
     service_id: Annotated[int, Path(title="The ID of the service", ge=0, le=1000)],
     db_session: AsyncSession = Depends(get_db_session),
 ):
-    return await get_service_by_id(service_id, db_session)
+    service = await get_service_revision(service_id, db_session)
+    return revision_response(request, service)
 
 
 @services_v1_router.post(
@@ -46,23 +59,35 @@ async def get_service(
     status_code=HTTPStatus.CREATED,
     summary="Create new service",
 )
+@admin_required
 async def post_service(
     service: Service,
-    authorization: Annotated[str | None, Header()] = None,
     db_session: AsyncSession = Depends(get_db_session),
 ):
-    is_authorized = await check_authorization(authorization)
-    if is_authorized:
-        new_service = await create_service(
-            name=service.name,
-            price=service.price,
-            description=service.description,
-            estimated_time=service.estimated_time,
-            image=service.image,
-            category=service.category,
-            db_session=db_session,
-        )
-        return new_service
+    new_service = await create_service(
+        name=service.name,
+        price=service.price,
+        description=service.description,
+        estimated_time=service.estimated_time,
+        image=service.image,
+        category=service.category,
+        db_session=db_session,
+    )
+    return new_service
+
+
+@services_v1_router.post(
+    "/bulk/",
+    response_model=BulkResponse,
+    summary="Create many services at once",
+)
+@admin_required
+async def post_services(
+    services: bulk_request(ServiceRequest),
+    db_session: AsyncSession = Depends(get_db_session),
+):
+    results = await create_services(services, db_session)
+    return bulk_response(results)
 
 
 @services_v1_router.put(
@@ -71,25 +96,23 @@ async def post_service(
     status_code=HTTPStatus.OK,
     summary="Update a service",
 )
+@admin_required
 async def put_service(
     service_id: int,
     service: Service,
-    authorization: Annotated[str | None, Header()] = None,
     db_session: AsyncSession = Depends(get_db_session),
 ):
-    is_authorized = await check_authorization(authorization)
-    if is_authorized:
-        updated_service = await update_service(
-            service_id=service_id,
-            name=service.name,
-            price=service.price,
-            description=service.description,
-            estimated_time=service.estimated_time,
-            image=service.image,
-            category=service.category,
-            db_session=db_session,
-        )
-        return updated_service
+    updated_service = await update_service(
+        service_id=service_id,
+        name=service.name,
+        price=service.price,
+        description=service.description,
+        estimated_time=service.estimated_time,
+        image=service.image,
+        category=service.category,
+        db_session=db_session,
+    )
+    return updated_service
 
 
 @services_v1_router.delete(
@@ -97,11 +120,9 @@ async def put_service(
     status_code=HTTPStatus.OK,
     summary="Delete a service",
 )
+@admin_required
 async def del_service(
     service_id: int,
-    authorization: Annotated[str | None, Header()] = None,
     db_session: AsyncSession = Depends(get_db_session),
 ):
-    is_authorized = await check_authorization(authorization)
-    if is_authorized:
-        await delete_service(service_id=service_id, db_session=db_session)
+    await delete_service(service_id=service_id, db_session=db_session)
@@ -9,6 +9,11 @@ class NewCustomer(BaseModel):
     username: str
 
 
+class CustomerCredentials(BaseModel):
+    username: str
+    password: str
+
+
 class NewEmployee(BaseModel):
     id: int
     username: str
@@ -1,67 +1,75 @@
 from datetime import datetime
 from os import getenv
+from typing import AsyncIterator
 
-from passlib.hash import pbkdf2_sha512
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from src.config.database.setup import unit_of_work
+from src.core.bulk import BulkItemResult, BulkStatus, batches
 from src.core.exceptions import InvalidUsername, CustomerNotFoundException
-from src.core.models import User, Customer, Employee, Address
-from src.users.schemas import NewCustomer, NewEmployee, CustomerResponse
+from src.core.fieldsets import Fields, load_fields
+from src.core.models import (
+    ADDRESS_UNIQUE_EXPRESSIONS,
+    User,
+    Customer,
+    Employee,
+    Address,
+)
+from src.core.pagination import DEFAULT_PAGE_SIZE, Page, build_page, paginate
+from src.core.passwords import hash_password, hash_passwords
+from src.users.schemas import (
+    CustomerCredentials,
+    CustomerResponse,
+    NewCustomer,
+    NewEmployee,
+)
 
 ROLES = getenv("ROLES").split(",")
 EMPLOYEE_ROLE = ROLES[2]
 CUSTOMER_ROLE = ROLES[1]
 
 
-async def get_address(
+async def upsert_address(
     street: str,
     city: str,
     state: str,
     complement: str,
     zipcode: str,
     db_session: AsyncSession,
-) -> Address | None:
-    result = await db_session.execute(
-        select(Address).where(
-            Address.street == street,
-            Address.city == city,
-            Address.state == state,
-            Address.complement == complement,
-            Address.zipcode == zipcode,
-        )
-    )
-    return result.scalar_one_or_none()
-
-
-async def create_address(
-    street: str,
-    city: str,
-    state: str,
-    complement: str,
-    zipcode: str,
-    db_session: AsyncSession,
-) -> Address:
-    address = Address(
+) -> int:
+    statement = insert(Address).values(
         street=street, city=city, state=state, complement=complement, zipcode=zipcode
     )
-    db_session.add(address)
-    await db_session.commit()
-    await db_session.refresh(address)
-    return address
+    statement = statement.on_conflict_do_update(
+        index_elements=ADDRESS_UNIQUE_EXPRESSIONS,
+        set_={"street": statement.excluded.street},
+    ).returning(Address.id)
+    result = await db_session.execute(statement)
+    return result.scalar_one()
 
 
 async def get_customers(
     db_session: AsyncSession,
-) -> list[CustomerResponse]:
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Page[CustomerResponse]:
     result = await db_session.exec(
-        select(User, Customer, Address)
-        .join(Customer, User.id == Customer.id)
-        .join(Address, Customer.address_id == Address.id)
+        paginate(
+            select(User, Customer, Address)
+            .join(Customer, User.id == Customer.id)
+            .join(Address, Customer.address_id == Address.id),
+            User.id,
+            cursor,
+            limit,
+        )
     )
+    page = build_page(result.all(), limit, key=lambda row: row[0].id)
 
-    customers_response_list = [
-        CustomerResponse(
+    page.items = [
+        CustomerResponse.construct(
             username=user.username,
             first_name=user.first_name,
             last_name=user.last_name,
@@ -73,15 +81,48 @@ async def get_customers(
             complement=address.complement,
             zipcode=address.zipcode,
         )
-        for user, customer, address in result.all()
+        for user, customer, address in page.items
     ]
+    return page
 
-    return customers_response_list
 
-
-async def get_users(db_session: AsyncSession) -> list[User]:
-    result = await db_session.scalars(select(User))
-    return result.all()
+async def stream_customers(
+    db_session: AsyncSession, batch_size: int
+) -> AsyncIterator[list[CustomerResponse]]:
+    result = await db_session.stream(
+        select(User, Address)
+        .join(Customer, User.id == Customer.id)
+        .join(Address, Customer.address_id == Address.id)
+        .order_by(User.id)
+        .execution_options(yield_per=batch_size)
+    )
+    async for rows in result.partitions(batch_size):
+        yield [
+            CustomerResponse.construct(
+                username=user.username,
+                first_name=user.first_name,
+                last_name=user.last_name,
+                is_active=user.is_active,
+                role=user.role,
+                street=address.street,
+                city=address.city,
+                state=address.state,
+                complement=address.complement,
+                zipcode=address.zipcode,
+            )
+            for user, address in rows
+        ]
+
+
+async def get_users(
+    db_session: AsyncSession,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    fields: Fields = None,
+) -> Page[User]:
+    query = select(User).options(*load_fields(User, fields, "id"))
+    result = await db_session.scalars(paginate(query, User.id, cursor, limit))
+    return build_page(result.all(), limit, key=lambda user: user.id)
 
 
 async def get_user_by_username(username: str, db_session: AsyncSession) -> User | None:
@@ -109,35 +150,98 @@ async def create_user(
     db_session: AsyncSession,
     role: str = CUSTOMER_ROLE,
 ) -> User:
-    user = await get_user_by_username(username, db_session)
-    if user is not None:
-        raise InvalidUsername()
-
-    hashed_password = pbkdf2_sha512.hash(password)
+    hashed_password = await hash_password(password)
     user = User(username=username, hashed_password=hashed_password, role=role)
-    db_session.add(user)
-    await db_session.commit()
-    await db_session.refresh(user)
+
+    async with unit_of_work(db_session):
+        db_session.add(user)
+        try:
+            await db_session.flush()
+        except IntegrityError:
+            raise InvalidUsername()
     return user
 
 
 async def create_customer(
     username: str, password: str, db_session: AsyncSession
 ) -> NewCustomer:
-    user = await create_user(
-        username=username,
-        password=password,
-        role=CUSTOMER_ROLE,
-        db_session=db_session,
-    )
-
-    customer = Customer(id=user.id)
-    db_session.add(customer)
-    await db_session.commit()
-    await db_session.refresh(customer)
+    async with unit_of_work(db_session):
+        user = await create_user(
+            username=username,
+            password=password,
+            role=CUSTOMER_ROLE,
+            db_session=db_session,
+        )
+        db_session.add(Customer(id=user.id))
     return NewCustomer(id=user.id, role=user.role, username=user.username)
 
 
+async def create_customers(
+    customers: list[CustomerCredentials], db_session: AsyncSession
+) -> list[BulkItemResult]:
+    """Registers a batch of customers, one result per submitted item.
+
+    Taken usernames are looked up before any password is hashed, and the
+    hashing runs outside of a transaction so no connection is held meanwhile.
+    """
+    usernames = {customer.username for customer in customers}
+    async with unit_of_work(db_session):
+        result = await db_session.execute(
+            select(User.username).where(User.username.in_(usernames))
+        )
+        registered = set(result.scalars())
+
+    pending = {}
+    for customer in customers:
+        if customer.username not in registered:
+            pending.setdefault(customer.username, customer.password)
+    hashed_passwords = await hash_passwords(list(pending.values()))
+
+    created = {}
+    async with unit_of_work(db_session):
+        for batch in batches(
+            list(zip(pending, hashed_passwords)), len(User.__table__.c)
+        ):
+            result = await db_session.execute(
+                insert(User)
+                .values(
+                    [
+                        {
+                            "username": username,
+                            "hashed_password": hashed_password,
+                            "role": CUSTOMER_ROLE,
+                        }
+                        for username, hashed_password in batch
+                    ]
+                )
+                .on_conflict_do_nothing(index_elements=[User.username])
+                .returning(User.id, User.username)
+            )
+            created.update((username, user_id) for user_id, username in result)
+
+        for batch in batches(list(created.values()), len(Customer.__table__.c)):
+            await db_session.execute(
+                insert(Customer).values([{"id": user_id} for user_id in batch])
+            )
+
+    results = []
+    for index, customer in enumerate(customers):
+        user_id = created.pop(customer.username, None)
+        if user_id is None:
+            results.append(
+                BulkItemResult(
+                    index=index,
+                    status=BulkStatus.REJECTED,
+                    detail=InvalidUsername().detail,
+                )
+            )
+        else:
+            results.append(
+                BulkItemResult(index=index, status=BulkStatus.CREATED, id=user_id)
+            )
+    return results
+
+
 async def update_customer(
     user_id: int,
     username: str,
@@ -147,60 +251,45 @@ async def update_customer(
     address: Address,
     db_session: AsyncSession,
 ) -> User:
-    user = await get_user_by_id(user_id, db_session)
-    if user is None:
-        raise CustomerNotFoundException()
-
-    registered_customer = await get_customer_by_id(user_id, db_session)
-    if registered_customer is None:
-        raise CustomerNotFoundException()
-
-    registered_address = await get_address(
-        street=address.street,
-        city=address.city,
-        state=address.state,
-        complement=address.complement,
-        zipcode=address.zipcode,
-        db_session=db_session,
-    )
-
-    if registered_address is None and address is not None:
-        registered_address = await create_address(
-            street=address.street,
-            city=address.city,
-            state=address.state,
-            complement=address.complement,
-            zipcode=address.zipcode,
-            db_session=db_session,
-        )
-        registered_customer.address_id = registered_address.id
-        db_session.add(registered_customer)
-
-    user.username = username
-    user.hashed_password = (
-        pbkdf2_sha512.hash(password) if password else user.hashed_password
-    )
-    user.first_name = first_name
-    user.last_name = last_name
-    user.updated_at = datetime.now()
-    db_session.add(user)
-    await db_session.commit()
-    await db_session.refresh(user)
+    hashed_password = await hash_password(password) if password else None
+
+    async with unit_of_work(db_session):
+        user = await get_user_by_id(user_id, db_session)
+        if user is None:
+            raise CustomerNotFoundException()
+
+        registered_customer = await get_customer_by_id(user_id, db_session)
+        if registered_customer is None:
+            raise CustomerNotFoundException()
+
+        if address is not None:
+            registered_customer.address_id = await upsert_address(
+                street=address.street,
+                city=address.city,
+                state=address.state,
+                complement=address.complement,
+                zipcode=address.zipcode,
+                db_session=db_session,
+            )
+
+        user.username = username
+        if hashed_password is not None:
+            user.hashed_password = hashed_password
+        user.first_name = first_name
+        user.last_name = last_name
+        user.updated_at = datetime.now()
     return user
 
 
 async def create_employee(
     username: str, password: str, db_session: AsyncSession
 ) -> NewEmployee:
-    user = await create_user(
-        username=username,
-        password=password,
-        role=EMPLOYEE_ROLE,
-        db_session=db_session,
-    )
-
-    employee = Employee(id=user.id)
-    db_session.add(employee)
-    await db_session.commit()
-    await db_session.refresh(employee)
+    async with unit_of_work(db_session):
+        user = await create_user(
+            username=username,
+            password=password,
+            role=EMPLOYEE_ROLE,
+            db_session=db_session,
+        )
+        db_session.add(Employee(id=user.id))
     return NewEmployee(id=user.id, username=user.username)
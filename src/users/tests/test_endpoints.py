@@ -13,16 +13,42 @@ class TestUsersEndpoints:
         header = {"Authorization": f"Bearer {test_token}"}
         response = await client.get(url="/api/v1/users/", headers=header)
         assert response.status_code == HTTPStatus.OK
-        assert response.json() == [
-            {
-                "id": 1,
-                "role": admin_role,
-                "username": admin_payload["username"],
-                "first_name": None,
-                "last_name": None,
-                "is_active": True,
-            }
-        ]
+        assert response.json() == {
+            "items": [
+                {
+                    "id": 1,
+                    "role": admin_role,
+                    "username": admin_payload["username"],
+                    "first_name": None,
+                    "last_name": None,
+                    "is_active": True,
+                }
+            ],
+            "next_cursor": None,
+        }
+
+    @pytest.mark.asyncio
+    async def test_list_users_with_fields(self, client, admin_token, admin_payload):
+        test_token = await admin_token()
+        header = {"Authorization": f"Bearer {test_token}"}
+        response = await client.get(
+            url="/api/v1/users/", params={"fields": "username,id"}, headers=header
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {
+            "items": [{"id": 1, "username": admin_payload["username"]}],
+            "next_cursor": None,
+        }
+
+        response = await client.get(
+            url="/api/v1/users/",
+            params={"fields": "id,hashed_password"},
+            headers=header,
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == {
+            "detail": "Unknown fields requested: hashed_password."
+        }
 
     @pytest.mark.asyncio
     async def test_create_customer_successfully(
@@ -40,6 +66,35 @@ class TestUsersEndpoints:
             "username": user_payload["username"],
         }
 
+    @pytest.mark.asyncio
+    async def test_create_customers_in_bulk(
+        self, client, admin_token, admin_payload, user_payload
+    ):
+        test_token = await admin_token()
+        header = {"Authorization": f"Bearer {test_token}"}
+        response = await client.post(
+            url="/api/v1/users/customers/bulk/",
+            json=[user_payload, admin_payload, user_payload],
+            headers=header,
+        )
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert (data["created"], data["rejected"]) == (1, 2)
+        assert [item["status"] for item in data["items"]] == [
+            "created",
+            "rejected",
+            "rejected",
+        ]
+        assert data["items"][1]["detail"] == (
+            "Username is invalid or already registered"
+        )
+
+        response = await client.post(
+            url="/api/v1/auth/signin/",
+            data=user_payload,
+        )
+        assert response.status_code == HTTPStatus.OK
+
     @pytest.mark.asyncio
     async def test_create_existent_user(
         self, client, customer, user_payload, admin_token
@@ -150,29 +205,60 @@ class TestUsersEndpoints:
         response = await client.get(url="/api/v1/users/customers/", headers=header)
         print(response.json())
         assert response.status_code == HTTPStatus.OK
-        assert response.json() == [
-            {
-                "username": customer1["username"],
-                "first_name": customer1["first_name"],
-                "last_name": customer1["last_name"],
-                "is_active": customer1["is_active"],
-                "role": customer1["role"],
-                "street": customer1["street"],
-                "city": customer1["city"],
-                "state": customer1["state"],
-                "complement": customer1["complement"],
-                "zipcode": customer1["zipcode"],
-            },
-            {
-                "username": customer2["username"],
-                "first_name": customer2["first_name"],
-                "last_name": customer2["last_name"],
-                "is_active": customer1["is_active"],
-                "role": customer1["role"],
-                "street": customer2["street"],
-                "city": customer2["city"],
-                "state": customer2["state"],
-                "complement": customer2["complement"],
-                "zipcode": customer2["zipcode"],
-            },
+        assert response.json() == {
+            "items": [
+                {
+                    "username": customer1["username"],
+                    "first_name": customer1["first_name"],
+                    "last_name": customer1["last_name"],
+                    "is_active": customer1["is_active"],
+                    "role": customer1["role"],
+                    "street": customer1["street"],
+                    "city": customer1["city"],
+                    "state": customer1["state"],
+                    "complement": customer1["complement"],
+                    "zipcode": customer1["zipcode"],
+                },
+                {
+                    "username": customer2["username"],
+                    "first_name": customer2["first_name"],
+                    "last_name": customer2["last_name"],
+                    "is_active": customer1["is_active"],
+                    "role": customer1["role"],
+                    "street": customer2["street"],
+                    "city": customer2["city"],
+                    "state": customer2["state"],
+                    "complement": customer2["complement"],
+                    "zipcode": customer2["zipcode"],
+                },
+            ],
+            "next_cursor": None,
+        }
+
+    @pytest.mark.asyncio
+    async def test_get_customers_paginated(self, client, customers, admin_token):
+        test_token = await admin_token()
+        customer1, customer2 = customers
+        header = {"Authorization": f"Bearer {test_token}"}
+
+        response = await client.get(
+            url="/api/v1/users/customers/", params={"limit": 1}, headers=header
+        )
+        assert response.status_code == HTTPStatus.OK
+        first_page = response.json()
+        assert [item["username"] for item in first_page["items"]] == [
+            customer1["username"]
+        ]
+        assert first_page["next_cursor"] is not None
+
+        response = await client.get(
+            url="/api/v1/users/customers/",
+            params={"limit": 1, "cursor": first_page["next_cursor"]},
+            headers=header,
+        )
+        assert response.status_code == HTTPStatus.OK
+        second_page = response.json()
+        assert [item["username"] for item in second_page["items"]] == [
+            customer2["username"]
         ]
+        assert second_page["next_cursor"] is None
@@ -1,52 +1,84 @@
 from http import HTTPStatus
 from typing import Annotated
 
-from fastapi import Depends, APIRouter, Header
+from fastapi import Depends, APIRouter, Query
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.config.database.setup import get_db_session
+from src.core.bulk import BulkResponse, bulk_request, bulk_response
+from src.core.fieldsets import Fields, fields_query, sparse_page
 from src.core.middlewares.authentication_middleware import (
-    check_authorization,
-    check_customer_authorization,
+    admin_required,
+    customer_owner_required,
+)
+from src.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Page
+from src.core.responses import FastJSONRoute, json_response
+from src.core.streaming import (
+    EXPORT_BATCH_SIZE,
+    MAX_EXPORT_BATCH_SIZE,
+    ExportFormat,
+    export_response,
 )
 from src.users.schemas import (
     NewCustomer,
     NewEmployee,
     UserResponse,
     UserUpdateRequest,
+    CustomerCredentials,
     CustomerResponse,
 )
 from src.users.service import (
     get_users,
     create_customer,
+    create_customers,
     create_employee,
     update_customer,
     get_customers,
+    stream_customers,
 )
 
-users_v1_router = APIRouter(prefix="/v1/users")
+users_v1_router = APIRouter(prefix="/v1/users", route_class=FastJSONRoute)
 
 
-@users_v1_router.get("/", response_model=list[UserResponse])
+@users_v1_router.get("/", response_model=Page[UserResponse])
+@admin_required
 async def list_users(
-    authorization: Annotated[str | None, Header()] = None,
+    cursor: str | None = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+    fields: Fields = Depends(fields_query(UserResponse)),
     db_session: AsyncSession = Depends(get_db_session),
 ):
-    is_authorized = await check_authorization(authorization)
-    if is_authorized:
-        return await get_users(db_session)
+    users = await get_users(db_session, cursor, limit, fields)
+    return json_response(sparse_page(UserResponse, fields), users)
 
 
-@users_v1_router.get("/customers/", response_model=list[CustomerResponse])
+@users_v1_router.get("/customers/", response_model=Page[CustomerResponse])
+@admin_required
 async def list_customers(
-    authorization: Annotated[str | None, Header()] = None,
+    cursor: str | None = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+    db_session: AsyncSession = Depends(get_db_session),
+):
+    customers = await get_customers(db_session, cursor, limit)
+    return customers
+
+
+@users_v1_router.get("/customers/export/")
+@admin_required
+async def export_customers(
+    export_format: Annotated[ExportFormat, Query(alias="format")] = ExportFormat.NDJSON,
+    batch_size: Annotated[
+        int, Query(ge=1, le=MAX_EXPORT_BATCH_SIZE)
+    ] = EXPORT_BATCH_SIZE,
     db_session: AsyncSession = Depends(get_db_session),
 ):
-    is_authorized = await check_authorization(authorization)
-    if is_authorized:
-        customers = await get_customers(db_session)
-        return customers
+    return export_response(
+        stream_customers(db_session, batch_size),
+        schema=CustomerResponse,
+        export_format=export_format,
+        filename="customers",
+    )
 
 
 @users_v1_router.post(
@@ -55,19 +87,31 @@ async def list_customers(
     response_model_exclude={"address_id"},
     status_code=HTTPStatus.CREATED,
 )
+@admin_required
 async def post_customer(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-    authorization: Annotated[str | None, Header()] = None,
     db_session: AsyncSession = Depends(get_db_session),
 ):
-    is_authorized = await check_authorization(authorization)
-    if is_authorized:
-        customer = await create_customer(
-            username=form_data.username,
-            password=form_data.password,
-            db_session=db_session,
-        )
-        return customer
+    customer = await create_customer(
+        username=form_data.username,
+        password=form_data.password,
+        db_session=db_session,
+    )
+    return customer
+
+
+@users_v1_router.post(
+    "/customers/bulk/",
+    response_model=BulkResponse,
+    summary="Register many customers at once",
+)
+@admin_required
+async def post_customers(
+    customers: bulk_request(CustomerCredentials),
+    db_session: AsyncSession = Depends(get_db_session),
+):
+    results = await create_customers(customers, db_session)
+    return bulk_response(results)
 
 
 @users_v1_router.put(
@@ -75,24 +119,22 @@ async def post_customer(
     response_model=UserResponse,
     status_code=HTTPStatus.OK,
 )
+@customer_owner_required("customer_id")
 async def put_customer(
     customer_id: int,
     body: UserUpdateRequest,
-    authorization: Annotated[str | None, Header()] = None,
     db_session: AsyncSession = Depends(get_db_session),
 ):
-    is_authorized = await check_customer_authorization(authorization, customer_id)
-    if is_authorized:
-        customer = await update_customer(
-            user_id=customer_id,
-            username=body.username,
-            password=body.password,
-            first_name=body.first_name,
-            last_name=body.last_name,
-            address=body.address,
-            db_session=db_session,
-        )
-        return customer
+    customer = await update_customer(
+        user_id=customer_id,
+        username=body.username,
+        password=body.password,
+        first_name=body.first_name,
+        last_name=body.last_name,
+        address=body.address,
+        db_session=db_session,
+    )
+    return customer
 
 
 @users_v1_router.post(
@@ -101,16 +143,14 @@ async def put_customer(
     response_model_exclude={"hashed_password"},
     status_code=HTTPStatus.CREATED,
 )
+@admin_required
 async def post_employee(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-    authorization: Annotated[str | None, Header()] = None,
     db_session: AsyncSession = Depends(get_db_session),
 ):
-    is_authorized = await check_authorization(authorization)
-    if is_authorized:
-        employee = await create_employee(
-            username=form_data.username,
-            password=form_data.password,
-            db_session=db_session,
-        )
-        return employee
+    employee = await create_employee(
+        username=form_data.username,
+        password=form_data.password,
+        db_session=db_session,
+    )
+    return employee
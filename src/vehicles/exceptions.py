@@ -3,11 +3,11 @@ from fastapi import HTTPException
 
 
 class VehicleAlreadyExistsException(HTTPException):
-    def __init__(self, vehicle_id):
-        super().__init__(
-            status_code=HTTPStatus.BAD_REQUEST,
-            detail=f"Vehicle already exists with id {vehicle_id}",
-        )
+    def __init__(self, vehicle_id: int | None = None):
+        detail = "Vehicle already exists"
+        if vehicle_id is not None:
+            detail = f"{detail} with id {vehicle_id}"
+        super().__init__(status_code=HTTPStatus.BAD_REQUEST, detail=detail)
 
 
 class VehicleNotFoundException(HTTPException):
@@ -1,9 +1,15 @@
+from sqlalchemy import UniqueConstraint
 from sqlmodel import SQLModel, Field
 
 from src.core.models import TimestampMixin
 
 
 class Vehicle(SQLModel, table=True):
+    __table_args__ = (
+        UniqueConstraint(
+            "brand", "model", "color", "year", name="uq_vehicle_brand_model_color_year"
+        ),
+    )
     id: int | None = Field(unique=True, nullable=False, default=None, primary_key=True)
     model: str | None = Field(nullable=False, default=None)
     brand: str | None = Field(nullable=False, default=None)
@@ -18,5 +24,9 @@ class CustomerVehicle(TimestampMixin, table=True):
     )
     vin: str | None = Field(unique=True, nullable=True, default="")
     plate_code: str = Field(nullable=False, default="")
-    customer_id: int = Field(nullable=False, default=None, foreign_key="customer.id")
-    vehicle_id: int = Field(nullable=False, default=None, foreign_key="vehicle.id")
+    customer_id: int = Field(
+        nullable=False, default=None, foreign_key="customer.id", index=True
+    )
+    vehicle_id: int = Field(
+        nullable=False, default=None, foreign_key="vehicle.id", index=True
+    )
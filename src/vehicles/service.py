@@ -1,19 +1,89 @@
+from typing import AsyncIterator, Callable
+
+from sqlalchemy import (
+    Column,
+    Integer,
+    Table,
+    Text,
+    and_,
+    delete,
+    exists,
+    func,
+    literal_column,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.sql import Delete
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from src.config.database.setup import replica_router, run_after_commit, unit_of_work
+from src.core.bulk import BulkItemResult, BulkStatus, insert_unique
+from src.core.cache import (
+    CATALOG_CACHE_SIZE,
+    CATALOG_CACHE_TTL,
+    CatalogCache,
+    register_cache,
+)
 from src.core.exceptions import CustomerNotFoundException
+from src.core.imports import (
+    MAX_INTEGER,
+    ImportReport,
+    Rejections,
+    analyze,
+    copy_records,
+    create_staging_table,
+    required,
+    stage_csv,
+    staging_table,
+)
+from src.core.models import Customer
+from src.core.conditional import Revision, content_etag
+from src.core.pagination import DEFAULT_PAGE_SIZE, Page, build_page, paginate
+from src.core.responses import dump_json
 from src.users.service import get_customer_by_id
 from src.vehicles.exceptions import (
     VehicleAlreadyExistsException,
     VehicleNotFoundException,
 )
 from src.vehicles.models import Vehicle, CustomerVehicle
-from src.vehicles.schemas import CustomerVehicleResponse
+from src.vehicles.schemas import (
+    CustomerVehicleResponse,
+    Vehicle as VehicleRequest,
+    VehicleResponse,
+)
+
+vehicle_catalog_cache = register_cache(
+    "vehicle_catalog",
+    CatalogCache(max_size=CATALOG_CACHE_SIZE, ttl=CATALOG_CACHE_TTL),
+)
+
+
+async def get_vehicles(
+    db_session: AsyncSession,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Page[Vehicle]:
+    result = await db_session.scalars(
+        paginate(select(Vehicle), Vehicle.id, cursor, limit)
+    )
+    return build_page(result.all(), limit, key=lambda vehicle: vehicle.id)
 
 
-async def get_vehicles(db_session: AsyncSession) -> list[Vehicle]:
-    result = await db_session.scalars(select(Vehicle))
-    return result.all()
+async def get_vehicles_revision(
+    db_session: AsyncSession,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Revision[bytes]:
+    async def load() -> Revision[bytes]:
+        vehicles = await get_vehicles(db_session, cursor, limit)
+        body = dump_json(Page[VehicleResponse], vehicles)
+        return Revision(value=body, etag=content_etag(body))
+
+    return await vehicle_catalog_cache.get_or_load(
+        ("list", cursor, limit),
+        load,
+        max_staleness=replica_router.max_staleness(db_session),
+    )
 
 
 async def get_vehicle_by_id(
@@ -23,6 +93,26 @@ async def get_vehicle_by_id(
     return result.scalar_one_or_none()
 
 
+async def get_vehicle_revision(
+    vehicle_id: int, db_session: AsyncSession
+) -> Revision[bytes]:
+    async def load() -> Revision[bytes] | None:
+        vehicle = await get_vehicle_by_id(vehicle_id, db_session)
+        if vehicle is None:
+            return None
+        body = dump_json(VehicleResponse, vehicle)
+        return Revision(value=body, etag=content_etag(body))
+
+    vehicle = await vehicle_catalog_cache.get_or_load(
+        ("item", vehicle_id),
+        load,
+        max_staleness=replica_router.max_staleness(db_session),
+    )
+    if vehicle is None:
+        raise VehicleNotFoundException()
+    return vehicle
+
+
 async def create_vehicle(
     brand: str,
     model: str,
@@ -30,18 +120,42 @@ async def create_vehicle(
     year: str,
     db_session: AsyncSession,
 ) -> Vehicle:
-    registered_vehicle = await get_vehicle(
-        brand=brand, model=model, color=color, year=year, db_session=db_session
+    statement = (
+        insert(Vehicle)
+        .values(brand=brand, model=model, color=color, year=year)
+        .on_conflict_do_nothing(constraint="uq_vehicle_brand_model_color_year")
+        .returning(*Vehicle.__table__.c)
     )
-    if registered_vehicle is not None:
-        raise VehicleAlreadyExistsException(registered_vehicle.id)
+    async with unit_of_work(db_session):
+        result = await db_session.execute(select(Vehicle).from_statement(statement))
+        vehicle = result.scalar_one_or_none()
+        if vehicle is None:
+            registered_vehicle = await get_vehicle(
+                brand=brand, model=model, color=color, year=year, db_session=db_session
+            )
+            # The conflicting row may be invisible to this transaction or
+            # already deleted again; it still exists as far as the insert knows.
+            raise VehicleAlreadyExistsException(
+                registered_vehicle.id if registered_vehicle is not None else None
+            )
+        run_after_commit(db_session, vehicle_catalog_cache.invalidate)
+    return vehicle
 
-    vehicle = Vehicle(brand=brand, model=model, color=color, year=year)
 
-    db_session.add(vehicle)
-    await db_session.commit()
-    await db_session.refresh(vehicle)
-    return vehicle
+async def create_vehicles(
+    vehicles: list[VehicleRequest], db_session: AsyncSession
+) -> list[BulkItemResult]:
+    async with unit_of_work(db_session):
+        results = await insert_unique(
+            Vehicle,
+            constraint="uq_vehicle_brand_model_color_year",
+            keys=("brand", "model", "color", "year"),
+            rows=[vehicle.dict(exclude={"id"}) for vehicle in vehicles],
+            db_session=db_session,
+        )
+        if any(result.status == BulkStatus.CREATED for result in results):
+            run_after_commit(db_session, vehicle_catalog_cache.invalidate)
+    return results
 
 
 async def get_vehicle(
@@ -65,24 +179,27 @@ async def create_customer_vehicle(
     vehicle_id: int,
     db_session: AsyncSession,
 ) -> CustomerVehicleResponse:
-    registered_vehicle = await get_vehicle_by_id(
-        vehicle_id=vehicle_id, db_session=db_session
-    )
-    if registered_vehicle is None:
-        raise VehicleNotFoundException()
+    async with unit_of_work(db_session):
+        registered_vehicle = await get_vehicle_by_id(
+            vehicle_id=vehicle_id, db_session=db_session
+        )
+        if registered_vehicle is None:
+            raise VehicleNotFoundException()
 
-    registered_customer = await get_customer_by_id(
-        customer_id=customer_id, db_session=db_session
-    )
-    if registered_customer is None:
-        raise CustomerNotFoundException()
+        registered_customer = await get_customer_by_id(
+            customer_id=customer_id, db_session=db_session
+        )
+        if registered_customer is None:
+            raise CustomerNotFoundException()
 
-    customer_vehicle = CustomerVehicle(
-        vin=vin, plate_code=plate_code, customer_id=customer_id, vehicle_id=vehicle_id
-    )
-    db_session.add(customer_vehicle)
-    await db_session.commit()
-    await db_session.refresh(customer_vehicle)
+        db_session.add(
+            CustomerVehicle(
+                vin=vin,
+                plate_code=plate_code,
+                customer_id=customer_id,
+                vehicle_id=vehicle_id,
+            )
+        )
     return CustomerVehicleResponse(
         vin=vin, plate_code=plate_code, customer_id=customer_id, vehicle_id=vehicle_id
     )
@@ -98,28 +215,229 @@ async def create_vehicle_and_customer_vehicle(
     year: str,
     db_session: AsyncSession,
 ) -> CustomerVehicleResponse:
-    new_vehicle = await create_vehicle(
-        brand=brand, model=model, color=color, year=year, db_session=db_session
-    )
+    async with unit_of_work(db_session):
+        new_vehicle = await create_vehicle(
+            brand=brand, model=model, color=color, year=year, db_session=db_session
+        )
 
-    registered_customer = await get_customer_by_id(
-        customer_id=customer_id, db_session=db_session
-    )
-    if registered_customer is None:
-        raise CustomerNotFoundException()
+        registered_customer = await get_customer_by_id(
+            customer_id=customer_id, db_session=db_session
+        )
+        if registered_customer is None:
+            raise CustomerNotFoundException()
 
-    customer_vehicle = CustomerVehicle(
-        vin=vin,
-        plate_code=plate_code,
-        customer_id=customer_id,
-        vehicle_id=new_vehicle.id,
-    )
-    db_session.add(customer_vehicle)
-    await db_session.commit()
-    await db_session.refresh(customer_vehicle)
+        db_session.add(
+            CustomerVehicle(
+                vin=vin,
+                plate_code=plate_code,
+                customer_id=customer_id,
+                vehicle_id=new_vehicle.id,
+            )
+        )
     return CustomerVehicleResponse(
         vin=vin,
         plate_code=plate_code,
         customer_id=customer_id,
         vehicle_id=new_vehicle.id,
     )
+
+
+VEHICLE_COLUMNS = ("brand", "model", "color", "year")
+CUSTOMER_VEHICLE_COLUMNS = ("vin", "plate_code", "customer_id", *VEHICLE_COLUMNS)
+
+vehicle_import = staging_table(
+    "vehicle_import", *(Column(name, Text) for name in VEHICLE_COLUMNS)
+)
+customer_vehicle_import = staging_table(
+    "customer_vehicle_import",
+    Column("vin", Text),
+    Column("plate_code", Text),
+    Column("customer_id", Integer),
+    *(Column(name, Text) for name in VEHICLE_COLUMNS),
+)
+
+
+def parse_vehicle_row(fields: list[str]) -> tuple:
+    return tuple(required(value, name) for value, name in zip(fields, VEHICLE_COLUMNS))
+
+
+def parse_customer_vehicle_row(fields: list[str]) -> tuple:
+    vin, plate_code, value, *vehicle = fields
+    try:
+        customer_id = int(required(value, "customer_id"))
+    except ValueError:
+        customer_id = None
+    # Out of range ids would make COPY fail for the whole file.
+    if customer_id is None or not 0 < customer_id <= MAX_INTEGER:
+        raise ValueError(f"Invalid customer_id {value!r}")
+    return (required(vin, "vin"), plate_code, customer_id, *parse_vehicle_row(vehicle))
+
+
+async def stage_import(
+    chunks: AsyncIterator[bytes],
+    table: Table,
+    columns: tuple[str, ...],
+    parse_row: Callable[[list[str]], tuple],
+    rejections: Rejections,
+    db_session: AsyncSession,
+) -> int:
+    await create_staging_table(db_session, table)
+    received = await stage_csv(
+        chunks,
+        columns,
+        parse_row,
+        lambda batch: copy_records(db_session, table, batch),
+        rejections,
+    )
+    await analyze(db_session, table)
+    return received
+
+
+async def insert_staged_vehicles(table: Table, db_session: AsyncSession) -> int:
+    inserted = (
+        insert(Vehicle)
+        .from_select(
+            VEHICLE_COLUMNS,
+            select(*(table.c[name] for name in VEHICLE_COLUMNS)).distinct(),
+        )
+        .on_conflict_do_nothing(constraint="uq_vehicle_brand_model_color_year")
+        .returning(Vehicle.id)
+        .cte("inserted")
+    )
+    result = await db_session.execute(select(func.count()).select_from(inserted))
+    created = result.scalar_one()
+    if created:
+        run_after_commit(db_session, vehicle_catalog_cache.invalidate)
+    return created
+
+
+async def reject_staged(
+    statement: Delete, reason: str, rejections: Rejections, db_session: AsyncSession
+):
+    result = await db_session.execute(statement)
+    for line in result.scalars():
+        rejections.add(line, reason)
+
+
+async def import_vehicles(
+    chunks: AsyncIterator[bytes], db_session: AsyncSession
+) -> ImportReport:
+    """Adds the vehicles of a catalog CSV that are not registered yet."""
+    rejections = Rejections()
+    async with unit_of_work(db_session):
+        received = await stage_import(
+            chunks,
+            vehicle_import,
+            VEHICLE_COLUMNS,
+            parse_vehicle_row,
+            rejections,
+            db_session,
+        )
+        created = await insert_staged_vehicles(vehicle_import, db_session)
+
+    staged = received - rejections.count
+    return rejections.report(received, created=created, existing=staged - created)
+
+
+async def import_customer_vehicles(
+    chunks: AsyncIterator[bytes], db_session: AsyncSession
+) -> ImportReport:
+    """Merges a fleet CSV into ``customer_vehicle``, matching rows on ``vin``.
+
+    Rows are staged with COPY and merged with a handful of set-based
+    statements: unknown customers and earlier rows repeating a vin are
+    rejected, missing catalog vehicles are added, and the remaining rows are
+    upserted.
+    """
+    staged = customer_vehicle_import
+    rejections = Rejections()
+    async with unit_of_work(db_session):
+        received = await stage_import(
+            chunks,
+            staged,
+            CUSTOMER_VEHICLE_COLUMNS,
+            parse_customer_vehicle_row,
+            rejections,
+            db_session,
+        )
+
+        await reject_staged(
+            delete(staged)
+            .where(~exists().where(Customer.id == staged.c.customer_id))
+            .returning(staged.c.line),
+            "Customer not found",
+            rejections,
+            db_session,
+        )
+        superseded = (
+            select(staged.c.line)
+            .add_columns(
+                func.row_number()
+                .over(partition_by=staged.c.vin, order_by=staged.c.line.desc())
+                .label("position")
+            )
+            .subquery()
+        )
+        await reject_staged(
+            delete(staged)
+            .where(
+                staged.c.line.in_(
+                    select(superseded.c.line).where(superseded.c.position > 1)
+                )
+            )
+            .returning(staged.c.line),
+            "Vin repeated on a later line",
+            rejections,
+            db_session,
+        )
+
+        await insert_staged_vehicles(staged, db_session)
+
+        upsert = insert(CustomerVehicle).from_select(
+            [
+                "created_at",
+                "updated_at",
+                "vin",
+                "plate_code",
+                "customer_id",
+                "vehicle_id",
+            ],
+            select(
+                func.now(),
+                func.now(),
+                staged.c.vin,
+                staged.c.plate_code,
+                staged.c.customer_id,
+                Vehicle.id,
+            ).join(
+                Vehicle,
+                and_(
+                    *(
+                        getattr(Vehicle, name) == staged.c[name]
+                        for name in VEHICLE_COLUMNS
+                    )
+                ),
+            ),
+        )
+        upserted = (
+            upsert.on_conflict_do_update(
+                index_elements=[CustomerVehicle.vin],
+                set_={
+                    "plate_code": upsert.excluded.plate_code,
+                    "customer_id": upsert.excluded.customer_id,
+                    "vehicle_id": upsert.excluded.vehicle_id,
+                    "updated_at": upsert.excluded.updated_at,
+                },
+            )
+            .returning(literal_column("xmax = 0").label("inserted"))
+            .cte("upserted")
+        )
+        result = await db_session.execute(
+            select(
+                func.count().filter(upserted.c.inserted),
+                func.count(),
+            ).select_from(upserted)
+        )
+        created, merged = result.one()
+
+    return rejections.report(received, created=created, updated=merged - created)
@@ -41,6 +41,22 @@ class TestCreateVehicle:
             data["detail"] == f"Vehicle already exists with id {vehicle_payload['id']}"
         )
 
+    @pytest.mark.asyncio
+    async def test_create_vehicle_conflicting_with_an_unseen_row(
+        self, client, vehicle, vehicle_payload, admin_token, monkeypatch
+    ):
+        async def get_vehicle(**kwargs):
+            return None
+
+        monkeypatch.setattr("src.vehicles.service.get_vehicle", get_vehicle)
+        test_token = await admin_token()
+        header = {"Authorization": f"Bearer {test_token}"}
+        response = await client.post(
+            url="/api/v1/vehicles/", data=json.dumps(vehicle_payload), headers=header
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == {"detail": "Vehicle already exists"}
+
     @pytest.mark.asyncio
     async def test_create_vehicle_with_invalid_jwt(
         self,
@@ -0,0 +1,67 @@
+from http import HTTPStatus
+
+import pytest
+from sqlmodel import func, select
+
+from src.core.bulk import MAX_BULK_SIZE
+from src.vehicles.models import Vehicle
+
+
+class TestCreateVehiclesInBulk:
+    @pytest.mark.asyncio
+    async def test_create_vehicles_in_bulk(
+        self, client, vehicle, vehicle_payload, admin_token, db_session
+    ):
+        test_token = await admin_token()
+        header = {"Authorization": f"Bearer {test_token}"}
+        existing = {key: vehicle_payload[key] for key in ("brand", "model", "color")}
+        existing["year"] = vehicle_payload["year"]
+        new = {"brand": "fiat", "model": "uno", "color": "red", "year": "1990"}
+
+        response = await client.post(
+            url="/api/v1/vehicles/bulk/", json=[new, existing, new], headers=header
+        )
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert (data["created"], data["existing"], data["rejected"]) == (1, 2, 0)
+        created_id = data["items"][0]["id"]
+        assert data["items"] == [
+            {"index": 0, "status": "created", "id": created_id, "detail": None},
+            {"index": 1, "status": "existing", "id": vehicle.id, "detail": None},
+            {"index": 2, "status": "existing", "id": created_id, "detail": None},
+        ]
+
+        result = await db_session.execute(select(func.count()).select_from(Vehicle))
+        assert result.scalar_one() == 2
+
+    @pytest.mark.asyncio
+    async def test_reject_invalid_or_oversized_batches(self, client, admin_token):
+        test_token = await admin_token()
+        header = {"Authorization": f"Bearer {test_token}"}
+        vehicle = {"brand": "fiat", "model": "uno", "color": "red", "year": "1990"}
+
+        response = await client.post(
+            url="/api/v1/vehicles/bulk/",
+            json=[vehicle, {"brand": "fiat"}],
+            headers=header,
+        )
+        assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+        assert response.json()["detail"][0]["loc"][:2] == ["body", 1]
+
+        response = await client.post(
+            url="/api/v1/vehicles/bulk/",
+            json=[vehicle] * (MAX_BULK_SIZE + 1),
+            headers=header,
+        )
+        assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+    @pytest.mark.asyncio
+    async def test_create_vehicles_in_bulk_with_unauthorized_user(
+        self, client, user_token
+    ):
+        test_token = await user_token()
+        header = {"Authorization": f"Bearer {test_token}"}
+        response = await client.post(
+            url="/api/v1/vehicles/bulk/", json=[], headers=header
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN
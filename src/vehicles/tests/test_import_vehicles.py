@@ -0,0 +1,102 @@
+from http import HTTPStatus
+
+import pytest
+from sqlmodel import select
+
+from src.vehicles.models import CustomerVehicle, Vehicle
+
+
+class TestImportVehicles:
+    @pytest.mark.asyncio
+    async def test_import_vehicle_catalog(
+        self, client, vehicle, vehicle_payload, admin_token, db_session
+    ):
+        test_token = await admin_token()
+        header = {"Authorization": f"Bearer {test_token}", "Content-Type": "text/csv"}
+        content = (
+            "brand,model,color,year\n"
+            f"{vehicle_payload['brand']},{vehicle_payload['model']},"
+            f"{vehicle_payload['color']},{vehicle_payload['year']}\n"
+            "fiat,uno,red,1990\n"
+            "fiat,uno,red,1990\n"
+            "fiat,,red,1990\n"
+        )
+
+        response = await client.post(
+            url="/api/v1/vehicles/import/", content=content, headers=header
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {
+            "received": 4,
+            "created": 1,
+            "updated": 0,
+            "existing": 2,
+            "rejected": 1,
+            "rejections": [{"line": 5, "reason": "Missing model"}],
+        }
+
+        result = await db_session.execute(select(Vehicle.model).order_by(Vehicle.id))
+        assert result.scalars().all() == [vehicle_payload["model"], "uno"]
+
+    @pytest.mark.asyncio
+    async def test_import_customer_vehicles(
+        self, client, customer_vehicle_payload, admin_token, db_session
+    ):
+        test_token = await admin_token()
+        header = {"Authorization": f"Bearer {test_token}", "Content-Type": "text/csv"}
+        customer_id = customer_vehicle_payload["customer_id"]
+        content = (
+            "vin,plate_code,customer_id,brand,model,color,year\n"
+            f"VIN1,AAA0001,{customer_id},fiat,uno,red,1990\n"
+            f"VIN2,AAA0002,{customer_id},fiat,palio,blue,2012\n"
+            f"VIN1,AAA0003,{customer_id},fiat,uno,red,1990\n"
+            "VIN3,AAA0004,999,fiat,uno,red,1990\n"
+            "VIN4,AAA0005,99999999999,fiat,uno,red,1990\n"
+        )
+
+        response = await client.post(
+            url="/api/v1/vehicles/customer/import/", content=content, headers=header
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {
+            "received": 5,
+            "created": 2,
+            "updated": 0,
+            "existing": 0,
+            "rejected": 3,
+            "rejections": [
+                {"line": 2, "reason": "Vin repeated on a later line"},
+                {"line": 5, "reason": "Customer not found"},
+                {"line": 6, "reason": "Invalid customer_id '99999999999'"},
+            ],
+        }
+
+        content = (
+            "vin,plate_code,customer_id,brand,model,color,year\n"
+            f"VIN2,BBB0002,{customer_id},fiat,palio,blue,2012\n"
+        )
+        response = await client.post(
+            url="/api/v1/vehicles/customer/import/", content=content, headers=header
+        )
+        assert (response.json()["created"], response.json()["updated"]) == (0, 1)
+
+        result = await db_session.execute(
+            select(CustomerVehicle.vin, CustomerVehicle.plate_code).order_by(
+                CustomerVehicle.vin
+            )
+        )
+        assert result.all() == [("VIN1", "AAA0003"), ("VIN2", "BBB0002")]
+
+    @pytest.mark.asyncio
+    async def test_import_requires_the_header(self, client, admin_token):
+        test_token = await admin_token()
+        header = {"Authorization": f"Bearer {test_token}", "Content-Type": "text/csv"}
+        response = await client.post(
+            url="/api/v1/vehicles/import/",
+            content="brand,model\nfiat,uno\n",
+            headers=header,
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == {
+            "detail": "Invalid import file: Missing columns: color, year."
+        }
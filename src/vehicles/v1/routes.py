@@ -1,11 +1,16 @@
 from http import HTTPStatus
 from typing import Annotated
 
-from fastapi import Depends, APIRouter, Header, Path
+from fastapi import Depends, APIRouter, Path, Query, Request
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.config.database.setup import get_db_session
-from src.core.middlewares.authentication_middleware import check_authorization
+from src.core.bulk import BulkResponse, bulk_request, bulk_response
+from src.core.conditional import revision_response
+from src.core.imports import CSV_REQUEST_BODY, ImportReport
+from src.core.middlewares.authentication_middleware import admin_required
+from src.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Page
+from src.core.responses import FastJSONRoute
 from src.vehicles.schemas import (
     VehicleResponse,
     Vehicle,
@@ -13,29 +18,38 @@ from src.vehicles.schemas import (
     CustomerVehicleResponse,
 )
 from src.vehicles.service import (
-    get_vehicles,
+    get_vehicles_revision,
     create_vehicle,
-    get_vehicle_by_id,
+    create_vehicles,
+    get_vehicle_revision,
     create_customer_vehicle,
     create_vehicle_and_customer_vehicle,
+    import_customer_vehicles,
+    import_vehicles,
 )
 
-vehicles_v1_router = APIRouter(prefix="/v1/vehicles")
+vehicles_v1_router = APIRouter(prefix="/v1/vehicles", route_class=FastJSONRoute)
 
 
-@vehicles_v1_router.get("/", response_model=list[VehicleResponse])
+@vehicles_v1_router.get("/", response_model=Page[VehicleResponse])
 async def list_vehicles(
+    request: Request,
+    cursor: str | None = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
     db_session: AsyncSession = Depends(get_db_session),
 ):
-    return await get_vehicles(db_session)
+    vehicles = await get_vehicles_revision(db_session, cursor, limit)
+    return revision_response(request, vehicles)
 
 
 @vehicles_v1_router.get("/{vehicle_id}/", response_model=VehicleResponse)
 async def get_vehicle(
+    request: Request,
     vehicle_id: Annotated[int, Path(title="The ID of the vehicle", ge=0, le=10000)],
     db_session: AsyncSession = Depends(get_db_session),
 ):
-    return await get_vehicle_by_id(vehicle_id, db_session)
+    vehicle = await get_vehicle_revision(vehicle_id, db_session)
+    return revision_response(request, vehicle)
 
 
 @vehicles_v1_router.post(
@@ -43,21 +57,61 @@ async def get_vehicle(
     response_model=VehicleResponse,
     status_code=HTTPStatus.CREATED,
 )
+@admin_required
 async def post_vehicle(
     vehicle: Vehicle,
-    authorization: Annotated[str | None, Header()] = None,
     db_session: AsyncSession = Depends(get_db_session),
 ):
-    is_authorized = await check_authorization(authorization)
-    if is_authorized:
-        vehicle = await create_vehicle(
-            brand=vehicle.brand,
-            model=vehicle.model,
-            color=vehicle.color,
-            year=vehicle.year,
-            db_session=db_session,
-        )
-        return vehicle
+    vehicle = await create_vehicle(
+        brand=vehicle.brand,
+        model=vehicle.model,
+        color=vehicle.color,
+        year=vehicle.year,
+        db_session=db_session,
+    )
+    return vehicle
+
+
+@vehicles_v1_router.post(
+    "/bulk/",
+    response_model=BulkResponse,
+    summary="Create many vehicles at once",
+)
+@admin_required
+async def post_vehicles(
+    vehicles: bulk_request(Vehicle),
+    db_session: AsyncSession = Depends(get_db_session),
+):
+    results = await create_vehicles(vehicles, db_session)
+    return bulk_response(results)
+
+
+@vehicles_v1_router.post(
+    "/import/",
+    response_model=ImportReport,
+    summary="Import a vehicle catalog CSV",
+    openapi_extra=CSV_REQUEST_BODY,
+)
+@admin_required
+async def post_vehicles_import(
+    request: Request,
+    db_session: AsyncSession = Depends(get_db_session),
+):
+    return await import_vehicles(request.stream(), db_session)
+
+
+@vehicles_v1_router.post(
+    "/customer/import/",
+    response_model=ImportReport,
+    summary="Import a fleet CSV, merging customer vehicles on vin",
+    openapi_extra=CSV_REQUEST_BODY,
+)
+@admin_required
+async def post_customer_vehicles_import(
+    request: Request,
+    db_session: AsyncSession = Depends(get_db_session),
+):
+    return await import_customer_vehicles(request.stream(), db_session)
 
 
 @vehicles_v1_router.post(
@@ -66,22 +120,20 @@ async def post_vehicle(
     status_code=HTTPStatus.CREATED,
     summary="Create a Customer relation to an existent Vehicle",
 )
+@admin_required
 async def post_customer_vehicle(
     customer_vehicle: CustomerVehicle,
     vehicle_id: int,
-    authorization: Annotated[str | None, Header()] = None,
     db_session: AsyncSession = Depends(get_db_session),
 ):
-    is_authorized = await check_authorization(authorization)
-    if is_authorized:
-        new_customer_vehicle = await create_customer_vehicle(
-            vin=customer_vehicle.vin,
-            plate_code=customer_vehicle.plate_code,
-            customer_id=customer_vehicle.customer_id,
-            vehicle_id=vehicle_id,
-            db_session=db_session,
-        )
-        return new_customer_vehicle
+    new_customer_vehicle = await create_customer_vehicle(
+        vin=customer_vehicle.vin,
+        plate_code=customer_vehicle.plate_code,
+        customer_id=customer_vehicle.customer_id,
+        vehicle_id=vehicle_id,
+        db_session=db_session,
+    )
+    return new_customer_vehicle
 
 
 @vehicles_v1_router.post(
@@ -90,21 +142,19 @@ async def post_customer_vehicle(
     status_code=HTTPStatus.CREATED,
     summary="Create a Customer relation to a new Vehicle",
 )
+@admin_required
 async def post_vehicle_and_customer_vehicle(
     customer_vehicle: CustomerVehicle,
-    authorization: Annotated[str | None, Header()] = None,
     db_session: AsyncSession = Depends(get_db_session),
 ):
-    is_authorized = await check_authorization(authorization)
-    if is_authorized:
-        new_customer_vehicle = await create_vehicle_and_customer_vehicle(
-            vin=customer_vehicle.vin,
-            plate_code=customer_vehicle.plate_code,
-            customer_id=customer_vehicle.customer_id,
-            brand=customer_vehicle.brand,
-            model=customer_vehicle.model,
-            color=customer_vehicle.color,
-            year=customer_vehicle.year,
-            db_session=db_session,
-        )
-        return new_customer_vehicle
+    new_customer_vehicle = await create_vehicle_and_customer_vehicle(
+        vin=customer_vehicle.vin,
+        plate_code=customer_vehicle.plate_code,
+        customer_id=customer_vehicle.customer_id,
+        brand=customer_vehicle.brand,
+        model=customer_vehicle.model,
+        color=customer_vehicle.color,
+        year=customer_vehicle.year,
+        db_session=db_session,
+    )
+    return new_customer_vehicle